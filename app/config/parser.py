@@ -1,73 +1,209 @@
 from argparse import ArgumentParser, RawDescriptionHelpFormatter
+from pathlib import Path
 
-parser = ArgumentParser(
-    prog="vault-manager",
-    description="Utilities to provision and clean up 1Password vaults.",
-    formatter_class=RawDescriptionHelpFormatter,
-    epilog=(
-        "Examples:\n"
-        "  Create one named vault:\n"
-        "    vault-manager --create-one --name 'Project X - Engineer'\n\n"
-        "  Preview vaults from inputs (no changes):\n"
-        "    vault-manager --preview-from-inputs\n\n"
-        "  Batch-create from inputs:\n"
-        "    vault-manager --from-inputs\n\n"
-        "  Delete latest run (dry run):\n"
-        "    vault-manager --delete-last-run --dry-run\n\n"
-        "  Delete a specific run:\n"
-        "    vault-manager --delete-last-run --run-id 2025-09-01_16-47-00-0700_ab12cd\n"
-    ),
-)
 
-# Mutually-exclusive modes
-mode = parser.add_mutually_exclusive_group()
-mode.add_argument(
-    "--create-one",
-    action="store_true",
-    help="Create a single vault (use with one of --name/--random).",
-)
-mode.add_argument(
-    "--from-inputs",
-    action="store_true",
-    help="Create vaults from ./input/*-vault-{prefixes,suffixes}.txt.",
-)
-mode.add_argument(
-    "--preview-from-inputs",
-    action="store_true",
-    help="Preview vault names from input files (no changes).",
-)
-mode.add_argument(
-    "--delete-last-run",
-    action="store_true",
-    help="Delete vaults listed in the latest run's rollback.jsonl.",
-)
+def build_parser() -> ArgumentParser:
+    """The vault-manager CLI; parsed by app.main.main(), never at import time."""
+    parser = ArgumentParser(
+        prog="vault-manager",
+        description="Utilities to provision and clean up 1Password vaults.",
+        formatter_class=RawDescriptionHelpFormatter,
+        epilog=(
+            "Examples:\n"
+            "  Create one named vault:\n"
+            "    vault-manager --create-one --name 'Project X - Engineer'\n\n"
+            "  Preview vaults from inputs (no changes):\n"
+            "    vault-manager --preview-from-inputs\n\n"
+            "  Batch-create from inputs:\n"
+            "    vault-manager --from-inputs\n\n"
+            "  Preview and save the plan, then apply exactly that plan:\n"
+            "    vault-manager --preview-from-inputs --plan-out output/plan.json\n"
+            "    vault-manager --apply-plan output/plan.json\n\n"
+            "  Batch-create from inputs with 8 parallel workers:\n"
+            "    vault-manager --from-inputs --concurrency 8\n\n"
+            "  Resume an interrupted batch run:\n"
+            "    vault-manager --from-inputs --resume 2025-09-01_16-47-00-0700_ab12cd\n\n"
+            "  Delete latest run (dry run):\n"
+            "    vault-manager --delete-last-run --dry-run\n\n"
+            "  Delete latest run with 8 parallel workers:\n"
+            "    vault-manager --delete-last-run --concurrency 8\n\n"
+            "  Delete every run created since 2025-09-01 that is over a day old, in one pass:\n"
+            "    vault-manager --cleanup-runs --older-than 1d --since 2025-09-01 --concurrency 8\n\n"
+            "  Which run created a vault, and was it deleted?\n"
+            "    vault-manager --ledger-find 'Project X - Engineer'\n\n"
+            "  Delete a specific run:\n"
+            "    vault-manager --delete-last-run --run-id 2025-09-01_16-47-00-0700_ab12cd\n"
+        ),
+    )
 
-# Create options (mutually exclusive)
-create_opts = parser.add_argument_group("Create options")
-create_choice = create_opts.add_mutually_exclusive_group()
-create_choice.add_argument(
-    "--name",
-    dest="name",
-    help="Vault name to create (with --create-one).",
-)
-create_choice.add_argument(
-    "--random",
-    action="store_true",
-    dest="random",
-    help="Create with a random name (with --create-one).",
-)
+    # Mutually-exclusive modes
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--create-one",
+        action="store_true",
+        help="Create a single vault (use with one of --name/--random).",
+    )
+    mode.add_argument(
+        "--from-inputs",
+        action="store_true",
+        help="Create vaults from ./input/*-vault-{prefixes,suffixes}.txt.",
+    )
+    mode.add_argument(
+        "--preview-from-inputs",
+        action="store_true",
+        help="Preview vault names from input files (no changes).",
+    )
+    mode.add_argument(
+        "--apply-plan",
+        dest="apply_plan",
+        metavar="FILE",
+        type=Path,
+        help="Create the NEW vaults of a plan written by --preview-from-inputs --plan-out.",
+    )
+    mode.add_argument(
+        "--delete-last-run",
+        action="store_true",
+        help="Delete vaults listed in the rollback.jsonl of the latest run that still has undeleted vaults.",
+    )
+    mode.add_argument(
+        "--cleanup-runs",
+        action="store_true",
+        help="Delete the vaults of every run selected by --run-ids/--since/--until/--older-than, in one pass.",
+    )
+    mode.add_argument(
+        "--list-runs",
+        action="store_true",
+        help="List the runs in the run registry (output/runs.jsonl), newest first.",
+    )
+    mode.add_argument(
+        "--ledger-find",
+        dest="ledger_find",
+        metavar="NAME_OR_ID",
+        help="Look up a vault name (exact or canonical match) or vault id in the SQLite ledger: which run created it and whether it was deleted.",
+    )
+    mode.add_argument(
+        "--ledger-import",
+        action="store_true",
+        help="Load existing run folders, delete receipts and cleanup receipts into the SQLite ledger (safe to re-run).",
+    )
 
-# Delete options
-delete_opts = parser.add_argument_group("Delete options")
-delete_opts.add_argument(
-    "--dry-run",
-    action="store_true",
-    help="Print actions only; write a receipt but do not delete.",
-)
-delete_opts.add_argument(
-    "--run-id",
-    dest="run_id",
-    help="Target a specific run folder under output/runs (with --delete-last-run).",
-)
+    # Create options (mutually exclusive)
+    create_opts = parser.add_argument_group("Create options")
+    create_choice = create_opts.add_mutually_exclusive_group()
+    create_choice.add_argument(
+        "--name",
+        dest="name",
+        help="Vault name to create (with --create-one).",
+    )
+    create_choice.add_argument(
+        "--random",
+        action="store_true",
+        dest="random",
+        help="Create with a random name (with --create-one).",
+    )
 
-args = parser.parse_args()
+    # Input options
+    input_opts = parser.add_argument_group("Input options")
+    input_opts.add_argument(
+        "--scan-workers",
+        type=int,
+        metavar="N",
+        help="Parse input files on N parallel workers (default: SCAN_WORKERS, 1).",
+    )
+
+    # Plan options
+    plan_opts = parser.add_argument_group("Plan options")
+    plan_opts.add_argument(
+        "--plan-out",
+        dest="plan_out",
+        metavar="FILE",
+        type=Path,
+        help="Write the preview's decisions to FILE for --apply-plan (with --preview-from-inputs).",
+    )
+
+    # Output options
+    output_opts = parser.add_argument_group("Output options")
+    output_opts.add_argument(
+        "--stream-receipt",
+        action="store_true",
+        help="Write the receipt as NDJSON while the run progresses (with --from-inputs/--apply-plan/--delete-last-run/--cleanup-runs).",
+    )
+
+    output_opts.add_argument(
+        "--trace",
+        action="store_true",
+        help="Also write every timing span to a trace JSONL file in the run folder (with --from-inputs/--apply-plan/--delete-last-run/--cleanup-runs).",
+    )
+
+    output_opts.add_argument(
+        "--metrics-file",
+        type=Path,
+        metavar="FILE",
+        help="Keep a Prometheus/OpenMetrics textfile (e.g. for node_exporter) updated during the run (with --preview-from-inputs/--from-inputs/--apply-plan/--delete-last-run/--cleanup-runs). Default: METRICS_FILE.",
+    )
+
+    # Inventory options
+    inventory_opts = parser.add_argument_group("Inventory options")
+    inventory_opts.add_argument(
+        "--refresh-inventory",
+        action="store_true",
+        help="Ignore the cached vault inventory and re-run `op vault list` (with --from-inputs/--preview-from-inputs).",
+    )
+
+    # Batch options
+    batch_opts = parser.add_argument_group("Batch options")
+    batch_opts.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        metavar="N",
+        help=(
+            "Number of vault creations/deletions to run in parallel (with --from-inputs/--apply-plan/--delete-last-run/--cleanup-runs). "
+            "All workers share one pacing rate, capped by PACING_MAX_RATE (default: 5 ops/sec); raise it too. Default: 1."
+        ),
+    )
+    batch_opts.add_argument(
+        "--resume",
+        dest="resume",
+        metavar="RUN_ID",
+        help="Continue an interrupted run under output/runs, skipping vaults it already settled (with --from-inputs/--apply-plan).",
+    )
+
+    # Delete options
+    delete_opts = parser.add_argument_group("Delete options")
+    delete_opts.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print actions only; write a receipt but do not delete (with --delete-last-run/--cleanup-runs).",
+    )
+    delete_opts.add_argument(
+        "--run-id",
+        dest="run_id",
+        help="Target a specific run folder under output/runs (with --delete-last-run).",
+    )
+
+    # Cleanup options
+    cleanup_opts = parser.add_argument_group("Cleanup options")
+    cleanup_opts.add_argument(
+        "--run-ids",
+        nargs="+",
+        metavar="RUN_ID",
+        help="Select these runs under output/runs (with --cleanup-runs).",
+    )
+    cleanup_opts.add_argument(
+        "--since",
+        metavar="WHEN",
+        help="Select runs created at or after WHEN, an ISO date or datetime (with --cleanup-runs).",
+    )
+    cleanup_opts.add_argument(
+        "--until",
+        metavar="WHEN",
+        help="Select runs created at or before WHEN, an ISO date (the whole day is included) or datetime (with --cleanup-runs).",
+    )
+    cleanup_opts.add_argument(
+        "--older-than",
+        metavar="AGE",
+        help="Select runs older than AGE, e.g. 12h, 7d or 2w (with --cleanup-runs).",
+    )
+
+    return parser
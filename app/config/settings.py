@@ -1,3 +1,5 @@
+from typing import Literal, Optional
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -5,22 +7,79 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_prefix="", extra="ignore")
 
-    shouldBuffer: bool = Field(default=False, alias="BUFFER_OPERATIONS")
+    # Adaptive (AIMD) pacing of `op` mutations, in operations per second
+    pacingInitialRate: float = Field(default=1.0, alias="PACING_INITIAL_RATE")
+
+    pacingMinRate: float = Field(default=0.05, alias="PACING_MIN_RATE")
+
+    pacingMaxRate: float = Field(default=5.0, alias="PACING_MAX_RATE")
+
+    pacingIncrease: float = Field(default=0.05, alias="PACING_ADDITIVE_INCREASE")
+
+    pacingDecrease: float = Field(default=0.5, alias="PACING_MULTIPLICATIVE_DECREASE")
 
-    bufferSeconds: int = Field(default=10, alias="BUFFER_TIME_SEC")
+    pacingBurst: int = Field(default=1, alias="PACING_BURST")
 
-    backoffMin: int = Field(default=10, alias="RATE_LIMIT_BACKOFF_MIN")
+    # Command used in place of `op`, e.g. "python app/fake_op.py" for offline testing
+    opBinary: str = Field(default="op", alias="OP_BINARY")
 
     shouldRetry: bool = Field(default=True, alias="SHOULD_RETRY")
 
+    # Attempts per create/delete when `op` fails transiently (timeout, 5xx, connection
+    # error); other failures are not retried
     maxRetries: int = Field(default=3, alias="MAX_RETRIES")
 
+    # Rate-limited attempts don't count against maxRetries; they are retried at the
+    # pacing rate until this many seconds have passed since the first one
+    rateLimitMaxWaitSec: float = Field(default=1800.0, alias="RATE_LIMIT_MAX_WAIT_SEC")
+
     usePacificTz: bool = Field(default=True, alias="DATETIME_USE_PACIFIC")
 
     caseSensitiveVaultNames: bool = Field(
         default=False, alias="CASE_SENSITIVE_VAULT_NAMES"
     )
 
+    # Group commit for run journals (rollback.jsonl, progress.jsonl)
+    journalFlushIntervalSec: float = Field(default=1.0, alias="JOURNAL_FLUSH_INTERVAL_SEC")
+
+    journalFlushMaxLines: int = Field(default=64, alias="JOURNAL_FLUSH_MAX_LINES")
+
+    # Write receipts as NDJSON item-by-item instead of one JSON document at the end
+    streamReceipts: bool = Field(default=False, alias="STREAM_RECEIPTS")
+
+    # Also write every raw timing span to trace.jsonl in the run directory
+    traceSpans: bool = Field(default=False, alias="TRACE_SPANS")
+
+    # OpenMetrics/Prometheus textfile kept up to date during runs (unset = no metrics)
+    metricsFile: Optional[str] = Field(default=None, alias="METRICS_FILE")
+    # Seconds between metrics file rewrites; 0 writes only at start and end
+    metricsIntervalSec: float = Field(default=10.0, alias="METRICS_INTERVAL_SEC")
+
+    # Also record runs, creations and deletions in a SQLite ledger (queried with --ledger-find)
+    ledgerEnabled: bool = Field(default=False, alias="LEDGER")
+    ledgerPath: str = Field(default="output/ledger.sqlite3", alias="LEDGER_PATH")
+
+    # Seconds a cached `op vault list` snapshot (output/inventory/) stays valid; 0 disables
+    inventoryCacheTtlSec: int = Field(default=900, alias="INVENTORY_CACHE_TTL_SEC")
+    # Shorter TTL for runs that create vaults (--from-inputs, --apply-plan), so vaults
+    # created outside this tool are seen soon; 0 makes every run relist
+    runInventoryCacheTtlSec: int = Field(default=60, alias="RUN_INVENTORY_CACHE_TTL_SEC")
+
+    # Parallel parsing of input files; 1 parses sequentially
+    scanWorkers: int = Field(default=1, alias="SCAN_WORKERS")
+
+    scanPoolKind: Literal["thread", "process"] = Field(default="thread", alias="SCAN_POOL_KIND")
+
+    # Reuse parsed input files whose content is unchanged (output/cache/input-scan.json)
+    scanCacheEnabled: bool = Field(default=True, alias="SCAN_CACHE")
+
+    # Input guardrails; 0 disables a limit
+    maxInputFileBytes: int = Field(default=512 * 1024, alias="MAX_INPUT_FILE_BYTES")
+
+    maxProjectsPerFile: int = Field(default=50, alias="MAX_PROJECTS_PER_FILE")
+
+    maxRolesPerFile: int = Field(default=100, alias="MAX_ROLES_PER_FILE")
+
     vaultNameJoiner: str = Field(default=" - ")
 
 
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Offline stand-in for the 1Password CLI (`op`), for throughput testing.
+
+Point the app at it with OP_BINARY, e.g.
+    OP_BINARY="python app/fake_op.py" python -m app.main --from-inputs
+
+Supports the commands this tool runs (`whoami`, `vault list|create|delete`,
+with or without --format=json) and prints the same JSON shapes as `op`.
+Vaults live in a JSON state file shared by every invocation (file-locked where
+fcntl is available). Stdlib only, so each call starts quickly.
+
+Environment:
+  FAKE_OP_STATE            state file (default: output/fake-op/state.json)
+  FAKE_OP_SEED_VAULTS      pre-populate an empty store with N vaults (default: 0)
+  FAKE_OP_LATENCY          per-call latency in seconds: "0.05", "uniform:LO,HI",
+                           "normal:MEAN,SD", "lognormal:MEDIAN,SIGMA" or "exp:MEAN"
+  FAKE_OP_RATE_LIMIT_RPS   reject vault create/delete beyond N calls per second (0: off)
+  FAKE_OP_RATE_LIMIT_P     probability of a random rate-limited response (default: 0)
+  FAKE_OP_FAILURE_P        probability of a random non-rate-limit failure (default: 0)
+  FAKE_OP_TRANSIENT_P      probability of a vault create/delete answered with a
+                           transient "(503) Service Unavailable" (default: 0)
+  FAKE_OP_SEED             seed for reproducible latency/failure sequences
+  FAKE_OP_USER_UUID        user_uuid reported by whoami
+  FAKE_OP_ACCOUNT_UUID     account_uuid reported by whoami
+"""
+import json
+import math
+import os
+import random
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: run without cross-process locking
+    fcntl = None
+
+DEFAULT_STATE = Path("output") / "fake-op" / "state.json"
+MUTATING = {"create", "delete"}
+
+
+def _env_float(name: str, default: float = 0.0) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _error(msg: str) -> int:
+    stamp = datetime.now(timezone.utc).strftime("%Y/%m/%d %H:%M:%S")
+    sys.stderr.write(f"[ERROR] {stamp} {msg}\n")
+    return 1
+
+
+def _latency(spec: str, rng: random.Random) -> float:
+    kind, _, params = spec.partition(":")
+    if not params:
+        return max(0.0, float(kind or 0))
+    a, _, b = params.partition(",")
+    if kind == "uniform":
+        return rng.uniform(float(a), float(b))
+    if kind == "normal":
+        return max(0.0, rng.gauss(float(a), float(b)))
+    if kind == "lognormal":
+        return rng.lognormvariate(math.log(float(a)), float(b))
+    if kind == "exp":
+        return rng.expovariate(1 / float(a))
+    raise ValueError(f"Unknown FAKE_OP_LATENCY distribution: {spec!r}")
+
+
+def _new_vault(name: str) -> dict:
+    now = _now_iso()
+    return {
+        "id": uuid.uuid4().hex[:26],
+        "name": name,
+        "content_version": 1,
+        "created_at": now,
+        "updated_at": now,
+        "items": 0,
+        "attribute_version": 1,
+        "type": "USER_CREATED",
+    }
+
+
+@contextmanager
+def _state():
+    """Load, lock and (on exit) save the shared state file."""
+    path = Path(os.environ.get("FAKE_OP_STATE") or DEFAULT_STATE)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(f"{path}.lock", "w") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            with path.open("r", encoding="utf-8") as fh:
+                state = json.load(fh)
+        except (OSError, ValueError):
+            seed = int(_env_float("FAKE_OP_SEED_VAULTS"))
+            state = {"calls": 0, "recent": [], "vaults": [_new_vault(f"Seed Vault {i}") for i in range(seed)]}
+        yield state
+        tmp = path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as fh:
+            json.dump(state, fh)
+        os.replace(tmp, path)
+
+
+def _rate_limited(state: dict, rng: random.Random) -> bool:
+    rps = _env_float("FAKE_OP_RATE_LIMIT_RPS")
+    now = time.time()
+    if rps > 0:
+        state["recent"] = [t for t in state["recent"] if now - t < 1.0]
+        if len(state["recent"]) >= rps:
+            return True
+        state["recent"].append(now)
+    return rng.random() < _env_float("FAKE_OP_RATE_LIMIT_P")
+
+
+def _find(vaults: list, identifier: str):
+    for v in vaults:
+        if v["id"] == identifier:
+            return v
+    for v in vaults:
+        if v["name"] == identifier:
+            return v
+    return None
+
+
+def main(argv: list) -> int:
+    args = [a for a in argv if a != "--format=json"]
+    cmd = args[:2] if args[:1] == ["vault"] else args[:1]
+
+    seed = os.environ.get("FAKE_OP_SEED")
+    with _state() as state:
+        state["calls"] += 1
+        # one RNG per call; seeded by (seed, call number) so a run is reproducible
+        rng = random.Random(f"{seed}:{state['calls']}" if seed is not None else None)
+        delay = _latency(os.environ.get("FAKE_OP_LATENCY", "0"), rng)
+        limited = bool(cmd) and cmd[-1] in MUTATING and _rate_limited(state, rng)
+        failed = rng.random() < _env_float("FAKE_OP_FAILURE_P")
+        unavailable = bool(cmd) and cmd[-1] in MUTATING and rng.random() < _env_float("FAKE_OP_TRANSIENT_P")
+
+    # simulate the network round trip outside the lock, so calls overlap
+    time.sleep(delay)
+    if limited:
+        return _error("rate-limited: too many requests, please try again later")
+    if failed:
+        return _error("simulated failure (FAKE_OP_FAILURE_P)")
+    if unavailable:
+        return _error("(503) Service Unavailable: simulated transient failure (FAKE_OP_TRANSIENT_P)")
+
+    if cmd == ["whoami"]:
+        print(json.dumps({
+            "url": "https://example.1password.com",
+            "user_uuid": os.environ.get("FAKE_OP_USER_UUID", "FAKEUSERUUID0000000000000A"),
+            "account_uuid": os.environ.get("FAKE_OP_ACCOUNT_UUID", "FAKEACCOUNTUUID00000000000"),
+            "user_type": "SERVICE_ACCOUNT",
+        }))
+        return 0
+
+    if cmd == ["vault", "list"]:
+        with _state() as state:
+            vaults = state["vaults"]
+        print(json.dumps([{k: v[k] for k in ("id", "name", "content_version", "created_at", "updated_at")} for v in vaults]))
+        return 0
+
+    if cmd == ["vault", "create"] and len(args) > 2:
+        vault = _new_vault(args[2])
+        with _state() as state:
+            state["vaults"].append(vault)
+        print(json.dumps(vault))
+        return 0
+
+    if cmd == ["vault", "delete"] and len(args) > 2:
+        with _state() as state:
+            v = _find(state["vaults"], args[2])
+            if v is not None:
+                state["vaults"].remove(v)
+        if v is None:
+            return _error(f'"{args[2]}" isn\'t a vault in this account. Specify the vault with its ID or name.')
+        return 0
+
+    return _error(f"unknown command: {' '.join(argv)}")
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,57 +1,175 @@
 import uuid
+from typing import TYPE_CHECKING, List, Optional
 
-from app.config.parser import args
-from app.services.batch_from_inputs import run_from_inputs
-from app.services.create_vaults_with_retries import try_create_vault
-from app.services.delete_last_run import delete_last_run
-from app.services.load_project_inputs import load_all_inputs, summarize_scan
-from app.services.preview_from_inputs import preview_from_inputs
-from app.services.who_am_i import try_get_uuid
+from app.config.parser import build_parser
 
+if TYPE_CHECKING:
+    from app.services.session import Session
 
-def main():
-    print("1-PASSWORD-MANAGER: Running application-----------------------------------")
+# Service modules (and with them pydantic, settings and the models) are imported
+# inside the branch that uses them, so `--help` and the read-only branches start
+# without loading the rest of the tool.
+
+
+def _get_identity(session: "Session") -> str:
+    # `op whoami`: needed for the actor UUID in run receipts, and a fail-fast
+    # sign-in check before anything is created or deleted
     print("ONSTART: Get-Identity")
-    actor_uuid: str = try_get_uuid()
+    return session.actor_uuid()
+
+
+def main(argv: Optional[List[str]] = None):
+    args = build_parser().parse_args(argv)
+
+    print("1-PASSWORD-MANAGER: Running application-----------------------------------")
+    if args.list_runs:
+        from app.services.run_registry import print_runs
+
+        print("BRANCH: List-Runs")
+        print_runs()
+        return
+
+    if args.ledger_find:
+        from app.services.ledger import print_find_vault
+
+        print("BRANCH: Ledger-Find")
+        print_find_vault(args.ledger_find)
+        return
+
+    if args.ledger_import:
+        from app.services.ledger import import_artifacts
+
+        print("BRANCH: Ledger-Import")
+        import_artifacts()
+        return
+
+    from app.services.session import Session
+
+    # One per invocation, so `op whoami` and `op vault list` run at most once
+    session = Session()
 
     if args.preview_from_inputs:
+        from app.services.metrics import export_metrics
+        from app.services.preview_from_inputs import preview_from_inputs
+
         print("BRANCH: Preview-From-Inputs")
         print("STAGE: Previewing-Inputs")
-        preview_from_inputs()
+        with export_metrics(args.metrics_file, "preview"):
+            preview_from_inputs(
+                refresh_inventory=args.refresh_inventory,
+                scan_workers=args.scan_workers,
+                plan_out=args.plan_out,
+                session=session,
+            )
+        return
+
+    if args.apply_plan:
+        from app.services.batch_from_inputs import run_from_plan
+        from app.services.metrics import export_metrics
+
+        actor_uuid = _get_identity(session)
+        print("BRANCH: Apply-Plan")
+        print("STAGE: Apply-Plan-And-Write-Receipts")
+        with export_metrics(args.metrics_file, "apply-plan"):
+            run_from_plan(
+                actor_uuid,
+                args.apply_plan,
+                concurrency=args.concurrency,
+                resume_run_id=args.resume,
+                stream_receipt=args.stream_receipt or None,
+                trace=args.trace or None,
+                session=session,
+            )
         return
 
     if args.from_inputs:
+        from app.services.batch_from_inputs import run_from_inputs
+        from app.services.load_project_inputs import load_all_inputs, summarize_scan
+        from app.services.metrics import export_metrics
+
+        actor_uuid = _get_identity(session)
         print("BRANCH: Batch-From-Inputs")
-        scan = load_all_inputs()
+        scan = load_all_inputs(workers=args.scan_workers)
         print("STAGE: Printing-Inputs-Summary")
         print("\tSCAN------------------------")
         print(summarize_scan(scan))
         print("\tSCAN: Scan-Complete---------")
 
         print("STAGE: Batch-And-Write-Receipts")
-        run_from_inputs(actor_uuid)
+        with export_metrics(args.metrics_file, "batch"):
+            run_from_inputs(
+                actor_uuid,
+                concurrency=args.concurrency,
+                refresh_inventory=args.refresh_inventory,
+                resume_run_id=args.resume,
+                stream_receipt=args.stream_receipt or None,
+                trace=args.trace or None,
+                scan_workers=args.scan_workers,
+                session=session,
+            )
         return
 
     if args.delete_last_run:
+        from app.services.delete_last_run import delete_last_run
+        from app.services.metrics import export_metrics
+
+        if not args.dry_run:
+            _get_identity(session)
         print("BRANCH: Delete-Last-Run")
-        receipt_path = delete_last_run(run_id=args.run_id, dry_run=args.dry_run)
+        with export_metrics(args.metrics_file, "delete"):
+            receipt_path = delete_last_run(
+                run_id=args.run_id,
+                dry_run=args.dry_run,
+                concurrency=args.concurrency,
+                stream_receipt=args.stream_receipt or None,
+                trace=args.trace or None,
+                session=session,
+            )
+        print(f"Artifacts written to: {receipt_path.parent}")
+        return
+
+    if args.cleanup_runs:
+        from app.services.delete_last_run import cleanup_runs
+        from app.services.metrics import export_metrics
+
+        if not args.dry_run:
+            _get_identity(session)
+        print("BRANCH: Cleanup-Runs")
+        with export_metrics(args.metrics_file, "cleanup"):
+            receipt_path = cleanup_runs(
+                run_ids=args.run_ids,
+                since=args.since,
+                until=args.until,
+                older_than=args.older_than,
+                dry_run=args.dry_run,
+                concurrency=args.concurrency,
+                stream_receipt=args.stream_receipt or None,
+                trace=args.trace or None,
+                session=session,
+            )
         print(f"Artifacts written to: {receipt_path.parent}")
         return
 
     elif args.create_one:
         print("BRANCH: Create-Single-Vault")
+        if not (args.name or args.random):
+            print("ERROR: --create-one requires either --name or --random")
+            return
+
+        from app.services.create_vaults_with_retries import try_create_vault
+
+        _get_identity(session)
         if args.name:
             print("STAGE: Create-From-User-Provided-Name")
-            try_create_vault(args.named_vault)
-        elif args.random_vault:
+            try_create_vault(args.name)
+        else:
             print("STAGE: Create-Vault-With-Random-Suffix")
             random_name = "PY-VAULT-" + uuid.uuid4().hex[:8]
             try_create_vault(random_name)
-        else:
-            print("ERROR: --create-one requires either --name or --random")
 
     else:
         print("WARN: no flags provided, exiting")
 
 
-main()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+# app/models/CleanupReceipt.py
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.models.DeleteRunReceipt import VaultDeleteFailure, VaultDeleteSuccess
+from app.models.PacificDatetime import PacificDatetime
+from app.models.SpanStats import SpanStats
+
+
+class CleanupReceipt(BaseModel):
+    """Combined receipt of one bulk cleanup over several runs (--cleanup-runs)."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    cleanup_id: str
+    run_ids: List[str]  # selected runs, oldest first
+    actor_uuid: Optional[str] = None  # not resolved for dry runs
+    started_at: PacificDatetime
+    finished_at: PacificDatetime
+
+    dry_run: bool = False
+    # rollback entries left out: deleted by an earlier receipt / repeated across runs
+    already_deleted: int = 0
+    duplicates: int = 0
+    planned: List[VaultDeleteSuccess] = Field(default_factory=list)
+    successes: List[VaultDeleteSuccess] = Field(default_factory=list)
+    failures: List[VaultDeleteFailure] = Field(default_factory=list)
+
+    # span name -> aggregate timing (op.spawn, op.wait, op.decode, pace.sleep, ...)
+    timings: Dict[str, SpanStats] = Field(default_factory=dict)
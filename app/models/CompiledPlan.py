@@ -0,0 +1,35 @@
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from app.models.PacificDatetime import PacificDatetime
+
+PLAN_VERSION = 1
+
+PlanStatus = Literal["new", "exists", "conflict", "duplicate", "collision"]
+
+
+class PlanInputFile(BaseModel):
+    path: str
+    sha256: str
+
+
+class PlanItem(BaseModel):
+    batch_name: str
+    project: str
+    role: str
+    vault_name: str
+    status: PlanStatus
+    detail: Optional[str] = None  # why a non-new item will be skipped
+
+
+class CompiledPlan(BaseModel):
+    """Decisions of a preview, written with --plan-out and executed by --apply-plan."""
+
+    version: int = PLAN_VERSION
+    created_at: PacificDatetime
+    inputs: List[PlanInputFile]
+    inventory_age_sec: Optional[float] = None  # age of the vault listing the statuses came from
+    warnings: List[str] = Field(default_factory=list)  # file-level warnings aggregated
+    errors: List[str] = Field(default_factory=list)
+    items: List[PlanItem] = Field(default_factory=list)
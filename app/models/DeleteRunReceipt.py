@@ -1,11 +1,12 @@
 # app/models/DeleteRunReceipt.py
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
 from app.models.PacificDatetime import PacificDatetime
+from app.models.SpanStats import SpanStats
 
 
 class VaultDeleteSuccess(BaseModel):
@@ -13,6 +14,7 @@ class VaultDeleteSuccess(BaseModel):
     vault_name: str
     batch_name: Optional[str] = None
     project: Optional[str] = None
+    run_id: Optional[str] = None  # run whose rollback.jsonl listed the vault
 
 
 class VaultDeleteFailure(BaseModel):
@@ -21,6 +23,7 @@ class VaultDeleteFailure(BaseModel):
     error: str
     batch_name: Optional[str] = None
     project: Optional[str] = None
+    run_id: Optional[str] = None
 
 
 class DeleteRunReceipt(BaseModel):
@@ -28,11 +31,16 @@ class DeleteRunReceipt(BaseModel):
 
     run_id_deleted: str
     source_rollback_file: str
-    actor_uuid: str
+    actor_uuid: Optional[str] = None  # not resolved for dry runs
     started_at: PacificDatetime
     finished_at: PacificDatetime
 
     dry_run: bool = False
+    # rollback entries left out: deleted by an earlier delete or cleanup
+    already_deleted: int = 0
     planned: List[VaultDeleteSuccess] = Field(default_factory=list)
     successes: List[VaultDeleteSuccess] = Field(default_factory=list)
     failures: List[VaultDeleteFailure] = Field(default_factory=list)
+
+    # span name -> aggregate timing (op.spawn, op.wait, op.decode, pace.sleep, ...)
+    timings: Dict[str, SpanStats] = Field(default_factory=dict)
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, List
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -12,6 +12,11 @@ class InputScanResult(BaseModel):
     suffix_files: List[InputFileParseResult] = Field(default_factory=list)
     fatal_errors: List[str] = Field(default_factory=list)
 
+    # seconds spent per scan phase ("discover", "parse", "total") and parse parallelism
+    timings: Dict[str, float] = Field(default_factory=dict)
+    workers: int = 1
+    cache_hits: int = 0  # files reused from the scan cache instead of re-parsed
+
     # Transitional compatibility: old code may reference `scan.files`
     @property
     def files(self) -> List[InputFileParseResult]:
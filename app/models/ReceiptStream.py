@@ -0,0 +1,30 @@
+# app/models/ReceiptStream.py
+from __future__ import annotations
+
+from typing import Any, Dict, Literal
+
+from pydantic import BaseModel, Field
+
+from app.models.PacificDatetime import PacificDatetime
+
+ReceiptKind = Literal["batch_from_inputs", "delete_last_run", "cleanup_runs"]
+
+
+class ReceiptStreamHeader(BaseModel):
+    """First line of a streamed (NDJSON) receipt."""
+
+    type: Literal["header"] = "header"
+    kind: ReceiptKind
+    started_at: PacificDatetime
+    # receipt-level fields known up front (run_id, actor_uuid, input_files, ...)
+    fields: Dict[str, Any] = Field(default_factory=dict)
+
+
+class ReceiptStreamFooter(BaseModel):
+    """Last line of a streamed receipt; absent if the run was interrupted."""
+
+    type: Literal["footer"] = "footer"
+    finished_at: PacificDatetime
+    counts: Dict[str, int] = Field(default_factory=dict)
+    # receipt-level fields only known at the end (warnings, errors, ...)
+    fields: Dict[str, Any] = Field(default_factory=dict)
@@ -1,8 +1,9 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
 from app.models.PacificDatetime import PacificDatetime
+from app.models.SpanStats import SpanStats
 
 
 class VaultSuccess(BaseModel):
@@ -33,3 +34,6 @@ class RunReceipt(BaseModel):
 
     successes: List[VaultSuccess] = Field(default_factory=list)
     failures: List[VaultFailure] = Field(default_factory=list)
+
+    # span name -> aggregate timing (op.spawn, op.wait, op.decode, pace.sleep, ...)
+    timings: Dict[str, SpanStats] = Field(default_factory=dict)
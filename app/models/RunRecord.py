@@ -0,0 +1,28 @@
+# app/models/RunRecord.py
+from __future__ import annotations
+
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+from app.models.PacificDatetime import PacificDatetime
+
+# running: started, not finished (or interrupted); empty: finished without creating
+# anything; pending: has vaults to delete; partial: a delete left some behind;
+# deleted: every vault in its rollback.jsonl was deleted
+RollbackStatus = Literal["running", "empty", "pending", "partial", "deleted"]
+
+
+class RunRecord(BaseModel):
+    """One run in the run registry (output/runs.jsonl), folded from its events."""
+
+    run_id: str
+    kind: str = "batch"  # batch | apply-plan
+    actor_uuid: Optional[str] = None
+    started_at: Optional[PacificDatetime] = None
+    finished_at: Optional[PacificDatetime] = None
+    successes: int = 0
+    failures: int = 0
+    deleted: int = 0
+    delete_failures: int = 0
+    rollback_status: RollbackStatus = "running"
@@ -0,0 +1,14 @@
+from typing import Dict
+
+from pydantic import BaseModel, Field
+
+
+class SpanStats(BaseModel):
+    """Aggregate of every timing span with the same name in one run."""
+
+    count: int = 0
+    total_sec: float = 0.0
+    p50_ms: float = 0.0
+    p95_ms: float = 0.0
+    max_ms: float = 0.0
+    outcomes: Dict[str, int] = Field(default_factory=dict)  # e.g. {"success": 98, "rate-limited": 2}
@@ -1,5 +1,6 @@
 import json
 from enum import Enum
+from typing import Any, Dict, List, Union
 
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 
@@ -18,7 +19,11 @@ class SubprocessResponse(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
     command: str
     status: OpStatus = Field(default=OpStatus.UNKNOWN)
-    formatted_output: dict = Field(default_factory=dict)
+    # `op` emits an object (create/get/whoami) or an array (list)
+    formatted_output: Union[Dict[str, Any], List[Any]] = Field(default_factory=dict)
+    # stdout validated straight into the command's model (see run_command); when
+    # set, `output` is left empty and `formatted_output` is not built
+    parsed: Any = None
     output: str
     error: str
     return_code: int
@@ -29,6 +34,8 @@ class SubprocessResponse(BaseModel):
             self.status = OpStatus.RATE_LIMITED
         elif self.return_code != 0:
             self.status = OpStatus.FAILURE
+        elif self.parsed is not None:
+            self.status = OpStatus.SUCCESS
         elif any([c in self.command for c in JSON_EMIT_CMDS]):
             self.status = OpStatus.SUCCESS
             self.formatted_output = json.loads(self.output)
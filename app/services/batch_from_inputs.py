@@ -1,9 +1,10 @@
 import json
-import os
 import secrets
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Optional, Union
 
 from app.config.settings import settings
 from app.models.PacificDatetime import to_pacific
@@ -12,13 +13,37 @@ from app.models.RunReceipt import (
     VaultFailure,
     VaultSuccess,
 )
+from app.models.VaultListItem import VaultListItem
+from app.services import ledger
+from app.services.compiled_plan import read_plan, stale_inputs
 from app.services.create_vaults_with_retries import try_create_vault
 from app.services.exc import VaultCreationError
-from app.services.list_vaults import canonical_vault_key, get_existing_vault_indexes, normalize_vault_name
+from app.services.journal_writer import JournalWriter
+from app.services.list_vaults import VaultIndex
 from app.services.load_project_inputs import load_all_inputs
+from app.services.metrics import count_vault
+from app.services.plan import (
+    PlanClash,
+    PlannedVault,
+    find_plan_clashes,
+    iter_planned_vaults,
+    plan_batches,
+)
+from app.services.receipt_stream import ReceiptStreamWriter
+from app.services.run_registry import record_finished, record_started
+from app.services.scan_cache import file_digest
+from app.services.session import Session
+from app.services.tracing import Tracer, start_trace, stop_trace, submit
 
-VAULT_NAME_JOINER = getattr(settings, "vaultNameJoiner", " - ")
 OUTPUT_BASE_DIR = Path("output") / "runs"
+RECEIPT_FILENAME = "batch_from_inputs-receipt.json"
+STREAM_RECEIPT_FILENAME = "batch_from_inputs-receipt.ndjson"
+ROLLBACK_FILENAME = "rollback.jsonl"
+PROGRESS_FILENAME = "progress.jsonl"  # one line per settled planned vault, for --resume
+RUN_META_FILENAME = "run.json"
+TRACE_FILENAME = "trace.jsonl"  # raw timing spans, with trace enabled
+
+Outcome = Union[VaultSuccess, VaultFailure]
 
 
 def _now() -> datetime:
@@ -43,6 +68,165 @@ def _ensure_run_dir(run_id: str) -> Path:
     return run_dir
 
 
+class _RunJournal:
+    """
+    Append-only journals of a run, safe to call from worker threads:
+      - rollback.jsonl: one line per created vault (consumed by delete)
+      - progress.jsonl: one line per settled planned vault (consumed by --resume)
+    Both are group-committed; close() makes everything durable. Created vaults
+    also go to the SQLite ledger when it is enabled.
+    """
+
+    def __init__(self, run_dir: Path):
+        self.run_id = run_dir.name
+        self.rollback_path = run_dir / ROLLBACK_FILENAME
+        self.progress_path = run_dir / PROGRESS_FILENAME
+        self._rollback = JournalWriter(self.rollback_path)
+        self._progress = JournalWriter(self.progress_path)
+
+    def record_success(self, success: VaultSuccess) -> None:
+        data = success.model_dump()
+        self._rollback.write(data)
+        self._progress.write({"outcome": "success", **data})
+        count_vault("created")
+        ledger.record_created(
+            self.run_id, success.batch_name, success.project, success.vault_name, success.vault_id
+        )
+
+    def record_failure(self, failure: VaultFailure, skipped: bool) -> None:
+        outcome = "skipped" if skipped else "failure"
+        self._progress.write({"outcome": outcome, **failure.model_dump()})
+        count_vault("skipped" if skipped else "failed")
+
+    def close(self) -> None:
+        self._rollback.close()
+        self._progress.close()
+        ledger.flush()
+
+
+class _OutcomeSink:
+    """
+    Receives one outcome (a result, or a pending Future) per planned vault, in
+    plan order.
+    - In-memory mode keeps every slot and resolves them in plan order at the end
+    - Streaming mode writes each outcome to the NDJSON receipt as soon as it
+      settles, tagged with its plan position, and keeps nothing
+    """
+
+    def __init__(self, stream: Optional[ReceiptStreamWriter] = None):
+        self._stream = stream
+        self._slots: list[Union[Outcome, Future]] = []
+        self._seq = 0
+        self._errors: list[BaseException] = []
+
+    def add(self, outcome: Union[Outcome, Future]) -> None:
+        seq = self._seq
+        self._seq += 1
+        if self._stream is None:
+            self._slots.append(outcome)
+        elif isinstance(outcome, Future):
+            outcome.add_done_callback(lambda fut, seq=seq: self._emit_future(seq, fut))
+        else:
+            self._emit(seq, outcome)
+
+    def _emit(self, seq: int, outcome: Outcome) -> None:
+        type_ = "success" if isinstance(outcome, VaultSuccess) else "failure"
+        self._stream.item(type_, seq, outcome)
+
+    def _emit_future(self, seq: int, fut: Future) -> None:
+        if fut.cancelled():
+            return
+        exc = fut.exception()
+        if exc is not None:
+            self._errors.append(exc)
+            return
+        self._emit(seq, fut.result())
+
+    def resolve(self) -> tuple[list[VaultSuccess], list[VaultFailure]]:
+        """Plan-ordered successes/failures (empty when streaming). Re-raises worker errors."""
+        if self._errors:
+            raise self._errors[0]
+        successes: list[VaultSuccess] = []
+        failures: list[VaultFailure] = []
+        for outcome in self._slots:
+            if isinstance(outcome, Future):
+                outcome = outcome.result()
+            if isinstance(outcome, VaultSuccess):
+                successes.append(outcome)
+            else:
+                failures.append(outcome)
+        return successes, failures
+
+
+def _read_jsonl(path: Path) -> list[dict]:
+    results: list[dict] = []
+    if not path.exists():
+        return results
+    with path.open("r", encoding="utf-8") as fh:
+        for raw in fh:
+            s = raw.strip()
+            if not s:
+                continue
+            try:
+                results.append(json.loads(s))
+            except json.JSONDecodeError:
+                continue  # torn trailing line from an interrupted run
+    return results
+
+
+def _load_settled(run_dir: Path) -> dict[tuple[str, str], Outcome]:
+    """
+    Planned vaults already settled by an earlier attempt of this run, keyed by
+    (batch_name, vault_name): successes (from rollback.jsonl, which is written
+    first) and skips. Creation errors are not settled; resume retries them.
+    """
+    settled: dict[tuple[str, str], Outcome] = {}
+    for data in _read_jsonl(run_dir / PROGRESS_FILENAME):
+        if data.pop("outcome", None) == "skipped":
+            f = VaultFailure.model_validate(data)
+            settled[(f.batch_name, f.vault_name)] = f
+    for data in _read_jsonl(run_dir / ROLLBACK_FILENAME):
+        v = VaultSuccess.model_validate(data)
+        settled[(v.batch_name, v.vault_name)] = v
+    return settled
+
+
+def _run_kind(meta: dict) -> str:
+    """The kind of run ("batch" or "apply-plan") its run.json describes."""
+    # run.json files written before "kind" was recorded: only plan runs have a "plan"
+    return meta.get("kind") or ("apply-plan" if "plan" in meta else "batch")
+
+
+def _resume_run_dir(run_id: str, kind: str, meta: dict[str, Any]) -> tuple[Path, datetime]:
+    """
+    The directory and start time of run `run_id`, which must be a `kind` run;
+    an apply-plan run is only resumed with the plan it started from (meta["plan_sha256"]).
+    """
+    run_dir = OUTPUT_BASE_DIR / run_id
+    if not run_dir.exists() or not run_dir.is_dir():
+        raise RuntimeError(f"Run id not found: {run_id}")
+    meta_path = run_dir / RUN_META_FILENAME
+    if not meta_path.exists():
+        raise RuntimeError(f"No {RUN_META_FILENAME} in run {run_id}; it cannot be resumed")
+    with meta_path.open("r", encoding="utf-8") as fh:
+        stored = json.load(fh)
+
+    # its settled entries only make sense against the plan they were settled for
+    stored_kind = _run_kind(stored)
+    if stored_kind != kind:
+        raise RuntimeError(f"Run {run_id} is a {stored_kind} run; it cannot be resumed as {kind}")
+    if "plan" in meta:
+        if "plan_sha256" in stored:
+            same_plan = stored["plan_sha256"] == meta["plan_sha256"]
+        else:
+            same_plan = Path(stored["plan"]).resolve() == Path(meta["plan"]).resolve()
+        if not same_plan:
+            raise RuntimeError(
+                f"Run {run_id} applied {stored['plan']}; it cannot be resumed with a different plan ({meta['plan']})"
+            )
+    return run_dir, datetime.fromisoformat(stored["started_at"])
+
+
 def _extract_vault_id(resp: Any) -> Optional[str]:
     """
     Best-effort extractor—supports dict- or object-like CreateVaultResponse.
@@ -74,174 +258,219 @@ def _extract_vault_id(resp: Any) -> Optional[str]:
     return None
 
 
-def _collect_projects_by_batch(scan) -> dict[str, list[str]]:
+def _resumed(
+    planned: PlannedVault,
+    index: VaultIndex,
+    settled: dict[tuple[str, str], Outcome],
+) -> Optional[Outcome]:
+    """The outcome of `planned` from an earlier attempt of this run (--resume), if any."""
+    prior = settled.pop((planned.batch_name, planned.vault_name), None)
+    if prior is not None:
+        if isinstance(prior, VaultSuccess):
+            index.add(VaultListItem(id=prior.vault_id or "", name=planned.vault_name))
+        print(f"[RESUMED] {planned.vault_name} (batch={planned.batch_name})")
+    return prior
+
+
+def _precheck(
+    planned: PlannedVault,
+    index: VaultIndex,
+    settled: dict[tuple[str, str], Outcome],
+    journal: _RunJournal,
+) -> Optional[Outcome]:
     """
-    Collapse all prefix files by batch_name -> unique, sorted project list.
+    Decide a planned vault without calling `op`: returns its outcome when it was
+    settled by an earlier attempt (--resume) or must be skipped as a duplicate,
+    else None (it should be created).
     """
-    buckets: dict[str, set[str]] = {}
-    for f in scan.prefix_files:
-        if f.projects:
-            b = buckets.setdefault(f.batch_name, set())
-            b.update(f.projects)
-    return {k: sorted(v) for k, v in buckets.items()}
+    batch_name, project, _, vault_name = planned
+
+    # 0) Settled by an earlier attempt of this run (--resume) -----------------------
+    prior = _resumed(planned, index, settled)
+    if prior is not None:
+        return prior
+
+    # 1) Exact duplicate (normalized) -----------------------------------------------
+    v = index.find_exact(vault_name)
+    if v is not None:
+        msg = "already exists" if v.id else "already created earlier in this run"
+        verbose = msg
+        if v.id:
+            verbose += f" (id={v.id})"
+        skip = VaultFailure(
+            batch_name=batch_name,
+            project=project,
+            vault_name=vault_name,
+            error=verbose,
+        )
+        journal.record_failure(skip, skipped=True)
+        print(f"[SKIP] {vault_name} (batch={batch_name}) -> {msg}")
+        return skip
+
+    # 2) Canonical conflict (ignore case, spaces, dashes) ----------------------------
+    exemplar = index.find_canonical(vault_name)
+    if exemplar is not None:
+        # Show one exemplar for clarity
+        verbose = "conflicts with existing vault when ignoring case, spaces, and dashes"
+        verbose += f" ({'existing' if exemplar.id else 'created earlier in this run'} '{exemplar.name}'"
+        if exemplar.id:
+            verbose += f", id={exemplar.id}"
+        verbose += ")"
+        skip = VaultFailure(
+            batch_name=batch_name,
+            project=project,
+            vault_name=vault_name,
+            error=verbose,
+        )
+        journal.record_failure(skip, skipped=True)
+        print(f"[SKIP-FUZZY] {vault_name} (batch={batch_name}) -> {verbose}")
+        return skip
 
+    return None
 
-def _collect_roles_by_batch(scan) -> dict[str, list[str]]:
-    """
-    Collapse all suffix files by batch_name -> unique, sorted role list.
-    """
-    buckets: dict[str, set[str]] = {}
-    for f in scan.suffix_files:
-        if f.roles:
-            b = buckets.setdefault(f.batch_name, set())
-            b.update(f.roles)
-    return {k: sorted(v) for k, v in buckets.items()}
+
+def _drop_clash(
+    planned: PlannedVault,
+    clash: PlanClash,
+    settled: dict[tuple[str, str], Outcome],
+    journal: _RunJournal,
+) -> VaultFailure:
+    """Skip a planned vault that clashes with an earlier one in the same plan."""
+    settled.pop((planned.batch_name, planned.vault_name), None)
+    skip = VaultFailure(
+        batch_name=planned.batch_name,
+        project=planned.project,
+        vault_name=planned.vault_name,
+        error=clash.describe(),
+    )
+    journal.record_failure(skip, skipped=True)
+    print(f"[SKIP-PLAN] {planned.vault_name} (batch={planned.batch_name}) -> {clash.describe()}")
+    return skip
 
 
-def run_from_inputs(uuid: str, base_dir: Optional[Path] = None) -> Path:
+def _create_one(
+    planned: PlannedVault,
+    journal: _RunJournal,
+    index: VaultIndex,
+) -> Outcome:
     """
-    Executes a batch run from ./input/*-vault-prefixes.txt + *-vault-suffixes.txt.
-    Produces:
-      - receipt JSON  (per-run summary)
-      - rollback.jsonl (one line per successful vault creation)
-    Skips any batch_name that is missing either side (prefixes or suffixes), with a warning.
+    Create a single planned vault and journal the outcome. Safe to run on a
+    worker thread.
+    The caller has already reserved the name in `index`; the reservation is
+    replaced by the created vault on success and released on failure.
     """
-    now = _now()
-    started_at = now
-    run_id = _new_run_id(now)
-    run_dir = _ensure_run_dir(run_id)
-    rollback_path = run_dir / "rollback.jsonl"
-
-    scan = load_all_inputs(base_dir=base_dir)
+    batch_name, project, _, vault_name = planned
+    try:
+        resp = try_create_vault(vault_name)
+        vault_id = _extract_vault_id(resp)
+        index.add(VaultListItem(id=vault_id or "", name=vault_name))
+
+        success = VaultSuccess(
+            batch_name=batch_name,
+            project=project,
+            vault_name=vault_name,
+            vault_id=vault_id,
+        )
 
-    # Aggregate file-level warnings/errors for the final receipt
-    warnings: list[str] = []
-    errors: list[str] = []
-    input_files: list[str] = []
+        journal.record_success(success)
 
-    for files in [scan.prefix_files, scan.suffix_files]:
-        for f in files:
-            input_files.append(f.path.name)
-            warnings.extend(f"[{f.batch_name}] {w}" for w in f.warnings)
-            errors.extend(f"[{f.batch_name}] {e}" for e in f.errors)
+        print(f"[OK] {vault_name} (batch={batch_name}), id={vault_id}")
+        return success
 
-    successes: list[VaultSuccess] = []
-    failures: list[VaultFailure] = []
+    except VaultCreationError as e:
+        index.remove(vault_name)
+        msg = str(e)
+        print(f"[ERR] {vault_name} (batch={batch_name}) -> {msg}")
+        failure = VaultFailure(
+            batch_name=batch_name,
+            project=project,
+            vault_name=vault_name,
+            error=msg,
+        )
+        journal.record_failure(failure, skipped=False)
+        return failure
+
+
+def _dispatch(
+    planned: PlannedVault,
+    journal: _RunJournal,
+    index: VaultIndex,
+    outcomes: _OutcomeSink,
+    pool: Optional[ThreadPoolExecutor],
+    in_flight: threading.BoundedSemaphore,
+) -> None:
+    """Reserve the name, then create it inline or on the worker pool."""
+    # Reserve the name so later planned names collide with it, even while in flight
+    index.add(VaultListItem(id="", name=planned.vault_name))
+
+    if pool is None:
+        outcomes.add(_create_one(planned, journal, index))
+    else:
+        in_flight.acquire()
+        fut = submit(pool, _create_one, planned, journal, index)
+        fut.add_done_callback(lambda _: in_flight.release())
+        outcomes.add(fut)
 
-    try:
-        by_norm, norm_keys, by_canon, canon_keys = get_existing_vault_indexes()
-    except Exception as e:
-        warnings.append(f"[global] Could not list existing vaults; duplicate checks disabled: {e}")
-        by_norm, norm_keys, by_canon, canon_keys = {}, set(), {}, set()
 
-    if scan.fatal_errors:
-        errors.extend(scan.fatal_errors)
+def _open_run(
+    uuid: str, resume_run_id: Optional[str], kind: str, **meta: Any
+) -> tuple[str, Path, datetime, dict[tuple[str, str], Outcome]]:
+    """
+    Create a new run directory (with run.json), or reopen `resume_run_id`, and
+    register the (re)start in the run registry. A resumed run must be of the
+    same kind and, for apply-plan, of the same plan (see _resume_run_dir).
+    Returns: (run_id, run_dir, started_at, outcomes settled by earlier attempts)
+    """
+    settled: dict[tuple[str, str], Outcome] = {}
+    if resume_run_id:
+        run_id = resume_run_id
+        run_dir, started_at = _resume_run_dir(run_id, kind, meta)
+        settled = _load_settled(run_dir)
+        print(f"RESUME: {len(settled)} planned vault(s) already settled in {run_dir}")
     else:
-        # Build cross-product per batch_name, but only when both sides present
-        projects_by_batch = _collect_projects_by_batch(scan)
-        roles_by_batch = _collect_roles_by_batch(scan)
-
-        batches_with_prefix_only = sorted(
-            set(projects_by_batch.keys()) - set(roles_by_batch.keys())
-        )
-        batches_with_suffix_only = sorted(
-            set(roles_by_batch.keys()) - set(projects_by_batch.keys())
-        )
-        for b in batches_with_prefix_only:
-            warnings.append(
-                f"[{b}] Skipping batch: found prefixes but no *-vault-suffixes.txt."
+        started_at = _now()
+        run_id = _new_run_id(started_at)
+        run_dir = _ensure_run_dir(run_id)
+        with (run_dir / RUN_META_FILENAME).open("w", encoding="utf-8") as fh:
+            json.dump(
+                {"run_id": run_id, "kind": kind, "actor_uuid": uuid, "started_at": started_at.isoformat(), **meta},
+                fh,
             )
-        for b in batches_with_suffix_only:
-            warnings.append(
-                f"[{b}] Skipping batch: found suffixes but no *-vault-prefixes.txt."
-            )
-
-        batches_ready = sorted(
-            set(projects_by_batch.keys()) & set(roles_by_batch.keys())
+    record_started(run_id, started_at, uuid, kind)
+    ledger.record_run(run_id, kind=kind, actor_uuid=uuid, started_at=started_at)
+    return run_id, run_dir, started_at, settled
+
+
+def _finish_run(
+    run_id: str,
+    uuid: str,
+    run_dir: Path,
+    started_at: datetime,
+    input_files: list[str],
+    warnings: list[str],
+    errors: list[str],
+    outcomes: _OutcomeSink,
+    stream: Optional[ReceiptStreamWriter],
+    tracer: Tracer,
+) -> Path:
+    """Write the receipt (or the streamed receipt's footer); returns its path."""
+    # Resolve in plan order so the receipt is deterministic regardless of completion order
+    successes, failures = outcomes.resolve()
+    finished_at = _now()
+    timings = tracer.summary()
+
+    if stream is not None:
+        stream.close(
+            finished_at,
+            warnings=warnings,
+            errors=errors,
+            timings={name: t.model_dump() for name, t in timings.items()},
         )
+        n_success, n_failure = stream.counts.get("success", 0), stream.counts.get("failure", 0)
+        record_finished(run_id, finished_at, n_success, n_failure)
+        ledger.record_run(run_id, finished_at=finished_at, successes=n_success, failures=n_failure)
+        return stream.path
 
-        for batch_name in batches_ready:
-            projects = projects_by_batch.get(batch_name, [])
-            roles = roles_by_batch.get(batch_name, [])
-            # defensive (shouldn't be empty if batch in batches_ready)
-            if not projects or not roles:
-                warnings.append(
-                    f"[{batch_name}] Skipping batch: empty projects or roles AFTER validation (this shouldn't happen)."
-                )
-                continue
-
-            for project in projects:
-                for role in roles:
-                    # vault_name = f"{project}{VAULT_NAME_JOINER}{role}"
-                    vault_name = f"{project}{VAULT_NAME_JOINER}{role}"
-
-                    # 1) Exact duplicate (normalized) ----------------------------------------
-                    nk = normalize_vault_name(vault_name)
-                    if nk in norm_keys:
-                        msg = "already exists"
-                        verbose = msg
-                        v = by_norm.get(nk)
-                        if v and getattr(v, "id", None):
-                            verbose += f" (id={v.id})"
-                        failures.append(VaultFailure(
-                            batch_name=batch_name,
-                            project=project,
-                            vault_name=vault_name,
-                            error=verbose,
-                        ))
-                        print(f"[SKIP] {vault_name} (batch={batch_name}) -> {msg}")
-                        continue
-
-                    # 2) Canonical conflict (ignore case, spaces, dashes) ---------------------
-                    ck = canonical_vault_key(vault_name)
-                    if ck in canon_keys:
-                        # Show one exemplar for clarity
-                        exemplar = (by_canon.get(ck) or [None])[0]
-                        verbose = "conflicts with existing vault when ignoring case, spaces, and dashes"
-                        if exemplar:
-                            verbose += f" (existing '{exemplar.name}'"
-                            if getattr(exemplar, "id", None):
-                                verbose += f", id={exemplar.id}"
-                            verbose += ")"
-                        failures.append(VaultFailure(
-                            batch_name=batch_name,
-                            project=project,
-                            vault_name=vault_name,
-                            error=verbose,
-                        ))
-                        print(f"[SKIP-FUZZY] {vault_name} (batch={batch_name}) -> {verbose}")
-                        continue
-
-                    try:
-                        resp = try_create_vault(vault_name)
-                        vault_id = _extract_vault_id(resp)
-
-                        success = VaultSuccess(
-                            batch_name=batch_name,
-                            project=project,
-                            vault_name=vault_name,
-                            vault_id=vault_id,
-                        )
-                        successes.append(success)
-
-                        with rollback_path.open("a", encoding="utf-8") as fh:
-                            fh.write(json.dumps(success.model_dump()) + os.linesep)
-
-                        print(f"[OK] {vault_name} (batch={batch_name}), id={vault_id}")
-
-                    except VaultCreationError as e:
-                        msg = str(e)
-                        failures.append(
-                            VaultFailure(
-                                batch_name=batch_name,
-                                project=project,
-                                vault_name=vault_name,
-                                error=msg,
-                            )
-                        )
-                        print(f"[ERR] {vault_name} (batch={batch_name}) -> {msg}")
-
-    finished_at = _now()
     receipt = RunReceipt(
         run_id=run_id,
         actor_uuid=uuid,
@@ -252,18 +481,293 @@ def run_from_inputs(uuid: str, base_dir: Optional[Path] = None) -> Path:
         errors=errors,
         successes=successes,
         failures=failures,
+        timings=timings,
     )
-
-    receipt_filename = "batch_from_inputs-receipt.json"
-    with (run_dir / receipt_filename).open("w", encoding="utf-8") as fh:
+    receipt_path = run_dir / RECEIPT_FILENAME
+    with receipt_path.open("w", encoding="utf-8") as fh:
         json.dump(receipt.model_dump(), fh, indent=2, ensure_ascii=False)
+    record_finished(run_id, finished_at, len(successes), len(failures))
+    ledger.record_run(run_id, finished_at=finished_at, successes=len(successes), failures=len(failures))
+    return receipt_path
+
 
+def _print_artifacts(receipt_path: Path, journal: _RunJournal, tracer: Tracer) -> None:
     # Helpful, human-readable pointer
     to_stdout = [
         "Run Complete. Artifacts:",
-        f" - {run_dir / receipt_filename}",
-        f" - {rollback_path}",
+        f" - {receipt_path}",
+        f" - {journal.rollback_path}",
     ]
+    if tracer.trace_path is not None:
+        to_stdout.append(f" - {tracer.trace_path}")
     print("\n".join(to_stdout))
 
+
+def run_from_inputs(
+    uuid: str,
+    base_dir: Optional[Path] = None,
+    concurrency: int = 1,
+    refresh_inventory: bool = False,
+    resume_run_id: Optional[str] = None,
+    stream_receipt: Optional[bool] = None,
+    scan_workers: Optional[int] = None,
+    trace: Optional[bool] = None,
+    session: Optional[Session] = None,
+) -> Path:
+    """
+    Executes a batch run from ./input/*-vault-prefixes.txt + *-vault-suffixes.txt.
+    Produces:
+      - receipt JSON  (per-run summary)
+      - rollback.jsonl (one line per successful vault creation)
+    Skips any batch_name that is missing either side (prefixes or suffixes), with a warning.
+    The plan is generated lazily, one vault at a time. Names repeated across the
+    plan (exactly or canonically) are dropped up front; the first one is kept.
+    With concurrency > 1, creations are dispatched to a bounded worker pool; the
+    receipt still lists successes/failures in plan order.
+    Existing vaults come from the inventory cache (if at most
+    settings.runInventoryCacheTtlSec old) unless refresh_inventory is set,
+    via session (a fresh one if None); the run keeps that index in step with
+    what it creates, so later calls on the same session need no relisting.
+    With resume_run_id, continues that run in place: planned vaults already
+    settled there are carried over without calling `op`, and one combined
+    receipt is written.
+    With stream_receipt (default: settings.streamReceipts), the receipt is
+    written item-by-item as NDJSON instead of being held in memory.
+    scan_workers overrides settings.scanWorkers for parsing input files.
+    Timing spans (op calls, pacing sleeps, validation) are summarized in the
+    receipt; with trace (default: settings.traceSpans) each raw span is also
+    written to trace.jsonl in the run directory.
+    """
+    if stream_receipt is None:
+        stream_receipt = settings.streamReceipts
+    if trace is None:
+        trace = settings.traceSpans
+    if session is None:
+        session = Session()
+
+    run_id, run_dir, started_at, settled = _open_run(uuid, resume_run_id, "batch")
+    journal = _RunJournal(run_dir)
+    tracer = start_trace(run_dir / TRACE_FILENAME if trace else None)
+
+    pool: Optional[ThreadPoolExecutor] = None
+    stream: Optional[ReceiptStreamWriter] = None
+    try:
+        scan = load_all_inputs(base_dir=base_dir, workers=scan_workers)
+
+        # Aggregate file-level warnings/errors for the final receipt
+        warnings: list[str] = []
+        errors: list[str] = []
+        input_files: list[str] = []
+
+        for files in [scan.prefix_files, scan.suffix_files]:
+            for f in files:
+                input_files.append(f.path.name)
+                warnings.extend(f"[{f.batch_name}] {w}" for w in f.warnings)
+                errors.extend(f"[{f.batch_name}] {e}" for e in f.errors)
+
+        if stream_receipt:
+            stream = ReceiptStreamWriter(
+                run_dir / STREAM_RECEIPT_FILENAME,
+                "batch_from_inputs",
+                started_at,
+                run_id=run_id,
+                actor_uuid=uuid,
+                input_files=input_files,
+            )
+        outcomes = _OutcomeSink(stream)
+
+        # Bound queued + in-flight creates so the pool never holds the whole plan
+        in_flight = threading.BoundedSemaphore(max(1, concurrency) * 2)
+        if concurrency > 1:
+            pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="create")
+
+        try:
+            index = session.vault_index(refresh=refresh_inventory, max_age=settings.runInventoryCacheTtlSec)
+        except Exception as e:
+            warnings.append(f"[global] Could not list existing vaults; only checking against this run: {e}")
+            index = VaultIndex()
+
+        if scan.fatal_errors:
+            errors.extend(scan.fatal_errors)
+        else:
+            # Cross-product per batch_name, but only when both sides present
+            batches, prefix_only, suffix_only = plan_batches(scan)
+            for b in prefix_only:
+                warnings.append(
+                    f"[{b}] Skipping batch: found prefixes but no *-vault-suffixes.txt."
+                )
+            for b in suffix_only:
+                warnings.append(
+                    f"[{b}] Skipping batch: found suffixes but no *-vault-prefixes.txt."
+                )
+
+            # Drop duplicate/colliding names within the plan before any `op` call
+            clashes = find_plan_clashes(batches)
+            if clashes:
+                n_dup = sum(1 for c in clashes.values() if c.kind == "duplicate")
+                msg = (
+                    f"Dropped {n_dup} duplicate and {len(clashes) - n_dup} colliding "
+                    f"planned vault name(s) before creating anything."
+                )
+                print(f"PLAN: {msg}")
+                warnings.append(f"[plan] {msg}")
+
+            for seq, planned in enumerate(iter_planned_vaults(batches)):
+                clash = clashes.get(seq)
+                if clash is not None:
+                    outcomes.add(_drop_clash(planned, clash, settled, journal))
+                    continue
+
+                decided = _precheck(planned, index, settled, journal)
+                if decided is not None:
+                    outcomes.add(decided)
+                    continue
+
+                _dispatch(planned, journal, index, outcomes, pool, in_flight)
+
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+        if settled:
+            warnings.append(
+                f"[resume] {len(settled)} previously settled vault(s) are no longer in the plan; "
+                f"they remain in {ROLLBACK_FILENAME} if they were created."
+            )
+
+        receipt_path = _finish_run(
+            run_id, uuid, run_dir, started_at, input_files, warnings, errors, outcomes, stream, tracer
+        )
+    finally:
+        # On interruption: drop queued creates, let in-flight ones finish, persist journals
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+        journal.close()
+        stop_trace(tracer)
+        if stream is not None:
+            stream.abandon()
+
+    _print_artifacts(receipt_path, journal, tracer)
+    return run_dir
+
+
+def run_from_plan(
+    uuid: str,
+    plan_path: Path,
+    base_dir: Optional[Path] = None,
+    concurrency: int = 1,
+    resume_run_id: Optional[str] = None,
+    stream_receipt: Optional[bool] = None,
+    trace: Optional[bool] = None,
+    session: Optional[Session] = None,
+) -> Path:
+    """
+    Executes a plan written by `preview_from_inputs(plan_out=...)`.
+    Only "new" items are created; the rest are recorded as skipped with the
+    preview's reason. Inputs are not re-parsed, so the run refuses to start
+    when any input file was added, removed or modified since the plan was
+    written. "New" names are checked again against session's vault index
+    (listed afresh unless the inventory cache is younger than
+    runInventoryCacheTtlSec), so vaults created since the preview are skipped
+    instead of duplicated.
+    Artifacts, --resume, concurrency, streaming and tracing behave as in
+    run_from_inputs; --resume only continues an apply-plan run of the same plan file.
+    """
+    if stream_receipt is None:
+        stream_receipt = settings.streamReceipts
+    if trace is None:
+        trace = settings.traceSpans
+    if session is None:
+        session = Session()
+
+    plan = read_plan(plan_path)
+    stale = stale_inputs(plan, base_dir)
+    if stale:
+        raise RuntimeError(
+            f"Plan {plan_path} is out of date; re-run --preview-from-inputs --plan-out:\n"
+            + "\n".join(f"  - {p}" for p in stale)
+        )
+
+    run_id, run_dir, started_at, settled = _open_run(
+        uuid, resume_run_id, "apply-plan", plan=str(plan_path), plan_sha256=file_digest(plan_path)
+    )
+    journal = _RunJournal(run_dir)
+    tracer = start_trace(run_dir / TRACE_FILENAME if trace else None)
+
+    pool: Optional[ThreadPoolExecutor] = None
+    stream: Optional[ReceiptStreamWriter] = None
+    try:
+        input_files = [Path(f.path).name for f in plan.inputs]
+        warnings = list(plan.warnings)
+        errors = list(plan.errors)
+        age = "unknown" if plan.inventory_age_sec is None else f"{plan.inventory_age_sec:.0f}s"
+        warnings.append(
+            f"[plan] Applied {plan_path} (written {plan.created_at.isoformat()}, "
+            f"vault list age {age} at the time); new vaults were checked against the current vault list."
+        )
+
+        if stream_receipt:
+            stream = ReceiptStreamWriter(
+                run_dir / STREAM_RECEIPT_FILENAME,
+                "batch_from_inputs",
+                started_at,
+                run_id=run_id,
+                actor_uuid=uuid,
+                input_files=input_files,
+            )
+        outcomes = _OutcomeSink(stream)
+
+        in_flight = threading.BoundedSemaphore(max(1, concurrency) * 2)
+        if concurrency > 1:
+            pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="create")
+
+        # The plan checked every name against itself; vaults may have been created since
+        try:
+            index = session.vault_index(max_age=settings.runInventoryCacheTtlSec)
+        except Exception as e:
+            warnings.append(f"[global] Could not list existing vaults; only checking against this run: {e}")
+            index = VaultIndex()
+
+        for item in plan.items:
+            planned = PlannedVault(item.batch_name, item.project, item.role, item.vault_name)
+
+            if item.status != "new":
+                prior = _resumed(planned, index, settled)
+                if prior is not None:
+                    outcomes.add(prior)
+                    continue
+                reason = item.status + (f": {item.detail}" if item.detail else "")
+                skip = VaultFailure(
+                    batch_name=item.batch_name,
+                    project=item.project,
+                    vault_name=item.vault_name,
+                    error=f"skipped by plan ({reason})",
+                )
+                journal.record_failure(skip, skipped=True)
+                print(f"[SKIP-PLAN] {item.vault_name} (batch={item.batch_name}) -> {reason}")
+                outcomes.add(skip)
+                continue
+
+            # settled earlier (--resume), or created since the preview
+            decided = _precheck(planned, index, settled, journal)
+            if decided is not None:
+                outcomes.add(decided)
+                continue
+
+            _dispatch(planned, journal, index, outcomes, pool, in_flight)
+
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+        receipt_path = _finish_run(
+            run_id, uuid, run_dir, started_at, input_files, warnings, errors, outcomes, stream, tracer
+        )
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+        journal.close()
+        stop_trace(tracer)
+        if stream is not None:
+            stream.abandon()
+
+    _print_artifacts(receipt_path, journal, tracer)
     return run_dir
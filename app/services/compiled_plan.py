@@ -0,0 +1,57 @@
+# app/services/compiled_plan.py
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from app.models.CompiledPlan import PLAN_VERSION, CompiledPlan, PlanInputFile
+from app.services.load_project_inputs import find_prefix_files, find_suffix_files
+from app.services.scan_cache import file_digest
+
+
+def input_fingerprints(paths: Iterable[Path]) -> List[PlanInputFile]:
+    return [PlanInputFile(path=str(p), sha256=file_digest(p)) for p in paths]
+
+
+def write_plan(path: Path, plan: CompiledPlan) -> None:
+    """Write the plan atomically, so --apply-plan never reads a half-written file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as fh:
+        json.dump(plan.model_dump(mode="json"), fh, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def read_plan(path: Path) -> CompiledPlan:
+    with path.open("r", encoding="utf-8") as fh:
+        plan = CompiledPlan.model_validate(json.load(fh))
+    if plan.version != PLAN_VERSION:
+        raise ValueError(
+            f"Unsupported plan version {plan.version} (expected {PLAN_VERSION}): {path}"
+        )
+    return plan
+
+
+def stale_inputs(plan: CompiledPlan, base_dir: Optional[Path] = None) -> List[str]:
+    """
+    Compare the plan's input files with the current ./input directory.
+    Returns one message per added, removed or modified file; empty when the
+    inputs are exactly those the plan was compiled from.
+    """
+    current = {str(p) for p in [*find_prefix_files(base_dir), *find_suffix_files(base_dir)]}
+    planned = {f.path: f.sha256 for f in plan.inputs}
+    problems: List[str] = []
+    for p in sorted(current - set(planned)):
+        problems.append(f"added since the plan was written: {p}")
+    for p, sha in sorted(planned.items()):
+        if p not in current:
+            problems.append(f"removed since the plan was written: {p}")
+            continue
+        try:
+            if file_digest(Path(p)) != sha:
+                problems.append(f"modified since the plan was written: {p}")
+        except OSError as e:
+            problems.append(f"unreadable: {p} ({e})")
+    return problems
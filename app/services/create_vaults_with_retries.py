@@ -1,9 +1,10 @@
+import asyncio
 import time
-from typing import Optional
+from typing import Optional, Tuple
 
-from app.config.settings import settings
 from app.models.CreateVaultResponse import CreateVaultResponse
-from app.models.SubprocessResponse import OpStatus
+from app.models.SubprocessResponse import OpStatus, SubprocessResponse
+from app.models.VaultListItem import VaultListItem
 from app.services.exc import (
     CommandFailureError,
     OutputParseError,
@@ -11,7 +12,10 @@ from app.services.exc import (
     UnknownStatusError,
     VaultCreationError,
 )
-from app.services.run_command import op_create_vault
+from app.services.rate_governor import RetryBudget, governor, is_transient
+from app.services.tracing import span
+from app.services.run_command import op_create_vault, op_create_vault_async
+from app.services.vault_inventory import record_created
 
 
 def _print(s: str):
@@ -22,14 +26,84 @@ def _print_oneline(s: list):
     print(f"\tCREATE: {' '.join(s)}")
 
 
-def _sleep_seconds(seconds: int):
-    _print(f"Sleeping for {seconds} sec...")
-    time.sleep(seconds)
+def _pace_wait() -> float:
+    wait = governor.reserve()
+    if wait >= 1:
+        _print(f"Pacing for {wait:.1f} sec (rate={governor.rate:.2f} ops/sec)...")
+    return wait
 
 
-def _sleep_minutes(minutes: int):
-    _print(f"Sleeping for {minutes} min...")
-    time.sleep(minutes * 60)
+def _pace():
+    wait = _pace_wait()
+    if wait > 0:
+        with span("pace.sleep", op="create"):
+            time.sleep(wait)
+
+
+async def _pace_async():
+    wait = _pace_wait()
+    if wait > 0:
+        with span("pace.sleep", op="create"):
+            await asyncio.sleep(wait)
+
+
+def _evaluate(
+    sr: SubprocessResponse, vault: str
+) -> Tuple[Optional[CreateVaultResponse], Optional[VaultCreationError], bool]:
+    """
+    Interpret one `op vault create` attempt.
+    Returns: (validated, error, retryable) -- exactly one of validated/error is set.
+    """
+    if sr.status == OpStatus.RATE_LIMITED:
+        governor.on_rate_limited()
+        error = RateLimitedError(
+            message=f"`op create vault {vault}` rate-limited: pacing down to {governor.rate:.2f} ops/sec.",
+        )
+        _print("[NEW WARN] " + str(error))
+        return None, error, True
+
+    elif sr.status == OpStatus.FAILURE:
+        error = CommandFailureError(
+            command="vault create", return_code=sr.return_code, stderr=sr.error
+        )
+        _print_oneline(
+            [
+                "[NEW ERR]",
+                f"`op create vault {vault}` failed:",
+                f"return-code={sr.return_code},error={sr.error}",
+            ]
+        )
+        return None, error, is_transient(sr.error, repeatable=False)
+
+    elif sr.status == OpStatus.SUCCESS:
+        governor.on_success()
+        try:
+            with span("create.validate"):
+                validated = sr.parsed or CreateVaultResponse.model_validate(sr.formatted_output)
+        except Exception as e:
+            error = OutputParseError(
+                "could not interpret vault creation output: " + str(e)
+            )
+            _print(str(error))
+            return None, error, False
+        _print("Vault created sucessfully!")
+        record_created(
+            VaultListItem(
+                id=validated.id,
+                name=validated.name,
+                content_version=validated.content_version,
+                created_at=validated.created_at.isoformat(),
+                updated_at=validated.updated_at.isoformat(),
+                items=validated.items,
+            )
+        )
+        return validated, None, False
+
+    error = UnknownStatusError(
+        f"Unknown status {sr.status!r} (return_code={sr.return_code})"
+    )
+    _print(str(error))
+    return None, error, False
 
 
 def try_create_vault(vault: str) -> Optional[CreateVaultResponse]:
@@ -39,59 +113,48 @@ def try_create_vault(vault: str) -> Optional[CreateVaultResponse]:
     - On failure: raises VaultCreationError (subclass)
     """
 
-    attempts = 0
-    max_attempts = settings.maxRetries if settings.shouldRetry else 1
+    budget = RetryBudget()
     last_error: Optional[VaultCreationError] = None
 
-    while attempts < max_attempts:
-        sr = op_create_vault(vault)
-
-        if sr.status == OpStatus.RATE_LIMITED:
-            last_error = RateLimitedError(
-                message=f"`op create vault {vault}` rate-limited: retrying after sleep.",
-                retry_after_minutes=settings.backoffMin,
-            )
-            _print("[NEW WARN] " + str(last_error))
-            if attempts < max_attempts - 1:
-                _sleep_minutes(minutes=settings.backoffMin)
-                attempts += 1
-                continue
-            else:
+    with span("vault.create", vault=vault) as s:
+        attempt = 0
+        while True:
+            attempt += 1
+            s.attrs["attempts"] = attempt
+            _pace()
+            validated, last_error, retryable = _evaluate(op_create_vault(vault), vault)
+            if validated is not None:
+                return validated
+            if not (retryable and budget.retry(isinstance(last_error, RateLimitedError))):
                 break
 
-        elif sr.status == OpStatus.FAILURE:
-            last_error = CommandFailureError(
-                command="vault create", return_code=sr.return_code, stderr=sr.error
-            )
-            _print_oneline(
-                [
-                    "[NEW ERR]",
-                    f"`op create vault {vault}` failed:",
-                    f"return-code={sr.return_code},error={sr.error}",
-                ]
-            )
-            break
-
-        elif sr.status == OpStatus.SUCCESS:
-            try:
-                validated = CreateVaultResponse.model_validate(sr.formatted_output)
-                _print("Vault created sucessfully!")
-                if settings.shouldBuffer:
-                    _sleep_seconds(seconds=settings.bufferSeconds)
+        # Out of attempts -> raise the last error we saw
+        error = last_error or VaultCreationError("Vault creation failed for unknown reasons.")
+        s.outcome = type(error).__name__
+        raise error
+
+
+async def try_create_vault_async(vault: str) -> Optional[CreateVaultResponse]:
+    """
+    Async variant of `try_create_vault`; shares pacing and retry semantics.
+    """
+
+    budget = RetryBudget()
+    last_error: Optional[VaultCreationError] = None
+
+    with span("vault.create", vault=vault) as s:
+        attempt = 0
+        while True:
+            attempt += 1
+            s.attrs["attempts"] = attempt
+            await _pace_async()
+            sr = await op_create_vault_async(vault)
+            validated, last_error, retryable = _evaluate(sr, vault)
+            if validated is not None:
                 return validated
-            except Exception as e:
-                last_error = OutputParseError(
-                    "could not interpret vault creation output: " + str(e)
-                )
-                _print(str(last_error))
+            if not (retryable and budget.retry(isinstance(last_error, RateLimitedError))):
                 break
 
-        else:
-            last_error = UnknownStatusError(
-                f"Unknown status {sr.status!r} (return_code={sr.return_code})"
-            )
-            _print(str(last_error))
-            break
-
-    # Out of attempts -> raise the last error we saw
-    raise last_error or VaultCreationError("Vault creation failed for unknown reasons.")
+        error = last_error or VaultCreationError("Vault creation failed for unknown reasons.")
+        s.outcome = type(error).__name__
+        raise error
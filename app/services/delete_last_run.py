@@ -1,46 +1,70 @@
 from __future__ import annotations
 
 import json
-from datetime import datetime, timezone
+import re
+import secrets
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, time, timedelta, timezone, tzinfo
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Deque, Iterable, List, Optional, Set, Tuple, Union
+from zoneinfo import ZoneInfo
 
-from pydantic import ValidationError
+from pydantic import BaseModel, ValidationError
 
+from app.config.settings import settings
+from app.models.CleanupReceipt import CleanupReceipt
 from app.models.DeleteRunReceipt import (
     DeleteRunReceipt,
     VaultDeleteFailure,
     VaultDeleteSuccess,
 )
+from app.models.PacificDatetime import to_pacific
 from app.models.RunReceipt import VaultSuccess  # structure in rollback.jsonl
+from app.services import ledger
 from app.services.delete_vaults_with_retries import try_delete_vault
-from app.services.who_am_i import try_get_uuid
+from app.services.exc import VaultNotFoundError
+from app.services.journal_writer import JournalWriter
+from app.services.list_vaults import VaultIndex, normalize_vault_name
+from app.services.metrics import count_vault
+from app.services.receipt_stream import (
+    ReceiptStreamWriter,
+    read_cleanup_receipt,
+    read_delete_receipt,
+)
+from app.services.run_registry import (
+    REGISTRY_PATH,
+    latest_undeleted_run,
+    load_runs,
+    record_deleted,
+)
+from app.services.session import Session
+from app.services.tracing import start_trace, stop_trace, submit
 
 OUTPUT_BASE_DIR = Path("output") / "runs"
 DELETE_RECEIPT_NAME = "delete_last_run-receipt.json"
+DELETE_STREAM_RECEIPT_NAME = "delete_last_run-receipt.ndjson"
 ROLLBACK_FILENAME = "rollback.jsonl"
+DELETE_TRACE_NAME = "delete_last_run-trace.jsonl"  # raw timing spans, with trace enabled
 
+CLEANUP_BASE_DIR = Path("output") / "cleanups"
+CLEANUP_RECEIPT_NAME = "cleanup_runs-receipt.json"
+CLEANUP_STREAM_RECEIPT_NAME = "cleanup_runs-receipt.ndjson"
+CLEANUP_TRACE_NAME = "cleanup_runs-trace.jsonl"
 
-def _now() -> datetime:
-    return datetime.now(timezone.utc)
+# One line per vault actually deleted, by any delete or cleanup; append-only, so
+# unlike the receipts it cannot be overwritten by a later (dry) run
+DELETIONS_LOG = Path("output") / "deletions.jsonl"
 
+# Run ids start with their creation time (see batch_from_inputs._new_run_id)
+RUN_ID_TIME_FORMATS = ("%Y-%m-%d_%H-%M-%S%z", "%Y-%m-%d_%H-%M-%SZ")
+AGE_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
 
-def _list_run_dirs() -> list[Path]:
-    if not OUTPUT_BASE_DIR.exists():
-        return []
-    return sorted(
-        [p for p in OUTPUT_BASE_DIR.iterdir() if p.is_dir()],
-        key=lambda p: p.stat().st_mtime,
-        reverse=True,
-    )
+DeleteOutcome = Union[VaultDeleteSuccess, VaultDeleteFailure]
 
 
-def _find_last_rollback() -> Optional[Path]:
-    for run_dir in _list_run_dirs():
-        rollback = run_dir / ROLLBACK_FILENAME
-        if rollback.exists() and rollback.is_file() and rollback.stat().st_size > 0:
-            return run_dir
-    return None
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
 
 
 def _resolve_run_dir(run_id: Optional[str]) -> Path:
@@ -58,13 +82,13 @@ def _resolve_run_dir(run_id: Optional[str]) -> Path:
         # the provided run_id was valid, return the Path
         return run_dir
 
-    # no run_id provided (or was empty), use the last run_id
-    latest = _find_last_rollback()
-    if not latest:
+    # no run_id provided (or was empty), use the latest run the registry says still has vaults
+    latest = latest_undeleted_run()
+    if latest is None or not (OUTPUT_BASE_DIR / latest.run_id).is_dir():
         raise RuntimeError(
-            "No run with a non-empty rollback.jsonl was found in output/runs/"
+            f"No run with undeleted vaults was found in {REGISTRY_PATH} (see --list-runs)"
         )
-    return latest
+    return OUTPUT_BASE_DIR / latest.run_id
 
 
 def _read_rollback(rb_path: Path) -> list[VaultSuccess]:
@@ -84,14 +108,186 @@ def _read_rollback(rb_path: Path) -> list[VaultSuccess]:
     return results
 
 
+def _delete_one(
+    run_id: str, entry: VaultSuccess, index: Optional[VaultIndex]
+) -> DeleteOutcome:
+    """Delete the vault of one rollback entry. Safe to run on a worker thread."""
+    identifier = entry.vault_id or entry.vault_name  # prefer ID if present
+    try:
+        try_delete_vault(identifier)
+    except VaultNotFoundError:
+        # deleted outside this tool (or by a pass that could not record it): nothing left to do
+        print(f"[DEL GONE] {identifier} no longer exists")
+    except Exception as e:
+        print(f"[DEL ERR] {identifier} -> {e}")
+        count_vault("failed")
+        return VaultDeleteFailure(
+            vault_id=entry.vault_id,
+            vault_name=entry.vault_name,
+            batch_name=entry.batch_name,
+            project=entry.project,
+            run_id=run_id,
+            error=str(e),
+        )
+    else:
+        print(f"[DEL OK] {identifier}")
+    if index is not None:
+        index.remove(identifier)
+    count_vault("deleted")
+    return VaultDeleteSuccess(
+        vault_id=entry.vault_id,
+        vault_name=entry.vault_name,
+        batch_name=entry.batch_name,
+        project=entry.project,
+        run_id=run_id,
+    )
+
+
+class _DeleteOutcomes:
+    """
+    Planned/succeeded/failed deletions, in rollback order: held in memory for
+    the JSON receipt, or written straight to a streamed receipt. Deleted vaults
+    also go to the deletions log when one is given, and to the SQLite ledger
+    (under `operation_id`) when it is enabled.
+    """
+
+    def __init__(
+        self,
+        operation_id: str,
+        stream: Optional[ReceiptStreamWriter] = None,
+        deletions: Optional[JournalWriter] = None,
+    ):
+        self._operation_id = operation_id
+        self._stream = stream
+        self._deletions = deletions
+        self.planned: list[VaultDeleteSuccess] = []
+        self.successes: list[VaultDeleteSuccess] = []
+        self.failures: list[VaultDeleteFailure] = []
+        # run_id -> {"success": n, "failure": n}, for the run registry
+        self.by_run: dict[str, dict[str, int]] = {}
+
+    def record(self, type_: str, seq: int, record: BaseModel) -> None:
+        counts = self.by_run.setdefault(record.run_id, {})
+        counts[type_] = counts.get(type_, 0) + 1
+        if type_ == "success":
+            if self._deletions is not None:
+                self._deletions.write({
+                    "operation_id": self._operation_id,
+                    "run_id": record.run_id,
+                    "vault_id": record.vault_id,
+                    "vault_name": record.vault_name,
+                    "deleted_at": _now().isoformat(),
+                })
+            ledger.record_deleted(self._operation_id, record.run_id, record.vault_name, record.vault_id)
+        if self._stream is not None:
+            self._stream.item(type_, seq, record)
+        elif type_ == "planned":
+            self.planned.append(record)
+        elif type_ == "success":
+            self.successes.append(record)
+        else:
+            self.failures.append(record)
+
+
+def _delete_entries(
+    entries: Iterable[Tuple[str, VaultSuccess]],
+    dry_run: bool,
+    index: Optional[VaultIndex],
+    concurrency: int,
+    record: Callable[[str, int, BaseModel], None],
+) -> None:
+    """
+    Delete the vault of each (run_id, rollback entry), or with dry_run only
+    plan it. `record(type_, seq, record)` receives every outcome in input order.
+    With concurrency > 1, deletions run on a bounded worker pool (pacing and
+    rate-limit backoff stay shared).
+    """
+
+    def _settle(seq: int, outcome: DeleteOutcome) -> None:
+        if isinstance(outcome, VaultDeleteFailure):
+            record("failure", seq, outcome)
+        else:
+            record("success", seq, outcome)
+
+    pool: Optional[ThreadPoolExecutor] = None
+    if concurrency > 1 and not dry_run:
+        pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="delete")
+    # Submitted deletes, settled strictly in input order; bounded so the pool never holds the whole run
+    pending: Deque[Tuple[int, Future]] = deque()
+    window = max(1, concurrency) * 2
+
+    try:
+        for seq, (run_id, entry) in enumerate(entries):
+            if dry_run:
+                identifier = entry.vault_id or entry.vault_name  # prefer ID if present
+                planned = VaultDeleteSuccess(
+                    vault_id=entry.vault_id,
+                    vault_name=entry.vault_name,
+                    batch_name=entry.batch_name,
+                    project=entry.project,
+                    run_id=run_id,
+                )
+                record("planned", seq, planned)
+                count_vault("planned")
+                print(f"[DRY] would delete {identifier}")
+                continue
+
+            if pool is None:
+                _settle(seq, _delete_one(run_id, entry, index))
+                continue
+
+            while pending and (len(pending) >= window or pending[0][1].done()):
+                done_seq, fut = pending.popleft()
+                _settle(done_seq, fut.result())
+            pending.append((seq, submit(pool, _delete_one, run_id, entry, index)))
+
+        while pending:
+            done_seq, fut = pending.popleft()
+            _settle(done_seq, fut.result())
+    finally:
+        # On interruption: drop queued deletes, let in-flight ones finish
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
 # def delete_last_run() -> Path:
-def delete_last_run(run_id: Optional[str] = None, dry_run: bool = False) -> Path:
+def delete_last_run(
+    run_id: Optional[str] = None,
+    dry_run: bool = False,
+    index: Optional[VaultIndex] = None,
+    stream_receipt: Optional[bool] = None,
+    trace: Optional[bool] = None,
+    concurrency: int = 1,
+    session: Optional[Session] = None,
+) -> Path:
     """
-    Deletes all vaults listed in the latest run's rollback.jsonl.
-    If run_id is None, picks the latest run. If dry_run, no deletions are performed.
+    Deletes all vaults listed in the latest run's rollback.jsonl, except those
+    an earlier delete or cleanup already removed; a vault `op` no longer knows
+    counts as deleted, so a partially deleted run is finished by running again.
+    If run_id is None, picks the latest run the run registry lists with undeleted
+    vaults. If dry_run, no deletions are performed (and nothing is registered).
+    If an index is given (default: session's index, if it was already loaded),
+    each deleted vault is removed from it as it goes. The actor comes from
+    session (a fresh one if None), so `op whoami` is not repeated; a dry run
+    does not resolve it and records no actor.
+    With concurrency > 1, deletions run on a bounded worker pool (pacing and
+    rate-limit backoff stay shared); outcomes are still recorded in rollback order.
+    With stream_receipt (default: settings.streamReceipts), records are written
+    to an NDJSON receipt as they happen instead of being held in memory.
+    Timing spans are summarized in the receipt; with trace (default:
+    settings.traceSpans) they are also written to delete_last_run-trace.jsonl.
     Returns the path to the created delete receipt.
     """
-    actor_uuid = try_get_uuid()
+    if stream_receipt is None:
+        stream_receipt = settings.streamReceipts
+    if trace is None:
+        trace = settings.traceSpans
+    if session is None:
+        session = Session()
+    if index is None:
+        index = session.loaded_index()
+    # a dry run changes nothing, so it does not need `op whoami`
+    actor_uuid = None if dry_run else session.actor_uuid()
     started_at = _now()
 
     # run_dir = _find_latest_run_with_rollback()
@@ -101,61 +297,383 @@ def delete_last_run(run_id: Optional[str] = None, dry_run: bool = False) -> Path
     rollback_path = run_dir / ROLLBACK_FILENAME
     run_id_resolved = run_dir.name
 
-    entries = _read_rollback(rollback_path)
-    print(f"DELETE-LAST-RUN: Found {len(entries)} rollback entries in {rollback_path}")
+    # vaults an earlier (partial) delete or cleanup already removed are not sent to `op` again
+    pairs, n_deleted, _ = _merge_rollbacks([run_dir], _already_deleted())
+    entries = [entry for _, entry in pairs]
+    print(
+        f"DELETE-LAST-RUN: Found {len(entries)} rollback entries to delete in {rollback_path} "
+        f"({n_deleted} already deleted)"
+    )
     if dry_run:
         print("DELETE-LAST-RUN: DRY RUN (no deletions will occur)")
 
-    planned: list[VaultDeleteSuccess] = []
-    successes: list[VaultDeleteSuccess] = []
-    failures: list[VaultDeleteFailure] = []
+    tracer = start_trace(run_dir / DELETE_TRACE_NAME if trace else None)
+    stream: Optional[ReceiptStreamWriter] = None
+    if stream_receipt:
+        stream = ReceiptStreamWriter(
+            run_dir / DELETE_STREAM_RECEIPT_NAME,
+            "delete_last_run",
+            started_at,
+            run_id_deleted=run_id_resolved,
+            source_rollback_file=str(rollback_path),
+            actor_uuid=actor_uuid,
+            dry_run=dry_run,
+            already_deleted=n_deleted,
+        )
+    deletions = _open_deletions_log(dry_run)
+    outcomes = _DeleteOutcomes(run_id_resolved, stream, deletions)
 
-    for entry in entries:
-        identifier = entry.vault_id or entry.vault_name  # prefer ID if present
-        # pre-instantiate this record, may need for dry-run OR real-deal
-        record = VaultDeleteSuccess(
-            vault_id=entry.vault_id,
-            vault_name=entry.vault_name,
-            batch_name=entry.batch_name,
-            project=entry.project,
+    try:
+        _delete_entries(
+            ((run_id_resolved, entry) for entry in entries),
+            dry_run,
+            index,
+            concurrency,
+            outcomes.record,
         )
-        if dry_run:
-            planned.append(record)
-            print(f"[DRY] would delete {identifier}")
+
+        finished_at = _now()
+        timings = tracer.summary()
+        if stream is not None:
+            stream.close(
+                finished_at,
+                timings={name: t.model_dump() for name, t in timings.items()},
+            )
+            out_path = stream.path
+        else:
+            receipt = DeleteRunReceipt(
+                run_id_deleted=run_id_resolved,
+                source_rollback_file=str(rollback_path),
+                actor_uuid=actor_uuid,
+                started_at=started_at,
+                finished_at=finished_at,
+                dry_run=dry_run,
+                already_deleted=n_deleted,
+                planned=outcomes.planned,
+                successes=outcomes.successes,
+                failures=outcomes.failures,
+                timings=timings,
+            )
+
+            out_path = run_dir / DELETE_RECEIPT_NAME
+            with out_path.open("w", encoding="utf-8") as fh:
+                json.dump(receipt.model_dump(), fh, indent=2, ensure_ascii=False)
+        if not dry_run:
+            counts = outcomes.by_run.get(run_id_resolved, {})
+            record_deleted(run_id_resolved, counts.get("success", 0), counts.get("failure", 0))
+    finally:
+        ledger.flush()
+        if deletions is not None:
+            deletions.close()
+        stop_trace(tracer)
+        if stream is not None:
+            stream.abandon()
+
+    print(f"\nDelete complete. Receipt: {out_path}")
+    if tracer.trace_path is not None:
+        print(f"Trace: {tracer.trace_path}")
+    return out_path
+
+
+# -- Bulk cleanup of several runs ------------------------------------------------------
+
+
+def _local_tz() -> tzinfo:
+    return ZoneInfo("America/Los_Angeles") if settings.usePacificTz else timezone.utc
+
+
+def _parse_when(value: str, end_of_day: bool = False) -> datetime:
+    """
+    ISO date or datetime (e.g. 2025-09-01, 2025-09-01T16:00); naive values use the run-id timezone.
+    A bare date is its first instant, or with end_of_day its last, so `--until 2025-09-01`
+    includes that day.
+    """
+    value = value.strip()
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        raise RuntimeError(f"Invalid date/time {value!r}; use ISO format, e.g. 2025-09-01 or 2025-09-01T16:00")
+    if end_of_day and re.fullmatch(r"\d{4}-\d{2}-\d{2}", value):
+        dt = datetime.combine(dt.date(), time.max)
+    return dt if dt.tzinfo else dt.replace(tzinfo=_local_tz())
+
+
+def _parse_age(value: str) -> timedelta:
+    """Age like 90m, 12h, 7d or 2w."""
+    m = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smhdw])\s*", value)
+    if m is None:
+        raise RuntimeError(f"Invalid age {value!r}; use a number and one of s/m/h/d/w, e.g. 7d")
+    return timedelta(seconds=float(m.group(1)) * AGE_UNITS[m.group(2)])
+
+
+def _run_started_at(run_id: str) -> Optional[datetime]:
+    """Creation time encoded in a run id, or None for ids in another format."""
+    stamp = run_id.rsplit("_", 1)[0]
+    for fmt in RUN_ID_TIME_FORMATS:
+        try:
+            dt = datetime.strptime(stamp, fmt)
+        except ValueError:
+            continue
+        return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+    return None
+
+
+def _has_rollback(run_dir: Path) -> bool:
+    rb = run_dir / ROLLBACK_FILENAME
+    return rb.is_file() and rb.stat().st_size > 0
+
+
+def _select_runs(
+    run_ids: Optional[List[str]],
+    since: Optional[str],
+    until: Optional[str],
+    older_than: Optional[str],
+) -> list[Path]:
+    """
+    Run directories with a non-empty rollback.jsonl matching every given
+    selector, oldest first. Time selectors use the creation time in the run id.
+    """
+    if not (run_ids or since or until or older_than):
+        raise RuntimeError("Select runs with --run-ids, --since, --until and/or --older-than")
+    lower = _parse_when(since) if since else None
+    upper = _parse_when(until, end_of_day=True) if until else None
+    if older_than:
+        cutoff = _now() - _parse_age(older_than)
+        upper = cutoff if upper is None else min(upper, cutoff)
+
+    if run_ids:
+        candidates = []
+        for run_id in dict.fromkeys(run_ids):
+            run_dir = OUTPUT_BASE_DIR / run_id
+            if not run_dir.is_dir():
+                raise RuntimeError(f"Run id not found: {run_id}")
+            candidates.append(run_dir)
+    else:
+        # skip runs that never created anything or were fully deleted already
+        candidates = [
+            OUTPUT_BASE_DIR / r.run_id
+            for r in load_runs()
+            if r.rollback_status not in ("empty", "deleted")
+        ]
+
+    selected: list[tuple[datetime, Path]] = []
+    for run_dir in candidates:
+        if not _has_rollback(run_dir):
+            if run_ids:
+                print(f"CLEANUP-RUNS: {run_dir.name} has no (or an empty) rollback.jsonl; nothing to delete")
             continue
+        created = _run_started_at(run_dir.name)
+        if created is None and (lower or upper):
+            print(f"CLEANUP-RUNS: {run_dir.name} has no timestamp in its id; not matched by time")
+            continue
+        if (lower and created < lower) or (upper and created > upper):
+            continue
+        selected.append((created or datetime.min.replace(tzinfo=timezone.utc), run_dir))
+    selected.sort(key=lambda t: (t[0], t[1].name))
+    return [run_dir for _, run_dir in selected]
+
+
+def _vault_key(vault_id: Optional[str], vault_name: str) -> str:
+    return f"id:{vault_id}" if vault_id else f"name:{normalize_vault_name(vault_name)}"
+
+
+def _open_deletions_log(dry_run: bool) -> Optional[JournalWriter]:
+    if dry_run:
+        return None
+    DELETIONS_LOG.parent.mkdir(parents=True, exist_ok=True)
+    return JournalWriter(DELETIONS_LOG)
+
 
+def _add_deleted(deleted: Set[str], vault_id: Optional[str], vault_name: str) -> None:
+    deleted.add(_vault_key(vault_id, vault_name))
+    if vault_id:
+        # a later entry may only know the name of a vault deleted by id, or vice versa
+        deleted.add(_vault_key(None, vault_name))
+
+
+def _already_deleted() -> Set[str]:
+    """
+    Keys of vaults deleted by earlier deletes or cleanups: everything in the
+    deletions log, plus the successes of non-dry-run receipts (which cover
+    deletions made before the log existed).
+    """
+    deleted: Set[str] = set()
+    if DELETIONS_LOG.exists():
+        with DELETIONS_LOG.open("r", encoding="utf-8") as fh:
+            for raw in fh:
+                try:
+                    rec = json.loads(raw)
+                except json.JSONDecodeError:
+                    continue  # torn trailing line from an interrupted delete
+                if rec.get("vault_name"):
+                    _add_deleted(deleted, rec.get("vault_id"), rec["vault_name"])
+
+    receipts: list[Path] = []
+    if OUTPUT_BASE_DIR.exists():
+        for name in (DELETE_RECEIPT_NAME, DELETE_STREAM_RECEIPT_NAME):
+            receipts.extend(OUTPUT_BASE_DIR.glob(f"*/{name}"))
+    if CLEANUP_BASE_DIR.exists():
+        for name in (CLEANUP_RECEIPT_NAME, CLEANUP_STREAM_RECEIPT_NAME):
+            receipts.extend(CLEANUP_BASE_DIR.glob(f"*/{name}"))
+
+    for path in receipts:
         try:
-            try_delete_vault(identifier)
-            successes.append(record)
-            print(f"[DEL OK] {identifier}")
-        except Exception as e:
-            failures.append(
-                VaultDeleteFailure(
-                    vault_id=entry.vault_id,
-                    vault_name=entry.vault_name,
-                    batch_name=entry.batch_name,
-                    project=entry.project,
-                    error=str(e),
-                )
-            )
-            print(f"[DEL ERR] {identifier} -> {e}")
-
-    finished_at = _now()
-    receipt = DeleteRunReceipt(
-        run_id_deleted=run_id_resolved,
-        source_rollback_file=str(rollback_path),
-        actor_uuid=actor_uuid,
-        started_at=started_at,
-        finished_at=finished_at,
-        dry_run=dry_run,
-        planned=planned,
-        successes=successes,
-        failures=failures,
+            if path.name.startswith("cleanup_runs"):
+                receipt = read_cleanup_receipt(path)
+            else:
+                receipt = read_delete_receipt(path)
+        except (OSError, ValueError) as e:
+            print(f"[SKIP] unreadable receipt {path}: {e}")
+            continue
+        if receipt.dry_run:
+            continue
+        for v in receipt.successes:
+            _add_deleted(deleted, v.vault_id, v.vault_name)
+    return deleted
+
+
+def _merge_rollbacks(
+    run_dirs: list[Path], deleted: Set[str]
+) -> tuple[list[tuple[str, VaultSuccess]], int, int]:
+    """
+    All rollback entries of `run_dirs` in run order, minus vaults already
+    deleted and repeats across runs (the first entry wins).
+    Returns: (entries, already_deleted, duplicates)
+    """
+    entries: list[tuple[str, VaultSuccess]] = []
+    seen: Set[str] = set()
+    n_deleted = n_duplicates = 0
+    for run_dir in run_dirs:
+        for entry in _read_rollback(run_dir / ROLLBACK_FILENAME):
+            key = _vault_key(entry.vault_id, entry.vault_name)
+            if key in deleted:
+                n_deleted += 1
+                continue
+            if key in seen:
+                n_duplicates += 1
+                continue
+            seen.add(key)
+            entries.append((run_dir.name, entry))
+    return entries, n_deleted, n_duplicates
+
+
+def _new_cleanup_id(now: datetime) -> str:
+    if settings.usePacificTz:
+        timestamp = to_pacific(now).strftime("%Y-%m-%d_%H-%M-%S%z")
+    else:
+        timestamp = now.strftime("%Y-%m-%d_%H-%M-%SZ")
+    return f"{timestamp}_{secrets.token_hex(3)}"
+
+
+def cleanup_runs(
+    run_ids: Optional[List[str]] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    older_than: Optional[str] = None,
+    dry_run: bool = False,
+    index: Optional[VaultIndex] = None,
+    stream_receipt: Optional[bool] = None,
+    trace: Optional[bool] = None,
+    concurrency: int = 1,
+    session: Optional[Session] = None,
+) -> Path:
+    """
+    Deletes the vaults of several runs in one pass.
+    Runs are selected by id (run_ids) and/or by the creation time in their id
+    (since/until as ISO dates or datetimes, older_than as an age like 7d); every
+    given selector must match. Their rollback entries are merged oldest run
+    first, vaults listed by more than one run are deleted once, and vaults
+    already deleted by an earlier delete or cleanup are skipped.
+    One combined receipt is written to output/cleanups/<cleanup_id>/.
+    dry_run, index, stream_receipt, trace, concurrency and session work as in delete_last_run.
+    Returns the path to the combined receipt.
+    """
+    if stream_receipt is None:
+        stream_receipt = settings.streamReceipts
+    if trace is None:
+        trace = settings.traceSpans
+    if session is None:
+        session = Session()
+    if index is None:
+        index = session.loaded_index()
+    # a dry run changes nothing, so it does not need `op whoami`
+    actor_uuid = None if dry_run else session.actor_uuid()
+    started_at = _now()
+
+    run_dirs = _select_runs(run_ids, since, until, older_than)
+    selected = [d.name for d in run_dirs]
+    entries, n_deleted, n_duplicates = _merge_rollbacks(run_dirs, _already_deleted())
+    print(
+        f"CLEANUP-RUNS: {len(selected)} run(s) selected, {len(entries)} vault(s) to delete "
+        f"({n_deleted} already deleted, {n_duplicates} listed by more than one run)"
     )
+    if dry_run:
+        print("CLEANUP-RUNS: DRY RUN (no deletions will occur)")
 
-    out_path = run_dir / DELETE_RECEIPT_NAME
-    with out_path.open("w", encoding="utf-8") as fh:
-        json.dump(receipt.model_dump(), fh, indent=2, ensure_ascii=False)
+    cleanup_id = _new_cleanup_id(started_at)
+    cleanup_dir = CLEANUP_BASE_DIR / cleanup_id
+    cleanup_dir.mkdir(parents=True, exist_ok=True)
 
-    print(f"\nDelete complete. Receipt: {out_path}")
+    tracer = start_trace(cleanup_dir / CLEANUP_TRACE_NAME if trace else None)
+    stream: Optional[ReceiptStreamWriter] = None
+    if stream_receipt:
+        stream = ReceiptStreamWriter(
+            cleanup_dir / CLEANUP_STREAM_RECEIPT_NAME,
+            "cleanup_runs",
+            started_at,
+            cleanup_id=cleanup_id,
+            run_ids=selected,
+            actor_uuid=actor_uuid,
+            dry_run=dry_run,
+            already_deleted=n_deleted,
+            duplicates=n_duplicates,
+        )
+    deletions = _open_deletions_log(dry_run)
+    outcomes = _DeleteOutcomes(cleanup_id, stream, deletions)
+
+    try:
+        _delete_entries(entries, dry_run, index, concurrency, outcomes.record)
+
+        finished_at = _now()
+        timings = tracer.summary()
+        if stream is not None:
+            stream.close(
+                finished_at,
+                timings={name: t.model_dump() for name, t in timings.items()},
+            )
+            out_path = stream.path
+        else:
+            receipt = CleanupReceipt(
+                cleanup_id=cleanup_id,
+                run_ids=selected,
+                actor_uuid=actor_uuid,
+                started_at=started_at,
+                finished_at=finished_at,
+                dry_run=dry_run,
+                already_deleted=n_deleted,
+                duplicates=n_duplicates,
+                planned=outcomes.planned,
+                successes=outcomes.successes,
+                failures=outcomes.failures,
+                timings=timings,
+            )
+            out_path = cleanup_dir / CLEANUP_RECEIPT_NAME
+            with out_path.open("w", encoding="utf-8") as fh:
+                json.dump(receipt.model_dump(), fh, indent=2, ensure_ascii=False)
+        if not dry_run:
+            # every selected run was gone through, including runs whose vaults were all deleted before
+            for run_id in selected:
+                counts = outcomes.by_run.get(run_id, {})
+                record_deleted(run_id, counts.get("success", 0), counts.get("failure", 0))
+    finally:
+        ledger.flush()
+        if deletions is not None:
+            deletions.close()
+        stop_trace(tracer)
+        if stream is not None:
+            stream.abandon()
+
+    print(f"\nCleanup complete. Receipt: {out_path}")
+    if tracer.trace_path is not None:
+        print(f"Trace: {tracer.trace_path}")
     return out_path
@@ -1,80 +1,146 @@
 # app/services/delete_vaults_with_retries.py
 from __future__ import annotations
 
+import asyncio
 import time
-from typing import Optional
+from typing import Optional, Tuple
 
-from app.config.settings import settings
-from app.models.SubprocessResponse import OpStatus
+from app.models.SubprocessResponse import OpStatus, SubprocessResponse
 from app.services.exc import (
     CommandFailureError,
     RateLimitedError,
     UnknownStatusError,
     VaultCreationError,  # reuse types for rate limit / command failure
+    VaultNotFoundError,
 )
-from app.services.run_command import op_delete_vault
+from app.services.rate_governor import RetryBudget, governor, is_transient
+from app.services.tracing import span
+from app.services.run_command import op_delete_vault, op_delete_vault_async
+from app.services.vault_inventory import record_deleted
+
+# How `op vault delete` reports an id or name that matches no vault
+NOT_A_VAULT = "isn't a vault in this account"
 
 
 def _print(s: str) -> None:
     print(f"\tDELETE: {s}")
 
 
-def _sleep_seconds(seconds: int) -> None:
-    _print(f"Sleeping for {seconds} sec...")
-    time.sleep(seconds)
+def _pace_wait() -> float:
+    wait = governor.reserve()
+    if wait >= 1:
+        _print(f"Pacing for {wait:.1f} sec (rate={governor.rate:.2f} ops/sec)...")
+    return wait
 
 
-def _sleep_minutes(minutes: int) -> None:
-    _print(f"Sleeping for {minutes} min...")
-    time.sleep(minutes * 60)
+def _pace() -> None:
+    wait = _pace_wait()
+    if wait > 0:
+        with span("pace.sleep", op="delete"):
+            time.sleep(wait)
 
 
-def try_delete_vault(identifier: str) -> None:
-    """
-    Delete a vault by id or name.
-    - On success: returns None
-    - On failure: raises Exception (RateLimitedError, CommandFailureError, UnknownStatusError)
-    """
-    _print(f"Attempting to delete vault: {identifier!r}")
-    attempts = 0
-    max_attempts = settings.maxRetries if settings.shouldRetry else 1
-    buffer_seconds = settings.bufferSeconds if settings.shouldBuffer else 0
-    last_error: Optional[VaultCreationError] = None  # reuse base error class
+async def _pace_async() -> None:
+    wait = _pace_wait()
+    if wait > 0:
+        with span("pace.sleep", op="delete"):
+            await asyncio.sleep(wait)
 
-    while attempts < max_attempts:
-        sr = op_delete_vault(identifier)
 
-        if sr.status == OpStatus.RATE_LIMITED:
-            last_error = RateLimitedError(
-                "`op vault delete` rate-limited.", retry_after_minutes=10
-            )
-            _print(str(last_error))
-            if attempts < max_attempts - 1:
-                _sleep_minutes(settings.backoffMin)
-                attempts += 1
-                continue
-            break
-
-        elif sr.status == OpStatus.FAILURE:
-            last_error = CommandFailureError(
+def _evaluate(
+    sr: SubprocessResponse, identifier: str
+) -> Tuple[bool, Optional[VaultCreationError], bool]:
+    """
+    Interpret one `op vault delete` attempt.
+    Returns: (deleted, error, retryable)
+    """
+    if sr.status == OpStatus.RATE_LIMITED:
+        governor.on_rate_limited()
+        error = RateLimitedError(
+            f"`op vault delete` rate-limited: pacing down to {governor.rate:.2f} ops/sec."
+        )
+        _print(str(error))
+        return False, error, True
+
+    elif sr.status == OpStatus.FAILURE:
+        if NOT_A_VAULT in (sr.error or ""):
+            # already gone, so nothing is left to delete; the caller decides what that means
+            record_deleted(identifier)
+            error = VaultNotFoundError(
                 command="vault delete", return_code=sr.return_code, stderr=sr.error
             )
-            _print(str(last_error))
-            break
-
-        elif sr.status == OpStatus.SUCCESS:
-            _print("Vault deleted successfully.")
-            if settings.shouldBuffer:
-                _sleep_seconds(buffer_seconds)
-            return
-
         else:
-            last_error = UnknownStatusError(
-                f"Unknown status {sr.status!r} (return_code={sr.return_code})"
+            error = CommandFailureError(
+                command="vault delete", return_code=sr.return_code, stderr=sr.error
             )
-            _print(str(last_error))
-            break
+        _print(str(error))
+        return False, error, is_transient(sr.error, repeatable=True)
 
-    raise last_error or CommandFailureError(
-        command="vault delete", return_code=-1, stderr="Unknown delete failure"
+    elif sr.status == OpStatus.SUCCESS:
+        governor.on_success()
+        _print("Vault deleted successfully.")
+        record_deleted(identifier)
+        return True, None, False
+
+    error = UnknownStatusError(
+        f"Unknown status {sr.status!r} (return_code={sr.return_code})"
     )
+    _print(str(error))
+    return False, error, False
+
+
+def try_delete_vault(identifier: str) -> None:
+    """
+    Delete a vault by id or name.
+    - On success: returns None
+    - On failure: raises Exception (RateLimitedError, CommandFailureError, UnknownStatusError);
+      VaultNotFoundError when no such vault exists
+    """
+    _print(f"Attempting to delete vault: {identifier!r}")
+    budget = RetryBudget()
+    last_error: Optional[VaultCreationError] = None  # reuse base error class
+
+    with span("vault.delete", vault=identifier) as s:
+        attempt = 0
+        while True:
+            attempt += 1
+            s.attrs["attempts"] = attempt
+            _pace()
+            deleted, last_error, retryable = _evaluate(op_delete_vault(identifier), identifier)
+            if deleted:
+                return
+            if not (retryable and budget.retry(isinstance(last_error, RateLimitedError))):
+                break
+
+        error = last_error or CommandFailureError(
+            command="vault delete", return_code=-1, stderr="Unknown delete failure"
+        )
+        s.outcome = type(error).__name__
+        raise error
+
+
+async def try_delete_vault_async(identifier: str) -> None:
+    """
+    Async variant of `try_delete_vault`; shares pacing and retry semantics.
+    """
+    _print(f"Attempting to delete vault: {identifier!r}")
+    budget = RetryBudget()
+    last_error: Optional[VaultCreationError] = None
+
+    with span("vault.delete", vault=identifier) as s:
+        attempt = 0
+        while True:
+            attempt += 1
+            s.attrs["attempts"] = attempt
+            await _pace_async()
+            deleted, last_error, retryable = _evaluate(await op_delete_vault_async(identifier), identifier)
+            if deleted:
+                return
+            if not (retryable and budget.retry(isinstance(last_error, RateLimitedError))):
+                break
+
+        error = last_error or CommandFailureError(
+            command="vault delete", return_code=-1, stderr="Unknown delete failure"
+        )
+        s.outcome = type(error).__name__
+        raise error
@@ -22,6 +22,12 @@ class CommandFailureError(VaultCreationError):
         self.stderr = stderr
 
 
+class VaultNotFoundError(CommandFailureError):
+    """`op vault delete` named a vault that does not exist (e.g. deleted by an earlier pass)."""
+
+    pass
+
+
 class OutputParseError(VaultCreationError):
     """`op` reported success, but output could not be parsed/validated."""
 
@@ -0,0 +1,104 @@
+# app/services/journal_writer.py
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import List, Optional
+
+from app.config.settings import settings
+
+
+def ends_mid_line(path: Path) -> bool:
+    """Whether the non-empty file at `path` lacks a final newline (its last line was torn)."""
+    with path.open("rb") as fh:
+        if fh.seek(0, os.SEEK_END) == 0:
+            return False
+        fh.seek(-1, os.SEEK_END)
+        return fh.read(1) != b"\n"
+
+
+class JournalWriter:
+    """
+    Append-only JSONL writer with group commit.
+    - Keeps one file handle open for its lifetime
+    - write() hands each line to the OS right away (write + flush, no fsync),
+      so a killed process (SIGKILL, OOM) loses nothing that write() returned for
+    - Commits (fsync) when `max_lines` are unsynced, every `flush_interval`
+      seconds from a background thread, and on close()
+    - write() is safe to call from multiple threads; after close() it raises ValueError
+    Only an OS crash or power loss can drop lines: at most those written since
+    the last commit. A torn last line is possible, so readers should skip
+    undecodable lines; reopening such a file starts a fresh line first.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        flush_interval: Optional[float] = None,
+        max_lines: Optional[int] = None,
+        truncate: bool = False,
+    ):
+        self.path = path
+        self._flush_interval = (
+            settings.journalFlushIntervalSec if flush_interval is None else flush_interval
+        )
+        self._max_lines = max(1, settings.journalFlushMaxLines if max_lines is None else max_lines)
+        self._fh = path.open("w" if truncate else "a", encoding="utf-8")
+        if not truncate and ends_mid_line(path):
+            # a crash tore the last line; end it so the next line is not glued onto it
+            self._fh.write(os.linesep)
+        self._unsynced = 0
+        self._io_lock = threading.Lock()  # serializes writes and fsync on the handle
+        self._closed = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if self._flush_interval > 0:
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name=f"journal-{path.name}", daemon=True
+            )
+            self._flusher.start()
+
+    def __enter__(self) -> "JournalWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _flush_loop(self) -> None:
+        while not self._closed.wait(self._flush_interval):
+            self.commit()
+
+    def write(self, data: dict) -> None:
+        line = json.dumps(data, ensure_ascii=False) + os.linesep
+        with self._io_lock:
+            if self._fh.closed:
+                # e.g. a worker settling after shutdown: dropping the line could lose
+                # the rollback record of a vault that really exists
+                raise ValueError(f"journal closed: {self.path}")
+            self._fh.write(line)
+            self._fh.flush()
+            self._unsynced += 1
+            if self._unsynced >= self._max_lines or self._flush_interval <= 0:
+                self._sync()
+
+    def _sync(self) -> None:
+        # caller holds _io_lock
+        if self._unsynced and not self._fh.closed:
+            os.fsync(self._fh.fileno())
+            self._unsynced = 0
+
+    def commit(self) -> None:
+        """fsync every line written since the last commit, as one group."""
+        with self._io_lock:
+            self._sync()
+
+    def close(self) -> None:
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        with self._io_lock:
+            self._sync()
+            self._fh.close()
@@ -0,0 +1,326 @@
+# app/services/ledger.py
+from __future__ import annotations
+
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from app.config.settings import settings
+from app.models.RunReceipt import VaultSuccess
+from app.services.list_vaults import canonical_vault_key, normalize_vault_name
+from app.services.receipt_stream import read_cleanup_receipt, read_delete_receipt
+from app.services.run_registry import (
+    CLEANUP_RECEIPT_NAMES,
+    CLEANUPS_DIR,
+    DELETE_RECEIPT_NAMES,
+    ROLLBACK_FILENAME,
+    RUNS_DIR,
+    load_runs,
+)
+
+# Rows are buffered and written in one transaction per this many rows (and on flush)
+FLUSH_ROWS = 256
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id      TEXT PRIMARY KEY,
+    kind        TEXT,
+    actor_uuid  TEXT,
+    started_at  TEXT,
+    finished_at TEXT,
+    successes   INTEGER,
+    failures    INTEGER
+);
+CREATE TABLE IF NOT EXISTS creations (
+    id            INTEGER PRIMARY KEY,
+    run_id        TEXT NOT NULL,
+    batch_name    TEXT,
+    project       TEXT,
+    vault_name    TEXT NOT NULL,
+    vault_id      TEXT,
+    name_key      TEXT NOT NULL,
+    canonical_key TEXT NOT NULL,
+    created_at    TEXT NOT NULL,
+    UNIQUE (run_id, vault_name)
+);
+CREATE INDEX IF NOT EXISTS creations_vault_id ON creations (vault_id);
+CREATE INDEX IF NOT EXISTS creations_name_key ON creations (name_key);
+CREATE INDEX IF NOT EXISTS creations_canonical_key ON creations (canonical_key);
+CREATE TABLE IF NOT EXISTS deletions (
+    id            INTEGER PRIMARY KEY,
+    operation_id  TEXT NOT NULL,  -- run id (delete_last_run) or cleanup id (cleanup_runs)
+    run_id        TEXT,           -- run whose rollback.jsonl listed the vault
+    vault_name    TEXT NOT NULL,
+    vault_id      TEXT,
+    name_key      TEXT NOT NULL,
+    canonical_key TEXT NOT NULL,
+    deleted_at    TEXT NOT NULL,
+    UNIQUE (operation_id, run_id, vault_name)
+);
+CREATE INDEX IF NOT EXISTS deletions_vault_id ON deletions (vault_id);
+CREATE INDEX IF NOT EXISTS deletions_name_key ON deletions (name_key);
+CREATE INDEX IF NOT EXISTS deletions_canonical_key ON deletions (canonical_key);
+"""
+
+_lock = threading.Lock()
+_conn: Optional[sqlite3.Connection] = None
+_pending_creations: List[tuple] = []
+_pending_deletions: List[tuple] = []
+
+
+def _print(s: str) -> None:
+    print(f"\tLEDGER: {s}")
+
+
+def _iso(dt: datetime) -> str:
+    # stored as UTC so timestamps compare correctly as text
+    return dt.astimezone(timezone.utc).isoformat()
+
+
+def _now_iso() -> str:
+    return _iso(datetime.now(timezone.utc))
+
+
+def _connect(create: bool = True) -> Optional[sqlite3.Connection]:
+    """The shared connection (schema ensured), or None when the ledger file is missing and create is False."""
+    global _conn
+    if _conn is None:
+        path = Path(settings.ledgerPath)
+        if not create and not path.exists():
+            return None
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        _conn = conn
+    return _conn
+
+
+def _flush_locked() -> None:
+    if not (_pending_creations or _pending_deletions):
+        return
+    conn = _connect()
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO creations (run_id, batch_name, project, vault_name, vault_id,"
+            " name_key, canonical_key, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            _pending_creations,
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO deletions (operation_id, run_id, vault_name, vault_id,"
+            " name_key, canonical_key, deleted_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            _pending_deletions,
+        )
+    _pending_creations.clear()
+    _pending_deletions.clear()
+
+
+def flush() -> None:
+    """Write buffered rows; called when a run or delete finishes (or is interrupted)."""
+    if not settings.ledgerEnabled:
+        return
+    with _lock:
+        _flush_locked()
+
+
+def record_run(
+    run_id: str,
+    kind: Optional[str] = None,
+    actor_uuid: Optional[str] = None,
+    started_at: Optional[datetime] = None,
+    finished_at: Optional[datetime] = None,
+    successes: Optional[int] = None,
+    failures: Optional[int] = None,
+) -> None:
+    """Insert or update a run; fields left as None keep their stored value."""
+    if not settings.ledgerEnabled:
+        return
+    with _lock:
+        _upsert_run(_connect(), run_id, kind, actor_uuid, started_at, finished_at, successes, failures)
+
+
+def _upsert_run(conn, run_id, kind, actor_uuid, started_at, finished_at, successes, failures) -> None:
+    with conn:
+        conn.execute(
+            "INSERT INTO runs (run_id, kind, actor_uuid, started_at, finished_at, successes, failures)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT (run_id) DO UPDATE SET"
+            "  kind = COALESCE(excluded.kind, kind),"
+            "  actor_uuid = COALESCE(excluded.actor_uuid, actor_uuid),"
+            "  started_at = COALESCE(started_at, excluded.started_at),"
+            "  finished_at = COALESCE(excluded.finished_at, finished_at),"
+            "  successes = COALESCE(excluded.successes, successes),"
+            "  failures = COALESCE(excluded.failures, failures)",
+            (
+                run_id,
+                kind,
+                actor_uuid,
+                _iso(started_at) if started_at else None,
+                _iso(finished_at) if finished_at else None,
+                successes,
+                failures,
+            ),
+        )
+
+
+def _creation_row(run_id, batch_name, project, vault_name, vault_id, at: str) -> tuple:
+    return (
+        run_id, batch_name, project, vault_name, vault_id,
+        normalize_vault_name(vault_name), canonical_vault_key(vault_name), at,
+    )
+
+
+def _deletion_row(operation_id, run_id, vault_name, vault_id, at: str) -> tuple:
+    return (
+        operation_id, run_id, vault_name, vault_id,
+        normalize_vault_name(vault_name), canonical_vault_key(vault_name), at,
+    )
+
+
+def record_created(
+    run_id: str, batch_name: str, project: str, vault_name: str, vault_id: Optional[str]
+) -> None:
+    """A vault this tool created. Safe to call from worker threads."""
+    if not settings.ledgerEnabled:
+        return
+    with _lock:
+        _pending_creations.append(_creation_row(run_id, batch_name, project, vault_name, vault_id, _now_iso()))
+        if len(_pending_creations) >= FLUSH_ROWS:
+            _flush_locked()
+
+
+def record_deleted(
+    operation_id: str, run_id: Optional[str], vault_name: str, vault_id: Optional[str]
+) -> None:
+    """A vault this tool deleted, by delete_last_run (operation = run id) or cleanup_runs (cleanup id)."""
+    if not settings.ledgerEnabled:
+        return
+    with _lock:
+        _pending_deletions.append(_deletion_row(operation_id, run_id, vault_name, vault_id, _now_iso()))
+        if len(_pending_deletions) >= FLUSH_ROWS:
+            _flush_locked()
+
+
+def import_artifacts() -> None:
+    """
+    Load existing artifacts into the ledger (creating it if needed): registered
+    runs, their rollback.jsonl, delete receipts and cleanup receipts. Rows
+    already in the ledger are left alone, so it is safe to re-run.
+    """
+    conn = _connect()
+    creations: List[tuple] = []
+    deletions: List[tuple] = []
+    runs = load_runs()
+    for r in runs:
+        _upsert_run(conn, r.run_id, r.kind, r.actor_uuid, r.started_at, r.finished_at, r.successes, r.failures)
+        run_dir = RUNS_DIR / r.run_id
+        rollback = run_dir / ROLLBACK_FILENAME
+        if rollback.is_file():
+            # rollback lines carry no timestamp; the run's start is the best bound
+            at = _iso(r.started_at or r.finished_at or datetime.now(timezone.utc))
+            with rollback.open("r", encoding="utf-8") as fh:
+                for raw in fh:
+                    try:
+                        v = VaultSuccess.model_validate_json(raw)
+                    except ValueError:
+                        continue  # blank, torn or malformed line
+                    creations.append(_creation_row(r.run_id, v.batch_name, v.project, v.vault_name, v.vault_id, at))
+        for name in DELETE_RECEIPT_NAMES:
+            if (run_dir / name).exists():
+                try:
+                    receipt = read_delete_receipt(run_dir / name)
+                except (OSError, ValueError):
+                    continue
+                if not receipt.dry_run:
+                    at = _iso(receipt.finished_at)
+                    deletions.extend(
+                        _deletion_row(r.run_id, r.run_id, d.vault_name, d.vault_id, at) for d in receipt.successes
+                    )
+    for path in sorted(p for name in CLEANUP_RECEIPT_NAMES for p in CLEANUPS_DIR.glob(f"*/{name}")):
+        try:
+            receipt = read_cleanup_receipt(path)
+        except (OSError, ValueError):
+            continue
+        if not receipt.dry_run:
+            at = _iso(receipt.finished_at)
+            deletions.extend(
+                _deletion_row(receipt.cleanup_id, d.run_id, d.vault_name, d.vault_id, at) for d in receipt.successes
+            )
+    with _lock:
+        _pending_creations.extend(creations)
+        _pending_deletions.extend(deletions)
+        _flush_locked()
+    _print(
+        f"Imported {len(runs)} run(s), {len(creations)} creation(s) and {len(deletions)} deletion(s) "
+        f"into {settings.ledgerPath} (existing rows kept)."
+    )
+
+
+# -- Queries ------------------------------------------------------------------------
+
+
+def find_vault(query: str) -> List[Tuple[str, sqlite3.Row]]:
+    """
+    Creations whose vault id, normalized name or canonical key matches `query`,
+    oldest first, each with how it matched ("id", "exact" or "canonical") and
+    the first deletion after it (deleted_at/deleted_by are NULL while alive).
+    """
+    conn = _connect(create=False)
+    if conn is None:
+        return []
+    name_key = normalize_vault_name(query)
+    canonical_key = canonical_vault_key(query)
+    conn.row_factory = sqlite3.Row
+    try:
+        rows = conn.execute(
+            """
+            SELECT c.*,
+                   d.deleted_at AS deleted_at,
+                   d.operation_id AS deleted_by
+            FROM creations c
+            LEFT JOIN deletions d ON d.id = (
+                SELECT d2.id FROM deletions d2
+                WHERE (c.vault_id IS NOT NULL AND d2.vault_id = c.vault_id)
+                   OR (d2.name_key = c.name_key AND d2.deleted_at >= c.created_at
+                       AND (d2.vault_id IS NULL OR c.vault_id IS NULL))
+                ORDER BY d2.deleted_at
+                LIMIT 1
+            )
+            WHERE c.vault_id = ? OR c.name_key = ? OR c.canonical_key = ?
+            ORDER BY c.created_at
+            """,
+            (query.strip(), name_key, canonical_key),
+        ).fetchall()
+    finally:
+        conn.row_factory = None
+    matches: List[Tuple[str, sqlite3.Row]] = []
+    for row in rows:
+        if row["vault_id"] and row["vault_id"] == query.strip():
+            how = "id"
+        elif row["name_key"] == name_key:
+            how = "exact"
+        else:
+            how = "canonical"
+        matches.append((how, row))
+    return matches
+
+
+def print_find_vault(query: str) -> None:
+    if not Path(settings.ledgerPath).exists():
+        print(f"No ledger at {settings.ledgerPath} (enable LEDGER=true, or run --ledger-import)")
+        return
+    matches = find_vault(query)
+    if not matches:
+        print(f"{query!r}: never created by this tool (per {settings.ledgerPath})")
+        return
+    for how, row in matches:
+        status = f"DELETED {row['deleted_at']} by {row['deleted_by']}" if row["deleted_at"] else "ALIVE"
+        print(
+            f"[{how.upper()}] {row['vault_name']} id={row['vault_id'] or '-'} "
+            f"created {row['created_at']} by run {row['run_id']} -> {status}"
+        )
+    alive = sum(1 for _, row in matches if not row["deleted_at"])
+    print(f"{len(matches)} creation(s), {alive} alive")
@@ -1,13 +1,15 @@
 # app/services/list_vaults.py
 from __future__ import annotations
 import re
-from typing import Dict, Tuple, Set, List
+import threading
+from typing import Dict, Iterable, List, Optional
 
 from app.config.settings import settings
-from app.models.SubprocessResponse import OpStatus
+from app.models.SubprocessResponse import OpStatus, SubprocessResponse
 from app.models.VaultListItem import VaultListItem
-from app.services.run_command import op_list_vaults
+from app.services.run_command import op_list_vaults, op_list_vaults_async
 from app.services.exc import RateLimitedError, CommandFailureError
+from app.services.vault_inventory import load_cached_inventory, save_inventory
 
 _WS_DASH_RE = re.compile(r"[ \-]+")
 
@@ -32,29 +34,105 @@ def canonical_vault_key(name: str) -> str:
     s = name.strip().casefold()
     return _WS_DASH_RE.sub("", s)
 
-def get_existing_vault_indexes() -> Tuple[
-    Dict[str, VaultListItem], Set[str],           # exact: by_name_norm, names_norm
-    Dict[str, List[VaultListItem]], Set[str]      # canonical: by_canon, canon_keys
-]:
+class VaultIndex:
     """
-    Build both exact and canonical indexes from `op vault list`.
+    Mutable exact + canonical index over vaults.
+    - by_norm:  normalize_vault_name(name) -> vault
+    - by_canon: canonical_vault_key(name) -> {normalized name -> vault}
+    - by_id:    vault id -> normalized name
+    add/remove/find are O(1) and thread-safe, so a run can keep the index in
+    step with its own mutations instead of relisting.
     """
-    sr = op_list_vaults()
-    if sr.status == OpStatus.SUCCESS:
-        items = [VaultListItem.model_validate(x) for x in sr.formatted_output]
-
-        by_name_norm: Dict[str, VaultListItem] = {}
-        by_canon: Dict[str, List[VaultListItem]] = {}
 
+    def __init__(self, items: Iterable[VaultListItem] = ()):
+        self._lock = threading.Lock()
+        self.by_norm: Dict[str, VaultListItem] = {}
+        self.by_canon: Dict[str, Dict[str, VaultListItem]] = {}
+        self.by_id: Dict[str, str] = {}
         for v in items:
-            # exact
-            by_name_norm[normalize_vault_name(v.name)] = v
-            # canonical (may map to multiple)
+            self._add(v)
+
+    def __len__(self) -> int:
+        return len(self.by_norm)
+
+    def _add(self, v: VaultListItem) -> None:
+        nk = normalize_vault_name(v.name)
+        self.by_norm[nk] = v
+        self.by_canon.setdefault(canonical_vault_key(v.name), {})[nk] = v
+        if v.id:
+            self.by_id[v.id] = nk
+
+    def add(self, v: VaultListItem) -> None:
+        """Insert (or replace) a vault. An empty id marks a name reserved by an in-flight create."""
+        with self._lock:
+            self._add(v)
+
+    def remove(self, identifier: str) -> Optional[VaultListItem]:
+        """Remove a vault by id or name; returns the removed vault, if any."""
+        with self._lock:
+            nk = self.by_id.pop(identifier, None) or normalize_vault_name(identifier)
+            v = self.by_norm.pop(nk, None)
+            if v is None:
+                return None
+            if v.id:
+                self.by_id.pop(v.id, None)
             ck = canonical_vault_key(v.name)
-            by_canon.setdefault(ck, []).append(v)
+            bucket = self.by_canon.get(ck)
+            if bucket is not None:
+                bucket.pop(nk, None)
+                if not bucket:
+                    del self.by_canon[ck]
+            return v
+
+    def find_exact(self, name: str) -> Optional[VaultListItem]:
+        return self.by_norm.get(normalize_vault_name(name))
 
-        return by_name_norm, set(by_name_norm.keys()), by_canon, set(by_canon.keys())
+    def find_canonical(self, name: str) -> Optional[VaultListItem]:
+        """One exemplar vault whose canonical key matches `name`, if any."""
+        bucket = self.by_canon.get(canonical_vault_key(name))
+        if not bucket:
+            return None
+        return next(iter(bucket.values()), None)
+
+def _list_items(sr: SubprocessResponse) -> List[VaultListItem]:
+    """
+    Validate an `op vault list` response into items, raising on failure.
+    """
+    if sr.status == OpStatus.SUCCESS:
+        if sr.parsed is not None:
+            return sr.parsed
+        return [VaultListItem.model_validate(x) for x in sr.formatted_output]
 
     if sr.status == OpStatus.RATE_LIMITED:
-        raise RateLimitedError("`op vault list` rate-limited.", retry_after_minutes=10)
-    raise CommandFailureError(return_code=sr.return_code, stderr=sr.error)
+        raise RateLimitedError("`op vault list` rate-limited.")
+    raise CommandFailureError(command="vault list", return_code=sr.return_code, stderr=sr.error)
+
+def get_existing_vault_indexes(
+    refresh: bool = False, owner: Optional[str] = None, max_age: Optional[float] = None
+) -> VaultIndex:
+    """
+    Build the exact and canonical vault index from the vault inventory.
+    Served from the local inventory cache of `owner` (the `op` account/user)
+    while it is within max_age (default: settings.inventoryCacheTtlSec);
+    otherwise (or with refresh=True) calls `op vault list` and re-seeds the
+    cache. Without an owner the cache is not used.
+    """
+    items = None if refresh or owner is None else load_cached_inventory(owner, max_age)
+    if items is None:
+        items = _list_items(op_list_vaults())
+        if owner is not None:
+            save_inventory(items, owner)
+    return VaultIndex(items)
+
+async def get_existing_vault_indexes_async(
+    refresh: bool = False, owner: Optional[str] = None, max_age: Optional[float] = None
+) -> VaultIndex:
+    """
+    Async variant of `get_existing_vault_indexes`.
+    """
+    items = None if refresh or owner is None else load_cached_inventory(owner, max_age)
+    if items is None:
+        items = _list_items(await op_list_vaults_async())
+        if owner is not None:
+            save_inventory(items, owner)
+    return VaultIndex(items)
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+import hashlib
+import io
+import os
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import Iterable, List, Optional, Tuple
 
+from app.config.settings import settings
 from app.models.InputFileParseResult import InputFileParseResult
 from app.models.InputScanResult import InputScanResult
+from app.services import scan_cache
 
 INPUT_DIR_NAME = "input"
 PREFIX_FILE_SUFFIX = "-vault-prefixes.txt"
@@ -18,19 +25,33 @@ FILENAME_SUFFIXES_PATTERN = re.compile(r".*-vault-suffixes\.txt\Z")
 PROJECT_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9:\s._-]{0,62}\Z")
 ROLE_PATTERN = re.compile(r"^[A-Za-z][A-Za-z:\s_-]{0,62}\Z")
 
-# Reasonable guardrails
-MAX_FILE_SIZE_BYTES = 512 * 1024  # 512 KB
-MAX_PROJECTS_PER_FILE = 50
-MAX_ROLES_PER_FILE = 100
+# Guardrails are configurable (see settings.maxInputFileBytes / maxProjectsPerFile /
+# maxRolesPerFile); 0 disables a limit.
+# Changing the patterns or the parsing below changes parse results: bump
+# scan_cache.PARSER_VERSION so cached results are not reused.
 
 
-def _safe_read_lines(path: Path) -> Iterable[str]:
-    size = path.stat().st_size
-    if size > MAX_FILE_SIZE_BYTES:
-        raise ValueError(f"File too large ({size} bytes): {path}")
-    with path.open("r", encoding="utf-8") as fh:
-        for raw in fh:
-            yield raw
+class _DigestingReader(io.RawIOBase):
+    """Raw stream over an open binary file that hashes every byte read through it."""
+
+    def __init__(self, fh):
+        self._fh = fh
+        self._sha256 = hashlib.sha256()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        n = self._fh.readinto(b)
+        if n:
+            self._sha256.update(memoryview(b)[:n])
+        return n
+
+    def hexdigest(self) -> str:
+        """Hash of the whole file: reads (and hashes) whatever the parser left unread."""
+        for chunk in iter(lambda: self._fh.read(1 << 16), b""):
+            self._sha256.update(chunk)
+        return self._sha256.hexdigest()
 
 
 def _extract_batch_name_from_prefix_file(path: Path) -> str:
@@ -96,7 +117,7 @@ def _parse_lines(
     lines: Iterable[str], validate_fn, max_items: int, item_label_for_messages: str
 ) -> Tuple[list[str], list[str], list[str]]:
     """
-    Shared line parsing core.
+    Shared line parsing core. Consumes `lines` lazily; max_items=0 means no cap.
     Returns: (items, warnings, errors)
     """
     warnings: List[str] = []
@@ -128,7 +149,7 @@ def _parse_lines(
         seen.add(text)
 
         # ensure we haven't exceeded our limit
-        if len(items) > max_items:
+        if max_items and len(items) > max_items:
             errors.append(
                 f"Too many {item_label_for_messages}s (> {max_items}); aborting parse."
             )
@@ -143,28 +164,44 @@ def _parse_lines(
     return items, warnings, errors
 
 
-def parse_prefix_file(path: Path) -> InputFileParseResult:
+def _read_and_parse(
+    path: Path, validate_fn, max_items: int, item_label_for_messages: str
+) -> Tuple[list[str], list[str], list[str], Optional[dict]]:
+    """
+    Size-check `path`, then stream its lines (never the whole file) into
+    _parse_lines, fingerprinting the very bytes that were parsed: size and
+    mtime from the open file, sha256 over everything read through it.
+    Returns: (items, warnings, errors, fingerprint); fingerprint is None when
+    the file was not read (too large, or unreadable).
+    """
     try:
-        lines = list(_safe_read_lines(path))
-    except Exception as e:
-        return InputFileParseResult(
-            kind="prefixes",
-            batch_name=_extract_batch_name_from_prefix_file(path),
-            path=path,
-            projects=[],
-            roles=[],
-            warnings=[],
-            errors=[f"Failed to read: {e}"],
-        )
-
-    projects, warnings, errors = _parse_lines(
-        lines=lines,
+        with path.open("rb") as fh:
+            st = os.fstat(fh.fileno())
+            max_size = settings.maxInputFileBytes
+            if max_size and st.st_size > max_size:
+                raise ValueError(f"File too large ({st.st_size} bytes > {max_size}): {path}")
+            reader = _DigestingReader(fh)
+            lines = io.TextIOWrapper(io.BufferedReader(reader), encoding="utf-8")
+            try:
+                items, warnings, errors = _parse_lines(
+                    lines, validate_fn, max_items, item_label_for_messages
+                )
+            except ValueError as e:  # UnicodeDecodeError mid-stream
+                items, warnings, errors = [], [], [f"Failed to read: {e}"]
+            fingerprint = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": reader.hexdigest()}
+    except (OSError, ValueError) as e:
+        return [], [], [f"Failed to read: {e}"], None
+    return items, warnings, errors, fingerprint
+
+
+def _parse_prefix_file(path: Path) -> Tuple[InputFileParseResult, Optional[dict]]:
+    projects, warnings, errors, fingerprint = _read_and_parse(
+        path,
         validate_fn=_validate_project,
-        max_items=MAX_PROJECTS_PER_FILE,
+        max_items=settings.maxProjectsPerFile,
         item_label_for_messages="prefix",
     )
-
-    return InputFileParseResult(
+    result = InputFileParseResult(
         kind="prefixes",
         batch_name=_extract_batch_name_from_prefix_file(path),
         path=path,
@@ -173,30 +210,17 @@ def parse_prefix_file(path: Path) -> InputFileParseResult:
         warnings=warnings,
         errors=errors,
     )
+    return result, fingerprint
 
 
-def parse_suffix_file(path: Path) -> InputFileParseResult:
-    try:
-        lines = list(_safe_read_lines(path))
-    except Exception as e:
-        return InputFileParseResult(
-            kind="suffixes",
-            batch_name=_extract_batch_name_from_suffix_file(path),
-            path=path,
-            projects=[],
-            roles=[],
-            warnings=[],
-            errors=[f"Failed to read: {e}"],
-        )
-
-    roles, warnings, errors = _parse_lines(
-        lines=lines,
+def _parse_suffix_file(path: Path) -> Tuple[InputFileParseResult, Optional[dict]]:
+    roles, warnings, errors, fingerprint = _read_and_parse(
+        path,
         validate_fn=_validate_role,
-        max_items=MAX_ROLES_PER_FILE,
+        max_items=settings.maxRolesPerFile,
         item_label_for_messages="suffix",
     )
-
-    return InputFileParseResult(
+    result = InputFileParseResult(
         kind="suffixes",
         batch_name=_extract_batch_name_from_suffix_file(path),
         path=path,
@@ -205,14 +229,63 @@ def parse_suffix_file(path: Path) -> InputFileParseResult:
         warnings=warnings,
         errors=errors,
     )
+    return result, fingerprint
+
+
+def parse_prefix_file(path: Path) -> InputFileParseResult:
+    return _parse_prefix_file(path)[0]
+
+
+def parse_suffix_file(path: Path) -> InputFileParseResult:
+    return _parse_suffix_file(path)[0]
 
 
-def load_all_inputs(base_dir: Optional[Path] = None) -> InputScanResult:
+def _parse_input_file(path: Path) -> Tuple[InputFileParseResult, Optional[dict]]:
+    """The parse of `path` and the fingerprint of the content it was parsed from."""
+    if FILENAME_PREFIXES_PATTERN.match(path.name):
+        return _parse_prefix_file(path)
+    return _parse_suffix_file(path)
+
+
+def _parse_paths(
+    paths: List[Path], workers: int
+) -> Tuple[List[InputFileParseResult], int]:
+    """
+    Parse files in input order, reusing cached results for unchanged files
+    (see scan_cache) and parsing the rest, optionally on a thread/process pool
+    (settings.scanPoolKind). Executor.map keeps results in submission order, so
+    the scan is identical to a sequential one.
+    Returns: (results, cache hits)
+    """
+    results: List[Optional[InputFileParseResult]] = [scan_cache.lookup(p) for p in paths]
+    misses = [i for i, r in enumerate(results) if r is None]
+    todo = [paths[i] for i in misses]
+
+    if workers <= 1 or len(todo) <= 1:
+        parsed = [_parse_input_file(p) for p in todo]
+    else:
+        pool_cls = ProcessPoolExecutor if settings.scanPoolKind == "process" else ThreadPoolExecutor
+        with pool_cls(max_workers=min(workers, len(todo))) as pool:
+            parsed = list(pool.map(_parse_input_file, todo))
+
+    for i, (result, fingerprint) in zip(misses, parsed):
+        results[i] = result
+        scan_cache.store(paths[i], result, fingerprint)
+    scan_cache.save()
+    return results, len(paths) - len(misses)
+
+
+def load_all_inputs(
+    base_dir: Optional[Path] = None, workers: Optional[int] = None
+) -> InputScanResult:
     """
     Main driver of input scanning.
     Attempts to find all matching project/role files in `/input/`.
+    Files are parsed on `workers` threads/processes (default: settings.scanWorkers).
     Returns a scan result
     """
+    workers = settings.scanWorkers if workers is None else workers
+    t_start = time.perf_counter()
     prefix_files: List[InputFileParseResult] = []
     suffix_files: List[InputFileParseResult] = []
     fatal_errors: List[str] = []
@@ -220,6 +293,7 @@ def load_all_inputs(base_dir: Optional[Path] = None) -> InputScanResult:
     # 1. obtain all input files present in the project base directory
     prefix_paths = find_prefix_files(base_dir)
     suffix_paths = find_suffix_files(base_dir)
+    t_discovered = time.perf_counter()
 
     # 2. Return an empty scan result if there were no relevant files found
     if not prefix_paths and not suffix_paths:
@@ -233,13 +307,22 @@ def load_all_inputs(base_dir: Optional[Path] = None) -> InputScanResult:
         )
 
     # 3. Collect matching input files, perform basic validation and collect metadata
-    for p in prefix_paths:
-        prefix_files.append(parse_prefix_file(p))
-    for p in suffix_paths:
-        suffix_files.append(parse_suffix_file(p))
+    parsed, cache_hits = _parse_paths([*prefix_paths, *suffix_paths], workers)
+    prefix_files = parsed[: len(prefix_paths)]
+    suffix_files = parsed[len(prefix_paths) :]
+    t_parsed = time.perf_counter()
 
     return InputScanResult(
-        prefix_files=prefix_files, suffix_files=suffix_files, fatal_errors=fatal_errors
+        prefix_files=prefix_files,
+        suffix_files=suffix_files,
+        fatal_errors=fatal_errors,
+        timings={
+            "discover": t_discovered - t_start,
+            "parse": t_parsed - t_discovered,
+            "total": t_parsed - t_start,
+        },
+        workers=max(1, workers),
+        cache_hits=cache_hits,
     )
 
 
@@ -275,4 +358,16 @@ def summarize_scan(scan: InputScanResult) -> str:
                 lines.append("    Errors:")
                 lines.extend(f"      - {e}" for e in f.errors)
 
-    return "\n".join(lines) if lines else "No input issues detected."
+    if not lines:
+        lines.append("No input issues detected.")
+
+    if scan.timings:
+        t = scan.timings
+        pool = f"{scan.workers} {settings.scanPoolKind} worker(s)" if scan.workers > 1 else "sequential"
+        lines.append(
+            f"TIMINGS: discover={t['discover'] * 1000:.1f}ms, parse={t['parse'] * 1000:.1f}ms"
+            f" ({pool}), total={t['total'] * 1000:.1f}ms,"
+            f" cached={scan.cache_hits}/{len(scan.prefix_files) + len(scan.suffix_files)} file(s)"
+        )
+
+    return "\n".join(lines)
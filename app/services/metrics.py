@@ -0,0 +1,213 @@
+# app/services/metrics.py
+from __future__ import annotations
+
+import contextvars
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.config.settings import settings
+from app.services.rate_governor import governor
+from app.services.tracing import Span, add_listener, remove_listener
+
+PREFIX = "vault_provisioner"
+# upper bounds (seconds) of the `op` latency histogram buckets; +Inf is implicit
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _print(s: str) -> None:
+    print(f"\tMETRICS: {s}")
+
+
+def _labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+
+    def escape(v: str) -> str:
+        return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in labels) + "}"
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        i = bisect_left(LATENCY_BUCKETS, value)
+        if i < len(self.counts):
+            self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RunMetrics:
+    """
+    Metrics of one CLI invocation, rewritten to a node_exporter textfile
+    (Prometheus text format) every `interval` seconds and once more at close().
+    - Vault outcomes are counted explicitly via `count_vault`
+    - `op` latency, rate-limit events and retries come from timing spans
+    The file is replaced atomically, so a scrape never sees a partial write.
+    """
+
+    def __init__(self, path: Path, mode: str, interval: Optional[float] = None):
+        self.path = path
+        self.mode = mode
+        self._interval = settings.metricsIntervalSec if interval is None else interval
+        self._lock = threading.Lock()
+        self._started = time.time()
+        self._t0 = time.perf_counter()
+        self._finished: Optional[float] = None
+        self._vaults: Dict[str, int] = {}
+        self._rate_limited: Dict[str, int] = {}
+        self._retries: Dict[str, int] = {}
+        self._latency: Dict[str, _Histogram] = {}
+        self._closed = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        if self._interval > 0:
+            self._writer = threading.Thread(target=self._write_loop, name="metrics", daemon=True)
+            self._writer.start()
+
+    # -- inputs --------------------------------------------------------------------
+    def count_vault(self, outcome: str, n: int = 1) -> None:
+        with self._lock:
+            self._vaults[outcome] = self._vaults.get(outcome, 0) + n
+
+    def on_span(self, name: str, duration: float, span: Span) -> None:
+        with self._lock:
+            if name == "op.wait":
+                cmd = span.attrs.get("cmd", "")
+                self._latency.setdefault(cmd, _Histogram()).observe(duration)
+            elif name == "op.decode" and span.outcome == "rate-limited":
+                cmd = span.attrs.get("cmd", "")
+                self._rate_limited[cmd] = self._rate_limited.get(cmd, 0) + 1
+            elif name in ("vault.create", "vault.delete"):
+                op = name.split(".", 1)[1]
+                retries = max(0, int(span.attrs.get("attempts", 1)) - 1)
+                self._retries[op] = self._retries.get(op, 0) + retries
+
+    # -- output --------------------------------------------------------------------
+    def render(self) -> str:
+        mode = (("mode", self.mode),)
+        with self._lock:
+            running = self._finished is None
+            duration = (time.perf_counter() if running else self._finished) - self._t0
+            vaults = dict(self._vaults)
+            rate_limited = dict(self._rate_limited)
+            retries = dict(self._retries)
+            latency = {cmd: (list(h.counts), h.sum, h.count) for cmd, h in self._latency.items()}
+
+        lines: List[str] = []
+
+        def family(name: str, type_: str, help_: str) -> None:
+            lines.append(f"# HELP {PREFIX}_{name} {help_}")
+            lines.append(f"# TYPE {PREFIX}_{name} {type_}")
+
+        def sample(name: str, labels: Labels, value: float) -> None:
+            text = str(value) if isinstance(value, int) else repr(float(value))
+            lines.append(f"{PREFIX}_{name}{_labels(labels)} {text}")
+
+        family("vaults_total", "counter", "Planned vaults by outcome (created, skipped, failed, deleted, new, exists, ...).")
+        for outcome, n in sorted(vaults.items()):
+            sample("vaults_total", mode + (("outcome", outcome),), n)
+
+        family("rate_limited_total", "counter", "`op` calls answered with rate-limited.")
+        for cmd, n in sorted(rate_limited.items()):
+            sample("rate_limited_total", mode + (("cmd", cmd),), n)
+
+        family("retries_total", "counter", "Retried vault creates/deletes.")
+        for op, n in sorted(retries.items()):
+            sample("retries_total", mode + (("op", op),), n)
+
+        family("op_latency_seconds", "histogram", "Round-trip time of `op` calls.")
+        for cmd, (counts, total, count) in sorted(latency.items()):
+            labels = mode + (("cmd", cmd),)
+            cumulative = 0
+            for bound, n in zip(LATENCY_BUCKETS, counts):
+                cumulative += n
+                sample("op_latency_seconds_bucket", labels + (("le", f"{bound:g}"),), cumulative)
+            sample("op_latency_seconds_bucket", labels + (("le", "+Inf"),), count)
+            sample("op_latency_seconds_sum", labels, total)
+            sample("op_latency_seconds_count", labels, count)
+
+        family("run_duration_seconds", "gauge", "Seconds since the run started (final value once finished).")
+        sample("run_duration_seconds", mode, duration)
+        family("run_start_timestamp_seconds", "gauge", "Unix time the run started.")
+        sample("run_start_timestamp_seconds", mode, self._started)
+        family("run_in_progress", "gauge", "1 while the run is in progress, 0 once it finished.")
+        sample("run_in_progress", mode, 1 if running else 0)
+        family("pacing_rate", "gauge", "Current rate-governor pacing, in `op` mutations per second.")
+        sample("pacing_rate", mode, governor.rate)
+
+        return "\n".join(lines) + "\n"
+
+    def write(self) -> None:
+        text = self.render()
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # node_exporter only reads *.prom files, so the temp file must not end in .prom
+            tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            with tmp.open("w", encoding="utf-8") as fh:
+                fh.write(text)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            _print(f"Could not write {self.path}: {e}")
+
+    def _write_loop(self) -> None:
+        while not self._closed.wait(self._interval):
+            self.write()
+
+    def close(self) -> None:
+        if self._closed.is_set():
+            return
+        with self._lock:
+            self._finished = time.perf_counter()
+        self._closed.set()
+        if self._writer is not None:
+            self._writer.join()
+        self.write()
+
+
+# The metrics of the invocation in progress; counts outside one are dropped.
+# Context-local like the active tracer (see tracing.submit for worker threads).
+_active: contextvars.ContextVar[Optional[RunMetrics]] = contextvars.ContextVar("metrics", default=None)
+
+
+def count_vault(outcome: str, n: int = 1) -> None:
+    """Count planned vaults by outcome on the active metrics, if any."""
+    m = _active.get()
+    if m is not None:
+        m.count_vault(outcome, n)
+
+
+@contextmanager
+def export_metrics(path: Optional[Path], mode: str) -> Iterator[Optional[RunMetrics]]:
+    """
+    Collect metrics for the enclosed run and keep `path` up to date
+    (default: settings.metricsFile; nothing is collected when neither is set).
+    """
+    if path is None and settings.metricsFile:
+        path = Path(settings.metricsFile)
+    if path is None:
+        yield None
+        return
+    m = RunMetrics(path, mode)
+    token = _active.set(m)
+    add_listener(m.on_span)
+    m.write()
+    try:
+        yield m
+    finally:
+        remove_listener(m.on_span)
+        _active.reset(token)
+        m.close()
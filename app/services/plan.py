@@ -0,0 +1,103 @@
+# app/services/plan.py
+from __future__ import annotations
+
+from typing import Dict, Iterable, Iterator, List, Literal, NamedTuple, Tuple
+
+from app.config.settings import settings
+from app.models.InputScanResult import InputScanResult
+from app.services.list_vaults import canonical_vault_key, normalize_vault_name
+
+
+class PlannedVault(NamedTuple):
+    batch_name: str
+    project: str
+    role: str
+    vault_name: str
+
+
+class BatchPlan(NamedTuple):
+    batch_name: str
+    projects: List[str]
+    roles: List[str]
+
+    @property
+    def size(self) -> int:
+        return len(self.projects) * len(self.roles)
+
+
+def _collect_by_batch(files, attr: str) -> dict[str, list[str]]:
+    """
+    Collapse input files by batch_name -> unique, sorted entries.
+    """
+    buckets: dict[str, set[str]] = {}
+    for f in files:
+        entries = getattr(f, attr)
+        if entries:
+            buckets.setdefault(f.batch_name, set()).update(entries)
+    return {k: sorted(v) for k, v in buckets.items()}
+
+
+def plan_batches(scan: InputScanResult) -> Tuple[List[BatchPlan], List[str], List[str]]:
+    """
+    Pair prefix and suffix files by batch_name.
+    Returns: (ready batches, batches with prefixes only, batches with suffixes only),
+    each sorted by batch_name. Only the per-batch inputs are materialized; the
+    cross-product is produced lazily by `iter_planned_vaults`.
+    """
+    projects_by_batch = _collect_by_batch(scan.prefix_files, "projects")
+    roles_by_batch = _collect_by_batch(scan.suffix_files, "roles")
+
+    prefix_only = sorted(set(projects_by_batch) - set(roles_by_batch))
+    suffix_only = sorted(set(roles_by_batch) - set(projects_by_batch))
+    ready = [
+        BatchPlan(b, projects_by_batch[b], roles_by_batch[b])
+        for b in sorted(set(projects_by_batch) & set(roles_by_batch))
+    ]
+    return ready, prefix_only, suffix_only
+
+
+def iter_batch_vaults(batch: BatchPlan) -> Iterator[PlannedVault]:
+    """Yield a batch's project × role vault names, in plan order."""
+    joiner = settings.vaultNameJoiner
+    for project in batch.projects:
+        for role in batch.roles:
+            yield PlannedVault(batch.batch_name, project, role, f"{project}{joiner}{role}")
+
+
+def iter_planned_vaults(batches: Iterable[BatchPlan]) -> Iterator[PlannedVault]:
+    """Yield every planned vault across batches without materializing the plan."""
+    for batch in batches:
+        yield from iter_batch_vaults(batch)
+
+
+class PlanClash(NamedTuple):
+    """A planned vault dropped because an earlier planned vault already claims its name."""
+
+    kind: Literal["duplicate", "collision"]
+    first: PlannedVault
+
+    def describe(self) -> str:
+        what = "duplicate of" if self.kind == "duplicate" else "collides (ignoring case, spaces, and dashes) with"
+        return f"{what} planned '{self.first.vault_name}' (batch={self.first.batch_name})"
+
+
+def find_plan_clashes(batches: Iterable[BatchPlan]) -> Dict[int, PlanClash]:
+    """
+    One pass over the whole plan, across batches. Returns plan position -> clash
+    for every planned vault whose name repeats an earlier planned name exactly
+    ("duplicate") or under canonical_vault_key ("collision"). The first
+    occurrence is kept; callers drop the rest before calling `op`.
+    """
+    by_norm: Dict[str, PlannedVault] = {}
+    by_canon: Dict[str, PlannedVault] = {}
+    clashes: Dict[int, PlanClash] = {}
+    for seq, planned in enumerate(iter_planned_vaults(batches)):
+        nk = normalize_vault_name(planned.vault_name)
+        ck = canonical_vault_key(planned.vault_name)
+        if nk in by_norm:
+            clashes[seq] = PlanClash("duplicate", by_norm[nk])
+        elif ck in by_canon:
+            clashes[seq] = PlanClash("collision", by_canon[ck])
+        else:
+            by_norm[nk] = by_canon[ck] = planned
+    return clashes
@@ -1,33 +1,44 @@
 from __future__ import annotations
 
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 from app.config.settings import settings
-from app.services.list_vaults import canonical_vault_key, get_existing_vault_indexes, normalize_vault_name
+from app.models.CompiledPlan import CompiledPlan, PlanItem
+from app.services.compiled_plan import input_fingerprints, write_plan
+from app.services.list_vaults import VaultIndex
 from app.services.load_project_inputs import load_all_inputs
-
-VAULT_NAME_JOINER = getattr(settings, "vaultNameJoiner", " - ")
-
-
-def _collect_projects_by_batch(scan) -> dict[str, list[str]]:
-    buckets: dict[str, set[str]] = {}
-    for f in scan.prefix_files:
-        if f.projects:
-            buckets.setdefault(f.batch_name, set()).update(f.projects)
-    return {k: sorted(v) for k, v in buckets.items()}
-
-
-def _collect_roles_by_batch(scan) -> dict[str, list[str]]:
-    buckets: dict[str, set[str]] = {}
-    for f in scan.suffix_files:
-        if f.roles:
-            buckets.setdefault(f.batch_name, set()).update(f.roles)
-    return {k: sorted(v) for k, v in buckets.items()}
-
-
-def preview_from_inputs(base_dir: Optional[Path] = None) -> None:
-    scan = load_all_inputs(base_dir=base_dir)
+from app.services.metrics import count_vault
+from app.services.plan import find_plan_clashes, iter_batch_vaults, plan_batches
+from app.services.session import Session
+from app.services.vault_inventory import snapshot_age_seconds
+
+
+def _inventory_age() -> float:
+    """Age of the listing the preview just used: the cached snapshot's, or 0 if listed now."""
+    if settings.inventoryCacheTtlSec <= 0:
+        return 0.0
+    age = snapshot_age_seconds()
+    return 0.0 if age is None else max(0.0, age)
+
+
+def preview_from_inputs(
+    base_dir: Optional[Path] = None,
+    refresh_inventory: bool = False,
+    scan_workers: Optional[int] = None,
+    plan_out: Optional[Path] = None,
+    session: Optional[Session] = None,
+) -> None:
+    """
+    Print what --from-inputs would do, without changing anything.
+    With plan_out, also write those decisions as a plan file for --apply-plan.
+    The vault index comes from session (a fresh one if None), so a caller
+    that goes on to run the batch in the same process lists vaults once.
+    """
+    if session is None:
+        session = Session()
+    scan = load_all_inputs(base_dir=base_dir, workers=scan_workers)
     if scan.fatal_errors:
         print("FATAL:")
         for e in scan.fatal_errors:
@@ -42,12 +53,7 @@ def preview_from_inputs(base_dir: Optional[Path] = None) -> None:
             for e in f.errors:
                 print(f"[ERR ][{f.batch_name}] {e}")
 
-    projects_by_batch = _collect_projects_by_batch(scan)
-    roles_by_batch = _collect_roles_by_batch(scan)
-
-    batches_with_prefix_only = sorted(set(projects_by_batch) - set(roles_by_batch))
-    batches_with_suffix_only = sorted(set(roles_by_batch) - set(projects_by_batch))
-    batches_ready = sorted(set(projects_by_batch) & set(roles_by_batch))
+    batches_ready, batches_with_prefix_only, batches_with_suffix_only = plan_batches(scan)
 
     for b in batches_with_prefix_only:
         print(f"[WARN][{b}] Skipping: prefixes present but no matching *-vault-suffixes.txt")
@@ -59,68 +65,98 @@ def preview_from_inputs(base_dir: Optional[Path] = None) -> None:
         return
 
     # indexes
-    by_norm = {}
-    norm_keys = set()
-    by_canon = {}
-    canon_keys = set()
     try:
-        by_norm, norm_keys, by_canon, canon_keys = get_existing_vault_indexes()
-        print(f"\n[INFO] Loaded {len(norm_keys)} existing vault(s) for exact & canonical checks.")
+        index = session.vault_index(refresh=refresh_inventory)
+        print(f"\n[INFO] Loaded {len(index)} existing vault(s) for exact & canonical checks.")
     except Exception as e:
-        print(f"\n[WARN] Could not list existing vaults; duplicate checks disabled: {e}")
+        index = VaultIndex()
+        print(f"\n[WARN] Could not list existing vaults; only checking against this preview: {e}")
+        if plan_out is not None:
+            print("[WARN] Not writing a plan: statuses are unreliable without the vault list.")
+            plan_out = None
+    inventory_age = _inventory_age()
+    items: List[PlanItem] = []
+
+    clashes = find_plan_clashes(batches_ready)
 
     print("\n=== PREVIEW: planned vault names ===")
     total_batches = total_vaults = total_exists = total_conflicts = total_new = 0
+    total_dropped = 0
+    seq = 0
 
     for batch in batches_ready:
-        projects = projects_by_batch.get(batch, [])
-        roles = roles_by_batch.get(batch, [])
-        n = len(projects) * len(roles)
+        n = batch.size
         total_batches += 1
         total_vaults += n
 
-        batch_exists = batch_conflicts = batch_new = 0
-        print(f"\n[{batch}] {len(projects)} prefixes × {len(roles)} suffixes = {n} vault(s)")
-
-        for p in projects:
-            for r in roles:
-                name = f"{p}{VAULT_NAME_JOINER}{r}"
-                status = "[NEW]"
-                suffix = ""
-
-                if norm_keys:
-                    nk = normalize_vault_name(name)
-                    if nk in norm_keys:
-                        status = "[EXISTS]"
-                        v = by_norm.get(nk)
-                        if v and getattr(v, "id", None):
-                            suffix = f" (id={v.id})"
-                        batch_exists += 1
-                    else:
-                        ck = canonical_vault_key(name)
-                        if ck in canon_keys:
-                            status = "[CONFLICT]"
-                            # show one conflicting exemplar
-                            arr = by_canon.get(ck) or []
-                            if arr:
-                                v = arr[0]
-                                suffix = f" (conflicts with existing '{v.name}'" + (f", id={v.id}" if getattr(v, 'id', None) else "") + ")"
-                            batch_conflicts += 1
-                        else:
-                            batch_new += 1
-                else:
-                    batch_new += 1
-
-                print(f"  - {status} {name}{suffix}")
+        batch_exists = batch_conflicts = batch_new = batch_dropped = 0
+        print(f"\n[{batch.batch_name}] {len(batch.projects)} prefixes × {len(batch.roles)} suffixes = {n} vault(s)")
+
+        for planned in iter_batch_vaults(batch):
+            name = planned.vault_name
+            clash = clashes.get(seq)
+            seq += 1
+
+            if clash is not None:
+                status = clash.kind
+                detail = clash.describe()
+                batch_dropped += 1
+            elif (v := index.find_exact(name)) is not None:
+                status = "exists"
+                detail = f"id={v.id}" if v.id else None
+                batch_exists += 1
+            elif (v := index.find_canonical(name)) is not None:
+                # show one conflicting exemplar
+                status = "conflict"
+                detail = f"conflicts with existing '{v.name}'" + (f", id={v.id}" if v.id else "")
+                batch_conflicts += 1
+            else:
+                status = "new"
+                detail = None
+                batch_new += 1
+
+            suffix = f" ({detail})" if detail else ""
+            print(f"  - [{status.upper()}] {name}{suffix}")
+            count_vault(status)
+            if plan_out is not None:
+                items.append(PlanItem(
+                    batch_name=planned.batch_name,
+                    project=planned.project,
+                    role=planned.role,
+                    vault_name=name,
+                    status=status,
+                    detail=detail,
+                ))
 
         total_exists += batch_exists
         total_conflicts += batch_conflicts
         total_new += batch_new
-        print(f"  -> Batch summary: NEW={batch_new}, EXISTS={batch_exists}, CONFLICTS={batch_conflicts}, TOTAL={batch_new + batch_exists + batch_conflicts}")
+        total_dropped += batch_dropped
+        print(f"  -> Batch summary: NEW={batch_new}, EXISTS={batch_exists}, CONFLICTS={batch_conflicts}, DROPPED={batch_dropped}, TOTAL={batch_new + batch_exists + batch_conflicts + batch_dropped}")
 
     print("\n=== SUMMARY ===")
     print(f"Batches ready: {total_batches}")
     print(f"Total planned vaults: {total_vaults}")
     print(f"Total NEW: {total_new}")
     print(f"Total EXISTS (exact name): {total_exists}")
-    print(f"Total CONFLICTS (canonical): {total_conflicts}")
\ No newline at end of file
+    print(f"Total CONFLICTS (canonical): {total_conflicts}")
+    print(f"Total DROPPED (duplicate/colliding within the plan): {total_dropped}")
+    if plan_out is not None:
+        warnings: List[str] = []
+        errors: List[str] = []
+        for files in (scan.prefix_files, scan.suffix_files):
+            for f in files:
+                warnings.extend(f"[{f.batch_name}] {w}" for w in f.warnings)
+                errors.extend(f"[{f.batch_name}] {e}" for e in f.errors)
+        plan = CompiledPlan(
+            created_at=datetime.now(timezone.utc),
+            inputs=input_fingerprints(
+                f.path for f in (*scan.prefix_files, *scan.suffix_files)
+            ),
+            inventory_age_sec=inventory_age,
+            warnings=warnings,
+            errors=errors,
+            items=items,
+        )
+        write_plan(plan_out, plan)
+        print(f"\nPlan written to: {plan_out} (apply with --apply-plan {plan_out})")
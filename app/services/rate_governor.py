@@ -0,0 +1,139 @@
+# app/services/rate_governor.py
+from __future__ import annotations
+
+import threading
+import time
+from typing import Optional
+
+from app.config.settings import settings
+
+# `op` failures worth another attempt (matched case-insensitively in stderr). A
+# create is only repeated when the request cannot have reached 1Password, since
+# repeating one that did would add a second vault of the same name; a delete is
+# safe to repeat after any of them.
+UNSENT_ERRORS = ("connection refused", "no such host", "tls handshake timeout", "(503)")
+TRANSIENT_ERRORS = UNSENT_ERRORS + (
+    "timeout",
+    "timed out",
+    "deadline exceeded",
+    "connection reset",
+    "unexpected eof",
+    "(500)",
+    "(502)",
+    "(504)",
+)
+
+
+def is_transient(stderr: Optional[str], repeatable: bool) -> bool:
+    """Whether a failed `op` call may succeed if tried again; `repeatable` for idempotent commands."""
+    err = (stderr or "").lower()
+    return any(p in err for p in (TRANSIENT_ERRORS if repeatable else UNSENT_ERRORS))
+
+
+class RateGovernor:
+    """
+    Token bucket shared by every `op` mutation (create/delete).
+    - The refill rate (ops/sec) grows additively after each success
+    - ...and shrinks multiplicatively when `op` reports rate-limited
+    Thread-safe; callers reserve a slot and sleep outside the lock.
+    """
+
+    def __init__(
+        self,
+        initial_rate: float,
+        min_rate: float,
+        max_rate: float,
+        increase: float,
+        decrease: float,
+        burst: int = 1,
+    ):
+        self._lock = threading.Lock()
+        self._min_rate = min_rate
+        self._max_rate = max_rate
+        self._increase = increase
+        self._decrease = decrease
+        self._burst = max(1, burst)
+        self._rate = min(max(initial_rate, min_rate), max_rate)
+        self._tokens = float(self._burst)
+        self._last_refill = time.monotonic()
+        self._last_decrease = float("-inf")
+        self.total_wait = 0.0  # seconds of pacing handed out by reserve(), for reporting
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last_refill
+        self._tokens = min(float(self._burst), self._tokens + elapsed * self._rate)
+        self._last_refill = now
+
+    def reserve(self) -> float:
+        """
+        Take one token. Returns how many seconds the caller must wait before
+        issuing its call (0.0 when a token was immediately available).
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1.0
+            if self._tokens >= 0:
+                return 0.0
+            wait = -self._tokens / self._rate
+            self.total_wait += wait
+            return wait
+
+    def on_success(self) -> None:
+        with self._lock:
+            self._rate = min(self._max_rate, self._rate + self._increase)
+
+    def on_rate_limited(self) -> None:
+        """
+        Back off multiplicatively and drain the bucket. Concurrent workers tend
+        to hit the limit together, so only one decrease is applied per refill
+        interval.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now - self._last_decrease >= 1.0 / self._rate:
+                self._rate = max(self._min_rate, self._rate * self._decrease)
+                self._last_decrease = now
+            self._tokens = min(self._tokens, 0.0)
+
+
+class RetryBudget:
+    """
+    Whether one create/delete retries after a failed attempt.
+    - Rate-limited responses are not charged to maxRetries: the governor
+      already spaces them out, so they are retried until rateLimitMaxWaitSec
+      has passed since the first one (a quota can take minutes to clear)
+    - Transient failures (see is_transient) are retried until maxRetries
+      attempts have failed that way
+    Other failures are never retried, and nothing is when shouldRetry is off.
+    """
+
+    def __init__(self):
+        self._attempts = 0
+        self._limited_since: Optional[float] = None
+
+    def retry(self, rate_limited: bool) -> bool:
+        if not settings.shouldRetry:
+            return False
+        if rate_limited:
+            now = time.monotonic()
+            if self._limited_since is None:
+                self._limited_since = now
+            return now - self._limited_since < settings.rateLimitMaxWaitSec
+        self._attempts += 1
+        return self._attempts < settings.maxRetries
+
+
+governor = RateGovernor(
+    initial_rate=settings.pacingInitialRate,
+    min_rate=settings.pacingMinRate,
+    max_rate=settings.pacingMaxRate,
+    increase=settings.pacingIncrease,
+    decrease=settings.pacingDecrease,
+    burst=settings.pacingBurst,
+)
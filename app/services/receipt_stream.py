@@ -0,0 +1,139 @@
+# app/services/receipt_stream.py
+from __future__ import annotations
+
+import json
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple
+
+from pydantic import BaseModel
+
+from app.models.CleanupReceipt import CleanupReceipt
+from app.models.DeleteRunReceipt import DeleteRunReceipt
+from app.models.ReceiptStream import (
+    ReceiptKind,
+    ReceiptStreamFooter,
+    ReceiptStreamHeader,
+)
+from app.models.RunReceipt import RunReceipt
+from app.services.journal_writer import JournalWriter
+
+# Item record `type` -> receipt list it belongs to
+ITEM_LISTS = {"planned": "planned", "success": "successes", "failure": "failures"}
+
+
+class ReceiptStreamWriter:
+    """
+    Streams a receipt as NDJSON instead of holding it in memory:
+      {"type": "header", ...}                    once, at start
+      {"type": "success"|"failure"|"planned", "seq": n, ...record}   per item
+      {"type": "footer", ...}                    once, at the end
+    `seq` is the item's plan position, so readers can restore plan order even
+    when items complete out of order. Safe to call from worker threads.
+    Opening a writer truncates `path`: each invocation (including --resume,
+    which re-emits the outcomes it carries over) writes a complete stream.
+    """
+
+    def __init__(self, path: Path, kind: ReceiptKind, started_at: datetime, **fields: Any):
+        self.path = path
+        self._journal = JournalWriter(path, truncate=True)
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {}
+        header = ReceiptStreamHeader(kind=kind, started_at=started_at, fields=fields)
+        self._journal.write(header.model_dump(mode="json"))
+
+    def item(self, type_: str, seq: int, record: BaseModel) -> None:
+        with self._lock:
+            self.counts[type_] = self.counts.get(type_, 0) + 1
+        self._journal.write({"type": type_, "seq": seq, **record.model_dump(mode="json")})
+
+    def close(self, finished_at: datetime, **fields: Any) -> None:
+        footer = ReceiptStreamFooter(
+            finished_at=finished_at, counts=dict(self.counts), fields=fields
+        )
+        self._journal.write(footer.model_dump(mode="json"))
+        self._journal.close()
+
+    def abandon(self) -> None:
+        """Persist what was streamed so far without a footer (interrupted run)."""
+        self._journal.close()
+
+
+def iter_receipt_records(path: Path) -> Iterator[dict]:
+    """Lazily yield every decodable line of a streamed receipt."""
+    with path.open("r", encoding="utf-8") as fh:
+        for raw in fh:
+            s = raw.strip()
+            if not s:
+                continue
+            try:
+                yield json.loads(s)
+            except json.JSONDecodeError:
+                continue  # torn trailing line from an interrupted run
+
+
+def _collect(path: Path) -> Tuple[ReceiptStreamHeader, ReceiptStreamFooter, Dict[str, list]]:
+    header = None
+    footer = None
+    items: Dict[str, Dict[int, dict]] = {name: {} for name in ITEM_LISTS.values()}
+    for rec in iter_receipt_records(path):
+        type_ = rec.pop("type", None)
+        if type_ == "header":
+            # streams written before writers truncated may hold several
+            # invocations; only the latest one describes the receipt
+            header = ReceiptStreamHeader.model_validate({"type": type_, **rec})
+            footer = None
+            items = {name: {} for name in ITEM_LISTS.values()}
+        elif type_ == "footer":
+            footer = ReceiptStreamFooter.model_validate({"type": type_, **rec})
+        elif type_ in ITEM_LISTS:
+            # the same seq twice in one invocation: the latest line wins
+            items[ITEM_LISTS[type_]][rec.pop("seq")] = rec
+    if header is None:
+        raise ValueError(f"Not a streamed receipt (no header): {path}")
+    if footer is None:
+        # interrupted run: no footer, so fall back to the last write time
+        mtime = datetime.fromtimestamp(path.stat().st_mtime, tz=timezone.utc)
+        footer = ReceiptStreamFooter(finished_at=mtime)
+    ordered = {name: [by_seq[k] for k in sorted(by_seq)] for name, by_seq in items.items()}
+    return header, footer, ordered
+
+
+def _receipt_data(path: Path, kind: ReceiptKind) -> dict:
+    header, footer, items = _collect(path)
+    if header.kind != kind:
+        raise ValueError(f"Expected a {kind} receipt, found {header.kind}: {path}")
+    return {
+        **header.fields,
+        **footer.fields,
+        "started_at": header.started_at,
+        "finished_at": footer.finished_at,
+        **items,
+    }
+
+
+def read_run_receipt(path: Path) -> RunReceipt:
+    """Load a batch receipt, streamed (.ndjson) or classic (.json)."""
+    if path.suffix == ".ndjson":
+        data = _receipt_data(path, "batch_from_inputs")
+        data.pop("planned", None)
+        return RunReceipt.model_validate(data)
+    with path.open("r", encoding="utf-8") as fh:
+        return RunReceipt.model_validate(json.load(fh))
+
+
+def read_delete_receipt(path: Path) -> DeleteRunReceipt:
+    """Load a delete receipt, streamed (.ndjson) or classic (.json)."""
+    if path.suffix == ".ndjson":
+        return DeleteRunReceipt.model_validate(_receipt_data(path, "delete_last_run"))
+    with path.open("r", encoding="utf-8") as fh:
+        return DeleteRunReceipt.model_validate(json.load(fh))
+
+
+def read_cleanup_receipt(path: Path) -> CleanupReceipt:
+    """Load a bulk cleanup receipt, streamed (.ndjson) or classic (.json)."""
+    if path.suffix == ".ndjson":
+        return CleanupReceipt.model_validate(_receipt_data(path, "cleanup_runs"))
+    with path.open("r", encoding="utf-8") as fh:
+        return CleanupReceipt.model_validate(json.load(fh))
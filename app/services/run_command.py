@@ -1,35 +1,88 @@
+import asyncio
+import shlex
 import subprocess
-from typing import Tuple
+from typing import List, Optional
 
+from pydantic import TypeAdapter, ValidationError
+
+from app.config.settings import settings
+from app.models.CreateVaultResponse import CreateVaultResponse
+from app.models.ServiceAccountWhoamiResponse import ServiceAccountWhoamiResponse
 from app.models.SubprocessResponse import SubprocessResponse
+from app.models.VaultListItem import VaultListItem
+from app.services.tracing import span
+
+# What a successful JSON command's stdout is validated into, straight from the
+# bytes: one pass instead of decode + json.loads + model_validate per object
+CREATE_VAULT_OUTPUT = TypeAdapter(CreateVaultResponse)
+LIST_VAULTS_OUTPUT = TypeAdapter(List[VaultListItem])
+WHOAMI_OUTPUT = TypeAdapter(ServiceAccountWhoamiResponse)
+
+
+def _argv(args: list[str]) -> List[str]:
+    """Swap the leading "op" for the configured binary (settings.opBinary)."""
+    return [*shlex.split(settings.opBinary), *args[1:]]
+
+
+def _subcommand(args: list[str]) -> str:
+    # "op vault create X" -> "vault create"; "op whoami" -> "whoami"
+    return " ".join(args[1:3]) if args[1:2] == ["vault"] else " ".join(args[1:2])
 
 
-def _get_response(r: subprocess.CompletedProcess) -> Tuple[str, str, int]:
-    out: str = r.stdout.decode("utf-8")
-    err: str = r.stderr.decode("utf-8")
-    code: int = r.returncode
-    return (out, err, code)
+def _decode(
+    args: list[str], stdout: bytes, stderr: bytes, code: int, output_type: Optional[TypeAdapter] = None
+) -> SubprocessResponse:
+    """
+    With output_type, a successful response is validated from the stdout bytes
+    into `parsed` without decoding them. Output that does not fit falls back to
+    the generic path (decoded `output` + `formatted_output`), so callers still
+    report it the usual way.
+    """
+    with span("op.decode", cmd=_subcommand(args)) as s:
+        err = stderr.decode("utf-8")
+        parsed = None
+        if output_type is not None and code == 0 and "rate-limited" not in err:
+            try:
+                parsed = output_type.validate_json(stdout)
+            except ValidationError:
+                parsed = None
+        sr = SubprocessResponse(
+            command=" ".join(args),
+            output="" if parsed is not None else stdout.decode("utf-8"),
+            error=err,
+            return_code=code,
+            parsed=parsed,
+        )
+        s.outcome = sr.status.value
+    return sr
 
 
-def _op(args: list[str]) -> SubprocessResponse:
-    r = subprocess.run(args, capture_output=True)
-    (out, err, code) = _get_response(r)
-    return SubprocessResponse(
-        command=" ".join(args), output=out, error=err, return_code=code
-    )
+def _op(args: list[str], output_type: Optional[TypeAdapter] = None) -> SubprocessResponse:
+    cmd = _subcommand(args)
+    with span("op.spawn", cmd=cmd):
+        proc = subprocess.Popen(_argv(args), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    with span("op.wait", cmd=cmd) as s:
+        try:
+            stdout, stderr = proc.communicate()
+        except BaseException:  # e.g. Ctrl-C: don't leave `op` running, like subprocess.run
+            proc.kill()
+            proc.wait()
+            raise
+        s.outcome = "exit-0" if proc.returncode == 0 else f"exit-{proc.returncode}"
+    return _decode(args, stdout, stderr, proc.returncode, output_type)
 
 
-def _op_json(args: list[str]) -> SubprocessResponse:
+def _op_json(args: list[str], output_type: Optional[TypeAdapter] = None) -> SubprocessResponse:
     args.append("--format=json")
-    return _op(args=args)
+    return _op(args=args, output_type=output_type)
 
 
 def op_create_vault(vault: str) -> SubprocessResponse:
-    return _op_json(["op", "vault", "create", vault])
+    return _op_json(["op", "vault", "create", vault], CREATE_VAULT_OUTPUT)
 
 
 def op_whoami() -> SubprocessResponse:
-    return _op_json(["op", "whoami"])
+    return _op_json(["op", "whoami"], WHOAMI_OUTPUT)
 
 
 def op_delete_vault(identifier: str) -> SubprocessResponse:
@@ -37,4 +90,42 @@ def op_delete_vault(identifier: str) -> SubprocessResponse:
 
 
 def op_list_vaults() -> SubprocessResponse:
-    return _op_json(["op", "vault", "list"])
+    return _op_json(["op", "vault", "list"], LIST_VAULTS_OUTPUT)
+
+
+# Async variants ---------------------------------------------------------------
+# Same commands and responses as above, but awaitable: the subprocess is driven
+# by the running event loop instead of blocking a thread per call.
+
+
+async def _op_async(args: list[str], output_type: Optional[TypeAdapter] = None) -> SubprocessResponse:
+    cmd = _subcommand(args)
+    with span("op.spawn", cmd=cmd):
+        proc = await asyncio.create_subprocess_exec(
+            *_argv(args), stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+    with span("op.wait", cmd=cmd) as s:
+        stdout, stderr = await proc.communicate()
+        s.outcome = "exit-0" if proc.returncode == 0 else f"exit-{proc.returncode}"
+    return _decode(args, stdout, stderr, proc.returncode, output_type)
+
+
+async def _op_json_async(args: list[str], output_type: Optional[TypeAdapter] = None) -> SubprocessResponse:
+    args.append("--format=json")
+    return await _op_async(args=args, output_type=output_type)
+
+
+async def op_create_vault_async(vault: str) -> SubprocessResponse:
+    return await _op_json_async(["op", "vault", "create", vault], CREATE_VAULT_OUTPUT)
+
+
+async def op_whoami_async() -> SubprocessResponse:
+    return await _op_json_async(["op", "whoami"], WHOAMI_OUTPUT)
+
+
+async def op_delete_vault_async(identifier: str) -> SubprocessResponse:
+    return await _op_async(["op", "vault", "delete", identifier])
+
+
+async def op_list_vaults_async() -> SubprocessResponse:
+    return await _op_json_async(["op", "vault", "list"], LIST_VAULTS_OUTPUT)
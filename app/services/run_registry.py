@@ -0,0 +1,314 @@
+# app/services/run_registry.py
+from __future__ import annotations
+
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.config.settings import settings
+from app.models.PacificDatetime import to_pacific
+from app.models.RunRecord import RunRecord
+from app.services.journal_writer import ends_mid_line
+from app.services.receipt_stream import read_cleanup_receipt, read_delete_receipt
+
+REGISTRY_PATH = Path("output") / "runs.jsonl"  # one event per line, append-only
+# The folded registry and the byte offset of runs.jsonl it covers; a cache, rebuilt when missing or stale
+SNAPSHOT_PATH = Path("output") / "runs-index.json"
+RUNS_DIR = Path("output") / "runs"  # only read to backfill a missing registry once
+ROLLBACK_FILENAME = "rollback.jsonl"
+RUN_META_FILENAME = "run.json"
+DELETE_RECEIPT_NAMES = ("delete_last_run-receipt.json", "delete_last_run-receipt.ndjson")
+CLEANUPS_DIR = Path("output") / "cleanups"
+CLEANUP_RECEIPT_NAMES = ("cleanup_runs-receipt.json", "cleanup_runs-receipt.ndjson")
+
+_lock = threading.Lock()
+# In-process copy of the snapshot: (offset, runs)
+_folded: Optional[Tuple[int, Dict[str, RunRecord]]] = None
+
+
+def _print(s: str) -> None:
+    print(f"\tREGISTRY: {s}")
+
+
+def _append(event: dict) -> None:
+    REGISTRY_PATH.parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps(event, ensure_ascii=False) + os.linesep
+    # one write() per event in append mode, so concurrent invocations don't interleave lines
+    with _lock, REGISTRY_PATH.open("a", encoding="utf-8") as fh:
+        if fh.tell() and ends_mid_line(REGISTRY_PATH):
+            line = os.linesep + line  # a crash tore the last event; don't glue this one onto it
+        fh.write(line)
+        fh.flush()
+        os.fsync(fh.fileno())
+
+
+def _when(value: Optional[str]) -> Optional[datetime]:
+    try:
+        dt = datetime.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+    return dt.replace(tzinfo=timezone.utc) if dt is not None and dt.tzinfo is None else dt
+
+
+def _apply(runs: Dict[str, RunRecord], event: dict) -> None:
+    run_id = event.get("run_id")
+    if not run_id:
+        return
+    kind = event.get("event")
+    r = runs.get(run_id)
+    if r is None:
+        r = runs[run_id] = RunRecord(run_id=run_id)
+    if kind == "started":
+        r.kind = event.get("kind", r.kind)
+        r.actor_uuid = event.get("actor_uuid", r.actor_uuid)
+        r.started_at = r.started_at or _when(event.get("started_at"))
+        r.finished_at = None
+        # (re)started, e.g. resumed after an interrupt or a delete: its next
+        # "finished" event decides between pending and empty again
+        r.rollback_status = "running"
+    elif kind == "finished":
+        r.finished_at = _when(event.get("finished_at"))
+        r.successes = event.get("successes", 0)
+        r.failures = event.get("failures", 0)
+        if r.rollback_status == "running":
+            r.rollback_status = "pending" if r.successes else "empty"
+    elif kind == "deleted":
+        r.deleted += event.get("deleted", 0)
+        r.delete_failures = event.get("failures", 0)
+        r.rollback_status = "partial" if r.delete_failures else "deleted"
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def record_started(run_id: str, started_at: datetime, actor_uuid: str, kind: str) -> None:
+    """A batch run started (or was resumed)."""
+    # the run's folder already exists; it is registered by the event below, not backfilled
+    _backfill_if_missing(exclude=run_id)
+    _append({
+        "event": "started",
+        "run_id": run_id,
+        "kind": kind,
+        "actor_uuid": actor_uuid,
+        "started_at": started_at.isoformat(),
+    })
+
+
+def record_finished(run_id: str, finished_at: datetime, successes: int, failures: int) -> None:
+    """A batch run wrote its receipt."""
+    _append({
+        "event": "finished",
+        "run_id": run_id,
+        "finished_at": finished_at.isoformat(),
+        "successes": successes,
+        "failures": failures,
+    })
+
+
+def record_deleted(run_id: str, deleted: int, failures: int) -> None:
+    """A (non-dry-run) delete or cleanup went through the run's rollback.jsonl."""
+    _append({
+        "event": "deleted",
+        "run_id": run_id,
+        "at": _now_iso(),
+        "deleted": deleted,
+        "failures": failures,
+    })
+
+
+def _read_events(offset: int = 0) -> Tuple[List[dict], int]:
+    """
+    Events from byte `offset` on, and the offset just past the last complete
+    line (an unterminated last line is left for the next read).
+    """
+    events: List[dict] = []
+    with REGISTRY_PATH.open("rb") as fh:
+        fh.seek(offset)
+        for raw in fh:
+            if not raw.endswith(b"\n"):
+                break  # still being written, or torn by a crash
+            offset += len(raw)
+            s = raw.strip()
+            if not s:
+                continue
+            try:
+                events.append(json.loads(s))
+            except json.JSONDecodeError:
+                continue  # torn line from a crash; ignore
+    return events, offset
+
+
+def _load_snapshot() -> Tuple[int, Dict[str, RunRecord]]:
+    try:
+        with SNAPSHOT_PATH.open("r", encoding="utf-8") as fh:
+            data = json.load(fh)
+        runs = {r["run_id"]: RunRecord.model_validate(r) for r in data["runs"]}
+        return int(data["offset"]), runs
+    except (OSError, ValueError, KeyError, TypeError):
+        return 0, {}
+
+
+def _save_snapshot(offset: int, runs: Dict[str, RunRecord]) -> None:
+    tmp = SNAPSHOT_PATH.with_name(f"{SNAPSHOT_PATH.name}.{os.getpid()}.tmp")
+    try:
+        with tmp.open("w", encoding="utf-8") as fh:
+            json.dump(
+                {"offset": offset, "runs": [r.model_dump(mode="json") for r in runs.values()]},
+                fh,
+                ensure_ascii=False,
+            )
+        os.replace(tmp, SNAPSHOT_PATH)  # atomic, so concurrent readers never see half a snapshot
+    except OSError as e:
+        _print(f"Could not write {SNAPSHOT_PATH}: {e}")
+
+
+def _has_rollback(run_id: str) -> bool:
+    rb = RUNS_DIR / run_id / ROLLBACK_FILENAME
+    return rb.is_file() and rb.stat().st_size > 0
+
+
+def _backfill_if_missing(exclude: Optional[str] = None) -> None:
+    """
+    Seed a missing registry from the run folders that predate it, once:
+    runs with a non-empty rollback.jsonl become "pending", the rest "empty",
+    and earlier delete/cleanup receipts mark them deleted. `exclude` is the
+    run being started, whose folder already exists.
+    """
+    if REGISTRY_PATH.exists() or not RUNS_DIR.exists():
+        return
+    found = []
+    for run_dir in (p for p in RUNS_DIR.iterdir() if p.is_dir() and p.name != exclude):
+        meta: dict = {}
+        try:
+            with (run_dir / RUN_META_FILENAME).open("r", encoding="utf-8") as fh:
+                meta = json.load(fh)
+        except (OSError, ValueError):
+            pass
+        # folders are touched by later deletes, so mtime is only the fallback
+        mtime = datetime.fromtimestamp(run_dir.stat().st_mtime, tz=timezone.utc)
+        found.append((_when(meta.get("started_at")) or mtime, run_dir, meta, mtime.isoformat()))
+    if not found:
+        return
+    found.sort(key=lambda t: (t[0], t[1].name))
+    _print(f"Backfilling {REGISTRY_PATH} from {len(found)} run folder(s)...")
+    for started_at, run_dir, meta, mtime in found:
+        _append({
+            "event": "started",
+            "run_id": run_dir.name,
+            "kind": meta.get("kind") or ("apply-plan" if "plan" in meta else "batch"),
+            "actor_uuid": meta.get("actor_uuid"),
+            "started_at": started_at.isoformat(),
+            "backfilled": True,
+        })
+        rollback = run_dir / ROLLBACK_FILENAME
+        created = 0
+        if rollback.is_file():
+            with rollback.open("r", encoding="utf-8") as fh:
+                created = sum(1 for line in fh if line.strip())
+        _append({
+            "event": "finished",
+            "run_id": run_dir.name,
+            "finished_at": mtime,
+            "successes": created,
+            "failures": 0,  # only in the receipt; not needed for lookups
+            "backfilled": True,
+        })
+        for name in DELETE_RECEIPT_NAMES:
+            if not (run_dir / name).exists():
+                continue
+            try:
+                receipt = read_delete_receipt(run_dir / name)
+            except (OSError, ValueError):
+                continue
+            if not receipt.dry_run:
+                _append({
+                    "event": "deleted",
+                    "run_id": run_dir.name,
+                    "at": receipt.finished_at.isoformat(),
+                    "deleted": len(receipt.successes),
+                    "failures": len(receipt.failures),
+                    "backfilled": True,
+                })
+
+    cleanups = [p for name in CLEANUP_RECEIPT_NAMES for p in CLEANUPS_DIR.glob(f"*/{name}")]
+    for path in sorted(cleanups):
+        try:
+            receipt = read_cleanup_receipt(path)
+        except (OSError, ValueError):
+            continue
+        if receipt.dry_run:
+            continue
+        for run_id in receipt.run_ids:
+            if not (RUNS_DIR / run_id).is_dir():
+                continue
+            _append({
+                "event": "deleted",
+                "run_id": run_id,
+                "at": receipt.finished_at.isoformat(),
+                "deleted": sum(1 for v in receipt.successes if v.run_id == run_id),
+                "failures": sum(1 for v in receipt.failures if v.run_id == run_id),
+                "backfilled": True,
+            })
+
+
+def load_runs() -> List[RunRecord]:
+    """
+    Every registered run, in registration order (oldest first).
+    Starts from the folded snapshot (in memory, else runs-index.json) and
+    folds only the events appended since, so a lookup reads the new tail of
+    runs.jsonl instead of replaying the whole log.
+    """
+    global _folded
+    _backfill_if_missing()
+    if not REGISTRY_PATH.exists():
+        return []
+    with _lock:
+        offset, runs = _folded if _folded is not None else _load_snapshot()
+        if offset > REGISTRY_PATH.stat().st_size:
+            offset, runs = 0, {}  # log was replaced or truncated: refold it
+        events, new_offset = _read_events(offset)
+        if events:
+            # fold into copies: the cached records may be in a caller's hands
+            runs = {run_id: r.model_copy() for run_id, r in runs.items()}
+            for event in events:
+                _apply(runs, event)
+        if new_offset != offset:
+            _save_snapshot(new_offset, runs)
+        _folded = (new_offset, runs)
+    return list(runs.values())
+
+
+def latest_undeleted_run() -> Optional[RunRecord]:
+    """
+    The most recently started run that still has vaults to delete, scanning
+    the folded registry from the newest run. Only an unfinished (running or
+    interrupted) run needs a look at its rollback.jsonl.
+    """
+    for r in reversed(load_runs()):
+        if r.rollback_status in ("pending", "partial"):
+            return r
+        if r.rollback_status == "running" and _has_rollback(r.run_id):
+            return r
+    return None
+
+
+def print_runs() -> None:
+    runs = load_runs()
+    if not runs:
+        print(f"No runs registered in {REGISTRY_PATH}")
+        return
+    print(f"{'RUN ID':<34} {'KIND':<10} {'STARTED':<19} {'OK':>6} {'FAILED':>6} {'DELETED':>7}  ROLLBACK")
+    for r in reversed(runs):
+        started = "-"
+        if r.started_at is not None:
+            at = to_pacific(r.started_at) if settings.usePacificTz else r.started_at.astimezone(timezone.utc)
+            started = at.strftime("%Y-%m-%d %H:%M:%S")
+        print(
+            f"{r.run_id:<34} {r.kind:<10} {started:<19} {r.successes:>6} {r.failures:>6} "
+            f"{r.deleted:>7}  {r.rollback_status}"
+        )
+    print(f"{len(runs)} run(s); registry: {REGISTRY_PATH}")
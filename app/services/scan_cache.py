@@ -0,0 +1,140 @@
+# app/services/scan_cache.py
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from app.config.settings import settings
+from app.models.InputFileParseResult import InputFileParseResult
+
+CACHE_DIR = Path("output") / "cache"
+CACHE_FILENAME = "input-scan.json"  # {"params": {...}, "entries": {path: entry}}
+# Bump whenever parsing or validation in load_project_inputs changes what a file parses to
+PARSER_VERSION = 2
+
+# path -> {"size", "mtime_ns", "sha256", "result"}; shared by every scan in this process
+_entries: Dict[str, dict] = {}
+_loaded = False
+_dirty = False
+_lock = threading.Lock()
+
+
+def _print(s: str) -> None:
+    print(f"\tSCAN-CACHE: {s}")
+
+
+def _cache_path() -> Path:
+    return CACHE_DIR / CACHE_FILENAME
+
+
+def _params() -> dict:
+    """Parser version and settings that change parse results; a mismatch invalidates every entry."""
+    return {
+        "parserVersion": PARSER_VERSION,
+        "maxInputFileBytes": settings.maxInputFileBytes,
+        "maxProjectsPerFile": settings.maxProjectsPerFile,
+        "maxRolesPerFile": settings.maxRolesPerFile,
+    }
+
+
+def file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _ensure_loaded() -> None:
+    global _loaded
+    if _loaded:
+        return
+    _loaded = True
+    path = _cache_path()
+    if not path.exists():
+        return
+    try:
+        with path.open("r", encoding="utf-8") as fh:
+            data = json.load(fh)
+        if data.get("params") != _params():
+            return
+        _entries.update(data["entries"])
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        _print(f"Ignoring unreadable scan cache: {e}")
+
+
+def lookup(path: Path) -> Optional[InputFileParseResult]:
+    """
+    Return the cached parse of `path` if its content is unchanged, else None.
+    A matching (size, mtime) is trusted as-is; otherwise the content hash decides,
+    so a touched-but-identical file is still a hit.
+    """
+    global _dirty
+    if not settings.scanCacheEnabled:
+        return None
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    key = str(path)
+    with _lock:
+        _ensure_loaded()
+        entry = _entries.get(key)
+    if entry is None:
+        return None
+    if entry["size"] != st.st_size or entry["mtime_ns"] != st.st_mtime_ns:
+        try:
+            if entry["size"] != st.st_size or file_digest(path) != entry["sha256"]:
+                return None
+        except OSError:
+            return None
+        with _lock:
+            entry["mtime_ns"] = st.st_mtime_ns
+            _dirty = True
+    try:
+        return InputFileParseResult.model_validate(entry["result"])
+    except ValueError:
+        return None
+
+
+def store(path: Path, result: InputFileParseResult, fingerprint: Optional[dict]) -> None:
+    """
+    Remember `result` as the parse of `path`. `fingerprint` ({"size",
+    "mtime_ns", "sha256"}) must describe the bytes `result` was parsed from,
+    so a file changed mid-parse is not cached under its new content. Files
+    without one (too large or unreadable) are re-parsed, and re-reported, every time.
+    """
+    global _dirty
+    if not settings.scanCacheEnabled or fingerprint is None:
+        return
+    with _lock:
+        _ensure_loaded()
+        _entries[str(path)] = {**fingerprint, "result": result.model_dump(mode="json")}
+        _dirty = True
+
+
+def save() -> None:
+    """Persist the cache if anything changed since the last save."""
+    global _dirty
+    if not settings.scanCacheEnabled:
+        return
+    with _lock:
+        if not _dirty:
+            return
+        # drop entries for input files that no longer exist
+        for key in [k for k in _entries if not os.path.exists(k)]:
+            del _entries[key]
+        payload = {"params": _params(), "entries": dict(_entries)}
+        _dirty = False
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = _cache_path().with_suffix(".json.tmp")
+        with tmp.open("w", encoding="utf-8") as fh:
+            json.dump(payload, fh, ensure_ascii=False)
+        os.replace(tmp, _cache_path())
+    except OSError as e:
+        _print(f"Could not write scan cache: {e}")
@@ -0,0 +1,66 @@
+# app/services/session.py
+from __future__ import annotations
+
+import threading
+from typing import Optional
+
+from app.models.ServiceAccountWhoamiResponse import ServiceAccountWhoamiResponse
+from app.services.list_vaults import VaultIndex, get_existing_vault_indexes
+from app.services.vault_inventory import cache_enabled
+from app.services.who_am_i import try_get_identity
+
+
+class Session:
+    """
+    Read-only `op` results shared by the services of one CLI invocation:
+    - identity() / actor_uuid(): `op whoami`, resolved once
+    - vault_index(): the vault index from the inventory cache or `op vault list`,
+      built once and then kept in step by the runs that mutate vaults
+    Pass the same session to run_from_inputs / run_from_plan /
+    preview_from_inputs / delete_last_run / cleanup_runs so no read-only call
+    is issued twice.
+    Call invalidate_inventory() after creating or deleting vaults without
+    going through the index (e.g. try_create_vault directly).
+    """
+
+    def __init__(self, identity: Optional[ServiceAccountWhoamiResponse] = None):
+        # re-entrant: vault_index() resolves the identity that keys the inventory cache
+        self._lock = threading.RLock()
+        self._identity = identity  # pass one in when the caller already knows it
+        self._index: Optional[VaultIndex] = None
+
+    def identity(self) -> ServiceAccountWhoamiResponse:
+        with self._lock:
+            if self._identity is None:
+                self._identity = try_get_identity()
+            return self._identity
+
+    def actor_uuid(self) -> str:
+        return self.identity().user_uuid
+
+    def inventory_owner(self) -> str:
+        """Key of the inventory cache: a snapshot listed by another account or user is not reused."""
+        identity = self.identity()
+        return f"{identity.account_uuid}/{identity.user_uuid}"
+
+    def vault_index(self, refresh: bool = False, max_age: Optional[float] = None) -> VaultIndex:
+        """
+        The shared index. refresh bypasses the inventory cache when the index
+        is first built, max_age overrides the cache TTL; once built, it is
+        reused until invalidate_inventory(). With the cache enabled this
+        resolves the identity first, to key the cache.
+        Raises like get_existing_vault_indexes; a failed listing is not memoized.
+        """
+        with self._lock:
+            if self._index is None:
+                owner = self.inventory_owner() if cache_enabled() else None
+                self._index = get_existing_vault_indexes(refresh=refresh, owner=owner, max_age=max_age)
+            return self._index
+
+    def loaded_index(self) -> Optional[VaultIndex]:
+        """The index if something already listed vaults in this session, else None (never calls `op`)."""
+        return self._index
+
+    def invalidate_inventory(self) -> None:
+        with self._lock:
+            self._index = None
@@ -0,0 +1,138 @@
+# app/services/tracing.py
+from __future__ import annotations
+
+import contextvars
+import math
+import threading
+import time
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.models.SpanStats import SpanStats
+from app.services.journal_writer import JournalWriter
+
+
+class Span:
+    """A timed section; set `outcome` (and attrs) inside the `with span(...)` block."""
+
+    __slots__ = ("outcome", "attrs")
+
+    def __init__(self, attrs: Dict[str, Any]):
+        self.outcome: Optional[str] = None
+        self.attrs = attrs
+
+
+class Tracer:
+    """
+    Collects spans for one run: keeps per-name durations for the receipt's
+    timing summary and, with a trace_path, appends every raw span to it as
+    JSONL (group-committed). Safe to record from worker threads.
+    """
+
+    def __init__(self, trace_path: Optional[Path] = None):
+        self._lock = threading.Lock()
+        self._durations: Dict[str, List[float]] = {}
+        self._outcomes: Dict[str, Dict[str, int]] = {}
+        self._trace = JournalWriter(trace_path) if trace_path is not None else None
+        self.trace_path = trace_path
+
+    def record(self, name: str, start: float, duration: float, span: Span) -> None:
+        outcome = span.outcome or "ok"
+        with self._lock:
+            self._durations.setdefault(name, []).append(duration)
+            counts = self._outcomes.setdefault(name, {})
+            counts[outcome] = counts.get(outcome, 0) + 1
+        if self._trace is not None:
+            self._trace.write({
+                "name": name,
+                "start": start,
+                "duration_ms": duration * 1000,
+                "outcome": outcome,
+                "thread": threading.current_thread().name,
+                **span.attrs,
+            })
+
+    def summary(self) -> Dict[str, SpanStats]:
+        with self._lock:
+            snapshot = {name: sorted(d) for name, d in self._durations.items()}
+            outcomes = {name: dict(c) for name, c in self._outcomes.items()}
+        stats: Dict[str, SpanStats] = {}
+        for name, d in sorted(snapshot.items()):
+            stats[name] = SpanStats(
+                count=len(d),
+                total_sec=sum(d),
+                p50_ms=d[max(0, math.ceil(0.50 * len(d)) - 1)] * 1000,
+                p95_ms=d[max(0, math.ceil(0.95 * len(d)) - 1)] * 1000,
+                max_ms=d[-1] * 1000,
+                outcomes=outcomes[name],
+            )
+        return stats
+
+    def close(self) -> None:
+        if self._trace is not None:
+            self._trace.close()
+
+
+# The tracer of the run in progress; spans outside a run are not recorded.
+# Context-local, so runs in different threads or tasks of one process don't
+# share a tracer; worker threads join their run's context through submit().
+_active: contextvars.ContextVar[Optional[Tracer]] = contextvars.ContextVar("tracer", default=None)
+
+# Also called with (name, duration_sec, span) for every finished span, e.g. by metrics
+SpanListener = Callable[[str, float, Span], None]
+_listeners: contextvars.ContextVar[Tuple[SpanListener, ...]] = contextvars.ContextVar("span_listeners", default=())
+
+
+def add_listener(listener: SpanListener) -> None:
+    _listeners.set(_listeners.get() + (listener,))
+
+
+def remove_listener(listener: SpanListener) -> None:
+    _listeners.set(tuple(x for x in _listeners.get() if x is not listener))
+
+
+def submit(pool: Executor, fn: Callable[..., Any], *args: Any) -> Future:
+    """pool.submit(fn, *args) in a copy of the caller's context, so the worker records to the caller's run."""
+    return pool.submit(contextvars.copy_context().run, fn, *args)
+
+
+def start_trace(trace_path: Optional[Path] = None) -> Tracer:
+    tracer = Tracer(trace_path)
+    _active.set(tracer)
+    return tracer
+
+
+def stop_trace(tracer: Tracer) -> None:
+    if _active.get() is tracer:
+        _active.set(None)
+    tracer.close()
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Span]:
+    """
+    Time the enclosed block as `name` on the active tracer and listeners (a
+    no-op without either). The outcome defaults to "ok", or "error" when the
+    block raises.
+    """
+    s = Span(attrs)
+    tracer = _active.get()
+    listeners = _listeners.get()
+    if tracer is None and not listeners:
+        yield s
+        return
+    start = time.time()
+    t0 = time.perf_counter()
+    try:
+        yield s
+    except BaseException:
+        s.outcome = s.outcome or "error"
+        raise
+    finally:
+        duration = time.perf_counter() - t0
+        if tracer is not None:
+            tracer.record(name, start, duration, s)
+        for listener in listeners:
+            listener(name, duration, s)
@@ -0,0 +1,158 @@
+# app/services/vault_inventory.py
+from __future__ import annotations
+
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.config.settings import settings
+from app.models.VaultListItem import VaultListItem
+
+INVENTORY_DIR = Path("output") / "inventory"
+SNAPSHOT_FILENAME = "vaults.json"  # {"fetched_at": ..., "owner": ..., "items": [...]} from `op vault list`
+DELTA_FILENAME = "vaults-delta.jsonl"  # write-through adds/removes since the snapshot
+
+_delta_lock = threading.Lock()
+# Owner of the snapshot as verified by this process (loaded with a matching owner, or
+# saved); until then a mutation can't be written through, so it drops the snapshot
+_verified_owner: Optional[str] = None
+
+
+def _print(s: str) -> None:
+    print(f"\tINVENTORY: {s}")
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _snapshot_path() -> Path:
+    return INVENTORY_DIR / SNAPSHOT_FILENAME
+
+
+def _delta_path() -> Path:
+    return INVENTORY_DIR / DELTA_FILENAME
+
+
+def cache_enabled() -> bool:
+    return max(settings.inventoryCacheTtlSec, settings.runInventoryCacheTtlSec) > 0
+
+
+def snapshot_age_seconds() -> Optional[float]:
+    """
+    Age of the cached `op vault list` snapshot, or None when there is none.
+    """
+    path = _snapshot_path()
+    if not path.exists():
+        return None
+    try:
+        with path.open("r", encoding="utf-8") as fh:
+            fetched_at = datetime.fromisoformat(json.load(fh)["fetched_at"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return (_now() - fetched_at).total_seconds()
+
+
+def _apply_delta(items: Dict[str, VaultListItem]) -> None:
+    path = _delta_path()
+    if not path.exists():
+        return
+    with path.open("r", encoding="utf-8") as fh:
+        for raw in fh:
+            s = raw.strip()
+            if not s:
+                continue
+            try:
+                entry = json.loads(s)
+            except json.JSONDecodeError:
+                continue  # torn trailing line from a crash; ignore
+            if entry.get("op") == "add":
+                v = VaultListItem.model_validate(entry["item"])
+                items[v.id] = v
+            elif entry.get("op") == "remove":
+                ident = entry.get("identifier")
+                if ident in items:
+                    del items[ident]
+                else:
+                    for vid in [k for k, v in items.items() if v.name == ident]:
+                        del items[vid]
+
+
+def load_cached_inventory(owner: str, max_age: Optional[float] = None) -> Optional[List[VaultListItem]]:
+    """
+    Returns the cached inventory (snapshot + write-through delta), or None if
+    the cache is disabled, missing, unreadable, older than max_age (default:
+    settings.inventoryCacheTtlSec) or was listed for a different owner
+    (`op` account/user, see Session.inventory_owner).
+    """
+    global _verified_owner
+    ttl = settings.inventoryCacheTtlSec if max_age is None else max_age
+    if ttl <= 0:
+        return None
+    age = snapshot_age_seconds()
+    if age is None or age > ttl:
+        return None
+    try:
+        with _snapshot_path().open("r", encoding="utf-8") as fh:
+            data = json.load(fh)
+        if data.get("owner") != owner:
+            _print("Cached vault inventory belongs to a different account or user; relisting.")
+            return None
+        items = {v.id: v for v in (VaultListItem.model_validate(x) for x in data["items"])}
+        _apply_delta(items)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        _print(f"Ignoring unreadable inventory cache: {e}")
+        return None
+    with _delta_lock:
+        _verified_owner = owner
+    _print(f"Using cached vault inventory ({len(items)} vault(s), age {age:.0f}s).")
+    return list(items.values())
+
+
+def save_inventory(items: List[VaultListItem], owner: str) -> None:
+    """
+    Replace the snapshot with a fresh `op vault list` result for `owner` and reset the delta.
+    """
+    global _verified_owner
+    if not cache_enabled():
+        return
+    INVENTORY_DIR.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "fetched_at": _now().isoformat(),
+        "owner": owner,
+        "items": [v.model_dump() for v in items],
+    }
+    tmp = _snapshot_path().with_suffix(".json.tmp")
+    with tmp.open("w", encoding="utf-8") as fh:
+        json.dump(payload, fh, ensure_ascii=False)
+    with _delta_lock:
+        os.replace(tmp, _snapshot_path())
+        _delta_path().unlink(missing_ok=True)
+        _verified_owner = owner
+
+
+def _append_delta(entry: dict) -> None:
+    # Only keep a delta against an existing snapshot; otherwise the next read relists anyway
+    if not cache_enabled() or not _snapshot_path().exists():
+        return
+    with _delta_lock:
+        if _verified_owner is None:
+            # the snapshot may be another account's: drop it rather than mix the two
+            _snapshot_path().unlink(missing_ok=True)
+            _delta_path().unlink(missing_ok=True)
+            return
+        with _delta_path().open("a", encoding="utf-8") as fh:
+            fh.write(json.dumps(entry, ensure_ascii=False) + os.linesep)
+
+
+def record_created(item: VaultListItem) -> None:
+    """Write-through: a vault created by this tool."""
+    _append_delta({"op": "add", "item": item.model_dump()})
+
+
+def record_deleted(identifier: str) -> None:
+    """Write-through: a vault (by id or name) deleted by this tool."""
+    _append_delta({"op": "remove", "identifier": identifier})
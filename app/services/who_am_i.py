@@ -12,6 +12,11 @@ def _print(s: str):
 # Get the User UUID of the person running the script.
 # This is required for other parts of the script.
 def try_get_uuid() -> str:
+    return try_get_identity().user_uuid
+
+
+# The full `op whoami` response (user, account); exits when not signed in.
+def try_get_identity() -> ServiceAccountWhoamiResponse:
     _print("Ensuring you're signed into 1Password and obtaining your User ID.")
     # r = subprocess.run(["op", "whoami", "--format=json"], capture_output=True)
     r = op_whoami()
@@ -24,12 +29,11 @@ def try_get_uuid() -> str:
         )
 
     try:
-        validated = ServiceAccountWhoamiResponse.model_validate(r.formatted_output)
+        validated = r.parsed or ServiceAccountWhoamiResponse.model_validate(r.formatted_output)
     except Exception:
         sys.exit(
             "ERR: whoami returned non-error response but output did not match expected result"
         )
 
-    user_uuid: str = validated.user_uuid
-    _print(f"Obtained User ID: {user_uuid}")
-    return user_uuid
+    _print(f"Obtained User ID: {validated.user_uuid}")
+    return validated
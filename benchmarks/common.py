@@ -0,0 +1,143 @@
+# benchmarks/common.py
+from __future__ import annotations
+
+import json
+import math
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+
+_ROLE_LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def percentiles(samples: Sequence[float], ps: Iterable[int] = (50, 95, 99)) -> Dict[str, float]:
+    """Nearest-rank percentiles, e.g. {"p50": ..., "p95": ..., "p99": ...}; empty when no samples."""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    return {f"p{p}": ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)] for p in ps}
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process, or None where `resource` is unavailable."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _role_name(i: int) -> str:
+    letters = ""
+    i += 1
+    while i:
+        i, r = divmod(i - 1, 26)
+        letters = _ROLE_LETTERS[r] + letters
+    return f"Role {letters}"
+
+
+def write_synthetic_inputs(
+    base_dir: Path, n_vaults: int, roles_per_batch: int = 10, projects_per_batch: int = 50
+) -> int:
+    """
+    Write batches of *-vault-prefixes.txt / *-vault-suffixes.txt under
+    base_dir/input that plan roughly `n_vaults` unique, non-colliding vault
+    names (within the default per-file caps). Returns the planned count.
+    """
+    input_dir = base_dir / "input"
+    input_dir.mkdir(parents=True, exist_ok=True)
+    roles = [_role_name(i) for i in range(max(1, min(roles_per_batch, n_vaults)))]
+    planned = 0
+    batch = 0
+    while planned < n_vaults:
+        n_projects = min(projects_per_batch, math.ceil((n_vaults - planned) / len(roles)))
+        projects = [f"B{batch:04d} Project {p:03d}" for p in range(n_projects)]
+        (input_dir / f"bench{batch:04d}-vault-prefixes.txt").write_text("\n".join(projects) + "\n")
+        (input_dir / f"bench{batch:04d}-vault-suffixes.txt").write_text("\n".join(roles) + "\n")
+        planned += n_projects * len(roles)
+        batch += 1
+    return planned
+
+
+def _git_rev() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+        )
+        return out.stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(name: str, cases: List[dict], out: Optional[Path] = None) -> Path:
+    """Write {"meta": ..., "cases": [...]} to benchmarks/results/<name>-<timestamp>.json (or `out`)."""
+    now = datetime.now(timezone.utc)
+    payload = {
+        "meta": {
+            "benchmark": name,
+            "created_at": now.isoformat(),
+            "git_rev": _git_rev(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "cases": cases,
+    }
+    if out is None:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        out = RESULTS_DIR / f"{name}-{now.strftime('%Y%m%d-%H%M%S')}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with out.open("w", encoding="utf-8") as fh:
+        json.dump(payload, fh, indent=2)
+    return out
+
+
+def _get(d: dict, dotted: str) -> Optional[float]:
+    for part in dotted.split("."):
+        if not isinstance(d, dict) or part not in d:
+            return None
+        d = d[part]
+    return d if isinstance(d, (int, float)) else None
+
+
+def compare_results(
+    current: List[dict],
+    baseline_path: Path,
+    key_fields: Sequence[str],
+    metrics: Sequence[Tuple[str, bool]],
+    tolerance: float,
+) -> List[str]:
+    """
+    Compare matching cases (same `key_fields`) against a saved results file.
+    `metrics` are (dotted path, higher_is_better). Prints one line per metric
+    and returns the regressions worse than `tolerance` (e.g. 0.2 = 20%).
+    """
+    with baseline_path.open("r", encoding="utf-8") as fh:
+        baseline = json.load(fh)["cases"]
+    by_key = {tuple(c.get(k) for k in key_fields): c for c in baseline}
+    regressions: List[str] = []
+    for case in current:
+        key = tuple(case.get(k) for k in key_fields)
+        old = by_key.get(key)
+        if old is None:
+            continue
+        label = " ".join(f"{k}={v}" for k, v in zip(key_fields, key))
+        for path, higher_is_better in metrics:
+            new_v, old_v = _get(case, path), _get(old, path)
+            if new_v is None or not old_v:
+                continue
+            change = new_v / old_v - 1
+            worse = -change if higher_is_better else change
+            flag = "REGRESSION" if worse > tolerance else "ok"
+            print(f"  [{flag}] {label} {path}: {old_v:.4g} -> {new_v:.4g} ({change:+.1%})")
+            if worse > tolerance:
+                regressions.append(f"{label} {path} {change:+.1%}")
+    return regressions
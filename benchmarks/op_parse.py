@@ -0,0 +1,113 @@
+# benchmarks/op_parse.py
+"""
+Parsing of `op` JSON output: the generic path (decode stdout, json.loads into
+SubprocessResponse.formatted_output, model_validate per object) against the
+typed path (TypeAdapter.validate_json over the stdout bytes).
+
+    python -m benchmarks.op_parse                      # vault lists of 1k/10k/100k
+    python -m benchmarks.op_parse --sizes 1000 250000 --repeat 5
+
+Both paths go through the same response and `_list_items` code, so the only
+difference is how stdout is turned into models. Results are written to
+benchmarks/results/op_parse-<timestamp>.json.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+from benchmarks.common import compare_results, save_results
+
+ARGS = ["op", "vault", "list", "--format=json"]
+
+
+def _vault_list_bytes(n: int) -> bytes:
+    return json.dumps([
+        {
+            "id": f"{i:026x}",
+            "name": f"Existing Project {i:06d} - Role {i % 7}",
+            "content_version": 1,
+            "created_at": "2025-01-01T00:00:00Z",
+            "updated_at": "2025-01-01T00:00:00Z",
+            "items": i % 13,
+        }
+        for i in range(n)
+    ]).encode("utf-8")
+
+
+def _paths(payload: bytes) -> List[Tuple[str, Callable[[], list]]]:
+    from app.models.SubprocessResponse import SubprocessResponse
+    from app.services import list_vaults, run_command
+
+    def generic() -> list:
+        sr = SubprocessResponse(command=" ".join(ARGS), output=payload.decode("utf-8"), error="", return_code=0)
+        return list_vaults._list_items(sr)
+
+    def typed() -> list:
+        sr = run_command._decode(ARGS, payload, b"", 0, run_command.LIST_VAULTS_OUTPUT)
+        return list_vaults._list_items(sr)
+
+    return [("generic", generic), ("typed", typed)]
+
+
+def _measure(fn: Callable[[], list], repeat: int) -> Tuple[float, float, int]:
+    """(best seconds of `repeat`, peak traced MB of one run, items returned)."""
+    best = math.inf
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    items = fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak / (1024 * 1024), len(items)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(prog="benchmarks.op_parse", description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000, 100_000], help="Vaults per list.")
+    ap.add_argument("--repeat", type=int, default=3, help="Runs per path and size; the best is kept. Default: 3.")
+    ap.add_argument("--out", type=Path, help="Results file (default: benchmarks/results/op_parse-<timestamp>.json).")
+    ap.add_argument("--compare", type=Path, metavar="RESULTS", help="Earlier results file to compare against.")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before --compare fails. Default: 0.25.")
+    args = ap.parse_args()
+
+    results = []
+    for size in args.sizes:
+        payload = _vault_list_bytes(size)
+        timings = {}
+        for path, fn in _paths(payload):
+            sec, peak_mb, n = _measure(fn, args.repeat)
+            assert n == size, f"{path} parsed {n} of {size} vaults"
+            timings[path] = sec
+            results.append({"path": path, "size": size, "sec": sec, "peak_mb": peak_mb})
+            print(f"  {path:<8} n={size:<7} {sec * 1000:9.1f}ms  {size / sec:12,.0f} vaults/s  peak {peak_mb:7.1f} MB")
+        print(f"  {'':<8} n={size:<7} typed is {timings['generic'] / timings['typed']:.1f}x faster")
+
+    path = save_results("op_parse", results, args.out)
+    print(f"Results written to: {path}")
+
+    if args.compare:
+        regressions = compare_results(
+            results,
+            args.compare,
+            key_fields=("path", "size"),
+            metrics=[("sec", False), ("peak_mb", False)],
+            tolerance=args.tolerance,
+        )
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
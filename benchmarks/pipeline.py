@@ -0,0 +1,230 @@
+# benchmarks/pipeline.py
+"""
+End-to-end throughput of the create (run_from_inputs) and delete
+(delete_last_run) pipelines against the offline `op` simulator (app/fake_op.py).
+
+    python -m benchmarks.pipeline                              # fast profile, 100/1k/10k vaults
+    python -m benchmarks.pipeline --profiles fast throttled --sizes 100 1000
+    python -m benchmarks.pipeline --compare benchmarks/results/pipeline-20250901-120000.json
+
+Each case runs in a fresh interpreter inside a scratch directory, so settings,
+the rate governor and peak RSS are per case. Results are written to
+benchmarks/results/pipeline-<timestamp>.json.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks.common import (
+    REPO_ROOT,
+    compare_results,
+    peak_rss_mb,
+    percentiles,
+    save_results,
+    write_synthetic_inputs,
+)
+
+FAKE_OP = REPO_ROOT / "app" / "fake_op.py"
+
+# name -> environment for the simulator and the pacing governor
+PROFILES: Dict[str, Dict[str, str]] = {
+    # no latency, no limits, pacing effectively off: measures this tool's own overhead
+    "fast": {
+        "FAKE_OP_LATENCY": "0",
+        "PACING_INITIAL_RATE": "10000",
+        "PACING_MAX_RATE": "10000",
+    },
+    # service-like latency, no server-side limit
+    "latency": {
+        "FAKE_OP_LATENCY": "lognormal:0.25,0.4",
+        "PACING_INITIAL_RATE": "50",
+        "PACING_MAX_RATE": "50",
+    },
+    # modest latency and a hard server-side limit the governor has to discover
+    "throttled": {
+        "FAKE_OP_LATENCY": "uniform:0.02,0.1",
+        "FAKE_OP_RATE_LIMIT_RPS": "20",
+        "PACING_INITIAL_RATE": "40",
+        "PACING_MAX_RATE": "100",
+    },
+}
+
+RESULT_MARKER = "BENCHMARK-RESULT: "
+
+
+class _OpRecorder:
+    """Wraps run_command._op to time every `op` call by subcommand."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+        self.rate_limited = 0
+
+    def install(self) -> None:
+        from app.models.SubprocessResponse import OpStatus
+        from app.services import run_command
+
+        original = run_command._op
+
+        def timed(args, output_type=None):
+            t0 = time.perf_counter()
+            sr = original(args, output_type)
+            kind = args[2] if len(args) > 2 and args[1] == "vault" else args[1]
+            self.samples.setdefault(kind, []).append(time.perf_counter() - t0)
+            if sr.status == OpStatus.RATE_LIMITED:
+                self.rate_limited += 1
+            return sr
+
+        run_command._op = timed
+
+    def take(self, kind: str) -> dict:
+        samples = self.samples.pop(kind, [])
+        limited, self.rate_limited = self.rate_limited, 0
+        return {
+            "calls": len(samples),
+            "rate_limited": limited,
+            "op_latency_ms": {k: v * 1000 for k, v in percentiles(samples).items()},
+        }
+
+
+def _run_case(case: dict) -> dict:
+    """Child side: one create + delete cycle in the current (scratch) directory."""
+    from app.services.batch_from_inputs import run_from_inputs
+    from app.services.delete_last_run import delete_last_run
+    from app.services.rate_governor import governor
+    from app.services.receipt_stream import read_delete_receipt, read_run_receipt
+    from app.services.session import Session
+
+    recorder = _OpRecorder()
+    recorder.install()
+    planned = write_synthetic_inputs(Path.cwd(), case["size"])
+    session = Session()
+
+    def phase(fn):
+        waited = governor.total_wait
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            out = fn()
+        return out, time.perf_counter() - t0, governor.total_wait - waited
+
+    run_dir, create_sec, create_wait = phase(
+        lambda: run_from_inputs("benchmark", concurrency=case["concurrency"], session=session)
+    )
+    receipt = read_run_receipt(run_dir / "batch_from_inputs-receipt.json")
+    create = {
+        "wall_sec": create_sec,
+        "ok": len(receipt.successes),
+        "failed": len(receipt.failures),
+        "vaults_per_sec": len(receipt.successes) / create_sec if create_sec else None,
+        "pacing_worker_wait_sec": create_wait,  # summed over workers, not wall-clock
+        **recorder.take("create"),
+    }
+
+    receipt_path, delete_sec, delete_wait = phase(
+        lambda: delete_last_run(concurrency=case["concurrency"], session=session)
+    )
+    deleted = read_delete_receipt(receipt_path)
+    delete = {
+        "wall_sec": delete_sec,
+        "ok": len(deleted.successes),
+        "failed": len(deleted.failures),
+        "vaults_per_sec": len(deleted.successes) / delete_sec if delete_sec else None,
+        "pacing_worker_wait_sec": delete_wait,
+        **recorder.take("delete"),
+    }
+
+    return {**case, "planned": planned, "create": create, "delete": delete, "peak_rss_mb": peak_rss_mb()}
+
+
+def _spawn_case(profile: str, size: int, concurrency: int) -> dict:
+    """Parent side: run one case in a fresh interpreter and scratch directory."""
+    case = {"profile": profile, "size": size, "concurrency": concurrency}
+    with tempfile.TemporaryDirectory(prefix="vault-bench-") as tmp:
+        env = {
+            **os.environ,
+            **PROFILES[profile],
+            "OP_BINARY": f'"{sys.executable}" "{FAKE_OP}"',
+            "FAKE_OP_STATE": str(Path(tmp) / "fake-op.json"),
+            "FAKE_OP_SEED": os.environ.get("FAKE_OP_SEED", "1"),
+            "PYTHONPATH": os.pathsep.join(filter(None, [str(REPO_ROOT), os.environ.get("PYTHONPATH")])),
+        }
+        proc = subprocess.run(
+            [sys.executable, "-m", "benchmarks.pipeline", "--run-case", json.dumps(case)],
+            cwd=tmp, env=env, capture_output=True, text=True,
+        )
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER):])
+    raise RuntimeError(f"Benchmark case {case} failed:\n{proc.stderr[-2000:]}")
+
+
+def _print_case(r: dict) -> None:
+    for name in ("create", "delete"):
+        p = r[name]
+        lat = p["op_latency_ms"]
+        print(
+            f"  {r['profile']:<9} n={r['size']:<6} c={r['concurrency']:<3} {name:<6} "
+            f"{p['vaults_per_sec'] or 0:8.1f} vaults/s  ok={p['ok']} failed={p['failed']}  "
+            f"p50/p95/p99={lat.get('p50', 0):.0f}/{lat.get('p95', 0):.0f}/{lat.get('p99', 0):.0f}ms  "
+            f"paced={p['pacing_worker_wait_sec']:.1f} worker-s  rate-limited={p['rate_limited']}"
+        )
+    print(f"  {'':<9} peak RSS {r['peak_rss_mb'] or 0:.1f} MB")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(prog="benchmarks.pipeline", description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    ap.add_argument("--profiles", nargs="+", choices=sorted(PROFILES), default=["fast"])
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[8])
+    ap.add_argument("--out", type=Path, help="Results file (default: benchmarks/results/pipeline-<timestamp>.json).")
+    ap.add_argument("--compare", type=Path, metavar="RESULTS", help="Earlier results file to compare against.")
+    ap.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown before --compare fails. Default: 0.2.")
+    ap.add_argument("--run-case", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.run_case:
+        print(RESULT_MARKER + json.dumps(_run_case(json.loads(args.run_case))))
+        return 0
+
+    results = []
+    for profile in args.profiles:
+        for size in args.sizes:
+            for concurrency in args.concurrency:
+                r = _spawn_case(profile, size, concurrency)
+                _print_case(r)
+                results.append(r)
+
+    path = save_results("pipeline", results, args.out)
+    print(f"Results written to: {path}")
+
+    if args.compare:
+        regressions = compare_results(
+            results,
+            args.compare,
+            key_fields=("profile", "size", "concurrency"),
+            metrics=[
+                ("create.vaults_per_sec", True),
+                ("delete.vaults_per_sec", True),
+                ("create.op_latency_ms.p95", False),
+                ("peak_rss_mb", False),
+            ],
+            tolerance=args.tolerance,
+        )
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
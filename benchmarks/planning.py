@@ -0,0 +1,228 @@
+# benchmarks/planning.py
+"""
+Microbenchmarks for the CPU-bound planning path: input scanning, vault index
+construction, name keys, and the full preview loop. No `op` calls are made.
+
+    python -m benchmarks.planning                     # compare against the stored baseline
+    python -m benchmarks.planning --quick             # smaller sizes, for a fast check
+    python -m benchmarks.planning --update-baseline   # record a new baseline
+
+Each benchmark runs at a small and a large size; besides the time at each
+size it reports the scaling exponent between them (1.0 = linear), so a change
+that makes planning superlinear shows up even on a faster machine.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.common import REPO_ROOT, compare_results, peak_rss_mb, save_results
+
+BASELINE = REPO_ROOT / "benchmarks" / "baselines" / "planning.json"
+
+# benchmark -> (small, large) sizes; --quick divides the large size by 10
+SIZES: Dict[str, Tuple[int, int]] = {
+    "scan_input_files": (100, 1000),  # input files (half prefixes, half suffixes)
+    "index_from_vault_list": (10_000, 100_000),  # vaults returned by `op vault list`
+    "name_keys": (100_000, 1_000_000),  # normalize + canonical key per name
+    "preview_matrix": (100, 1000),  # N prefixes x N suffixes in one batch
+}
+
+
+def _timed(fn: Callable[[], object], repeat: int) -> float:
+    """Best of `repeat` runs, in seconds."""
+    best = math.inf
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _bench_scan(n_files: int, repeat: int) -> float:
+    from app.config.settings import settings
+    from app.services.load_project_inputs import load_all_inputs
+
+    input_dir = Path("input")
+    input_dir.mkdir(exist_ok=True)
+    for old in input_dir.iterdir():
+        old.unlink()
+    lines = "\n".join(f"Project {i:03d}" for i in range(50)) + "\n"
+    roles = "\n".join(f"Role {chr(65 + i % 26)}{chr(65 + i // 26)}" for i in range(100)) + "\n"
+    for b in range(n_files // 2):
+        (input_dir / f"b{b:05d}-vault-prefixes.txt").write_text(lines)
+        (input_dir / f"b{b:05d}-vault-suffixes.txt").write_text(roles)
+    settings.scanCacheEnabled = False  # measure parsing, not the cache
+    return _timed(lambda: load_all_inputs(workers=1), repeat)
+
+
+def _vault_list_json(n: int) -> str:
+    return json.dumps([
+        {
+            "id": f"{i:026x}",
+            "name": f"Existing Project {i:06d} - Role {i % 7}",
+            "content_version": 1,
+            "created_at": "2025-01-01T00:00:00Z",
+            "updated_at": "2025-01-01T00:00:00Z",
+        }
+        for i in range(n)
+    ])
+
+
+def _bench_index(n_vaults: int, repeat: int) -> float:
+    from app.config.settings import settings
+    from app.services import list_vaults, run_command
+
+    payload = _vault_list_json(n_vaults).encode("utf-8")
+    # decoded like a real `op vault list` response, stdout bytes included
+    list_vaults.op_list_vaults = lambda: run_command._decode(
+        ["op", "vault", "list", "--format=json"], payload, b"", 0, run_command.LIST_VAULTS_OUTPUT
+    )
+    settings.inventoryCacheTtlSec = 0  # always "list", never touch the cache
+    return _timed(lambda: list_vaults.get_existing_vault_indexes(refresh=True), repeat)
+
+
+def _bench_keys(n_names: int, repeat: int) -> float:
+    from app.services.list_vaults import canonical_vault_key, normalize_vault_name
+
+    names = [f"P: {i:07d} - Data -lead" for i in range(n_names)]
+
+    def run():
+        for name in names:
+            normalize_vault_name(name)
+            canonical_vault_key(name)
+
+    return _timed(run, repeat)
+
+
+def _bench_preview(n: int, repeat: int) -> float:
+    from app.config.settings import settings
+    from app.models.ServiceAccountWhoamiResponse import ServiceAccountWhoamiResponse
+    from app.models.VaultListItem import VaultListItem
+    from app.services import vault_inventory
+    from app.services.preview_from_inputs import preview_from_inputs
+    from app.services.session import Session
+
+    input_dir = Path("input")
+    input_dir.mkdir(exist_ok=True)
+    for old in input_dir.iterdir():
+        old.unlink()
+    (input_dir / "matrix-vault-prefixes.txt").write_text(
+        "\n".join(f"Project {i:05d}" for i in range(n)) + "\n"
+    )
+    (input_dir / "matrix-vault-suffixes.txt").write_text(
+        "\n".join(f"Role {chr(65 + i % 26)}{chr(65 + i // 26 % 26)}{chr(65 + i // 676)}" for i in range(n)) + "\n"
+    )
+    settings.maxProjectsPerFile = settings.maxRolesPerFile = settings.maxInputFileBytes = 0
+    settings.scanCacheEnabled = False
+    settings.inventoryCacheTtlSec = 3600
+    # a known identity, so neither `op whoami` nor `op vault list` is called
+    session = Session(ServiceAccountWhoamiResponse(
+        url="https://example.1password.com",
+        user_uuid="BENCHUSER",
+        account_uuid="BENCHACCOUNT",
+        user_type="SERVICE_ACCOUNT",
+    ))
+    # serve up to 1,000 existing vaults from the inventory cache instead of `op vault list`
+    vault_inventory.save_inventory([
+        VaultListItem(id=f"{i:026x}", name=f"Project {i:05d} - Role {chr(65 + i % 26)}AA")
+        for i in range(0, min(n, 1000))
+    ], session.inventory_owner())
+
+    def run():
+        session.invalidate_inventory()
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            preview_from_inputs(session=session)
+
+    return _timed(run, repeat)
+
+
+BENCHMARKS: Dict[str, Callable[[int, int], float]] = {
+    "scan_input_files": _bench_scan,
+    "index_from_vault_list": _bench_index,
+    "name_keys": _bench_keys,
+    "preview_matrix": _bench_preview,
+}
+
+
+def _scaling(name: str, small: int, large: int, t_small: float, t_large: float) -> float:
+    """Log-log slope of time vs problem size (the matrix benchmark grows as N^2)."""
+    n_small, n_large = (small**2, large**2) if name == "preview_matrix" else (small, large)
+    return math.log(t_large / t_small) / math.log(n_large / n_small)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(prog="benchmarks.planning", description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Run a subset.")
+    ap.add_argument("--quick", action="store_true", help="Use 1/10 of the large sizes.")
+    ap.add_argument("--repeat", type=int, default=3, help="Runs per size; the best is kept. Default: 3.")
+    ap.add_argument("--baseline", type=Path, default=BASELINE, help="Results to compare against.")
+    ap.add_argument("--update-baseline", action="store_true", help="Write the results as the new baseline.")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown vs. baseline. Default: 0.25.")
+    ap.add_argument("--max-exponent", type=float, default=1.25,
+                    help="Fail when a benchmark scales worse than size^X. Default: 1.25.")
+    args = ap.parse_args()
+
+    results: List[dict] = []
+    superlinear: List[str] = []
+    with tempfile.TemporaryDirectory(prefix="vault-bench-") as tmp:
+        os.chdir(tmp)
+        for name in args.only or BENCHMARKS:
+            small, large = SIZES[name]
+            if args.quick:
+                large = max(small * 2, large // 10)
+            t_small = BENCHMARKS[name](small, args.repeat)
+            t_large = BENCHMARKS[name](large, args.repeat)
+            exponent = _scaling(name, small, large, t_small, t_large)
+            results.append({
+                "benchmark": name,
+                "quick": args.quick,
+                "small": {"size": small, "sec": t_small},
+                "large": {"size": large, "sec": t_large},
+                "scaling_exponent": exponent,
+            })
+            flag = "SUPERLINEAR" if exponent > args.max_exponent else "ok"
+            print(
+                f"  [{flag}] {name:<22} n={small}: {t_small * 1000:9.1f}ms  "
+                f"n={large}: {t_large * 1000:9.1f}ms  scaling=n^{exponent:.2f}"
+            )
+            if exponent > args.max_exponent:
+                superlinear.append(name)
+        os.chdir(REPO_ROOT)
+    print(f"  peak RSS {peak_rss_mb() or 0:.1f} MB")
+
+    if args.update_baseline:
+        path = save_results("planning", results, BASELINE)
+        print(f"Baseline written to: {path}")
+        return 0
+
+    path = save_results("planning", results)
+    print(f"Results written to: {path}")
+
+    regressions: List[str] = []
+    if args.baseline.exists():
+        print(f"Compared with {args.baseline}:")
+        regressions = compare_results(
+            results,
+            args.baseline,
+            key_fields=("benchmark", "quick"),
+            metrics=[("small.sec", False), ("large.sec", False)],
+            tolerance=args.tolerance,
+        )
+    if regressions or superlinear:
+        print(f"{len(regressions)} regression(s), {len(superlinear)} superlinear benchmark(s)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
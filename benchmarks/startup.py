@@ -0,0 +1,101 @@
+# benchmarks/startup.py
+"""
+Wall-clock startup of the CLI entry point (app.main): each case launches a
+fresh interpreter, so module imports, argument parsing and any `op` calls made
+before the branch starts are all included.
+
+    python -m benchmarks.startup                          # 10 runs per case
+    python -m benchmarks.startup --repo /tmp/older-checkout --out /tmp/older.json
+    python -m benchmarks.startup --compare /tmp/older.json
+
+`op` is the offline simulator (app/fake_op.py) with a fixed per-call latency
+(--op-latency), standing in for the real CLI's round trip. `--repo` runs the
+cases against another checkout (e.g. a `git worktree` of an older commit), so
+two revisions can be compared on the same machine.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks.common import REPO_ROOT, compare_results, percentiles, save_results, write_synthetic_inputs
+
+# case -> arguments after `python`
+CASES: Dict[str, List[str]] = {
+    "import": ["-c", "import app.main"],
+    "help": ["-m", "app.main", "--help"],
+    "list_runs": ["-m", "app.main", "--list-runs"],
+    "preview": ["-m", "app.main", "--preview-from-inputs"],
+}
+
+
+def _run_case(repo: Path, name: str, workdir: Path, env: Dict[str, str], repeat: int) -> dict:
+    samples: List[float] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, *CASES[name]], cwd=workdir, env=env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+        )
+        samples.append(time.perf_counter() - t0)
+        if proc.returncode != 0:
+            raise SystemExit(f"{name} failed against {repo} (exit {proc.returncode}):\n{proc.stderr}")
+    ms = [s * 1000 for s in samples]
+    return {"case": name, "repeat": repeat, "min_ms": min(ms), **{f"{k}_ms": v for k, v in percentiles(ms).items()}}
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(prog="benchmarks.startup", description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--only", nargs="+", choices=sorted(CASES), help="Run a subset.")
+    ap.add_argument("--repeat", type=int, default=10, help="Runs per case. Default: 10.")
+    ap.add_argument("--op-latency", default="0.25", help="Seconds per simulated `op` call. Default: 0.25.")
+    ap.add_argument("--repo", type=Path, default=REPO_ROOT, help="Checkout to benchmark. Default: this one.")
+    ap.add_argument("--out", type=Path, help="Results file (default: benchmarks/results/startup-<timestamp>.json).")
+    ap.add_argument("--compare", type=Path, metavar="RESULTS", help="Earlier results file to compare against.")
+    ap.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown before --compare fails. Default: 0.2.")
+    args = ap.parse_args()
+
+    repo = args.repo.resolve()
+    results = []
+    with tempfile.TemporaryDirectory(prefix="vault-bench-") as tmp:
+        workdir = Path(tmp)
+        write_synthetic_inputs(workdir, 100)
+        env = {
+            **os.environ,
+            "PYTHONPATH": str(repo),
+            "OP_BINARY": f"{sys.executable} {repo / 'app' / 'fake_op.py'}",
+            "FAKE_OP_STATE": str(workdir / "fake-op-state.json"),
+            "FAKE_OP_LATENCY": args.op_latency,
+            "INVENTORY_CACHE_TTL_SEC": "0",  # every preview lists vaults once
+        }
+        for name in args.only or CASES:
+            r = _run_case(repo, name, workdir, env, args.repeat)
+            results.append(r)
+            print(f"  {name:<10} min {r['min_ms']:8.1f}ms  p50 {r['p50_ms']:8.1f}ms  p95 {r['p95_ms']:8.1f}ms")
+
+    path = save_results("startup", results, args.out)
+    print(f"Results written to: {path}")
+
+    if args.compare:
+        regressions = compare_results(
+            results,
+            args.compare,
+            key_fields=("case",),
+            metrics=[("min_ms", False), ("p50_ms", False)],
+            tolerance=args.tolerance,
+        )
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+# tests/conftest.py
+"""
+Shared fixtures: every test runs in its own scratch directory against the
+offline `op` simulator (app/fake_op.py), with its own vault store.
+
+Settings and the rate governor are built when `app` is first imported, so the
+simulator and a pacing rate fast enough for tests are set in the environment
+here, before any test module imports the app.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+os.environ.update({
+    "OP_BINARY": f'"{sys.executable}" "{REPO_ROOT / "app" / "fake_op.py"}"',
+    "FAKE_OP_LATENCY": "0",
+    "FAKE_OP_SEED": "1",
+    "PACING_INITIAL_RATE": "1000",
+    "PACING_MAX_RATE": "1000",
+    "PACING_BURST": "1000",
+    # no inventory cache: every run lists the simulator's vaults, and no `op whoami` keys a snapshot
+    "INVENTORY_CACHE_TTL_SEC": "0",
+    "RUN_INVENTORY_CACHE_TTL_SEC": "0",
+    "STREAM_RECEIPTS": "false",
+    "TRACE_SPANS": "false",
+    "LEDGER": "false",
+})
+
+from app.config.settings import settings  # noqa: E402
+from app.services import batch_from_inputs, ledger, run_registry, scan_cache, vault_inventory  # noqa: E402
+from app.services.preview_from_inputs import preview_from_inputs  # noqa: E402
+
+PROJECTS = ["Alpha", "Bravo", "Charlie"]
+ROLES = ["Dev", "Ops", "QA"]
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    """A fresh cwd (so output/ and input/ are per test) and vault store."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("FAKE_OP_STATE", str(tmp_path / "fake-op.json"))
+    # process-wide caches keyed by relative paths under output/
+    monkeypatch.setattr(run_registry, "_folded", None)
+    monkeypatch.setattr(vault_inventory, "_verified_owner", None)
+    monkeypatch.setattr(scan_cache, "_entries", {})
+    monkeypatch.setattr(scan_cache, "_loaded", False)
+    # the ledger's connection is to output/ledger.sqlite3 of the cwd it was opened in
+    monkeypatch.setattr(ledger, "_conn", None)
+    monkeypatch.setattr(ledger, "_pending_creations", [])
+    monkeypatch.setattr(ledger, "_pending_deletions", [])
+    yield tmp_path
+    if ledger._conn is not None:
+        ledger._conn.close()
+
+
+@pytest.fixture
+def inputs(workdir: Path) -> List[str]:
+    """One batch of PROJECTS x ROLES in ./input; returns the vault names in plan order."""
+    input_dir = workdir / "input"
+    input_dir.mkdir()
+    (input_dir / "t-vault-prefixes.txt").write_text("\n".join(PROJECTS) + "\n", encoding="utf-8")
+    (input_dir / "t-vault-suffixes.txt").write_text("\n".join(ROLES) + "\n", encoding="utf-8")
+    return [f"{p}{settings.vaultNameJoiner}{r}" for p in PROJECTS for r in ROLES]
+
+
+@pytest.fixture
+def op_vaults(workdir: Path):
+    """Returns the simulator's vaults as {id: name}."""
+
+    def read() -> Dict[str, str]:
+        path = workdir / "fake-op.json"
+        if not path.exists():
+            return {}
+        with path.open("r", encoding="utf-8") as fh:
+            return {v["id"]: v["name"] for v in json.load(fh)["vaults"]}
+
+    return read
+
+
+def only_run_dir() -> Path:
+    """The directory of the one batch run made so far in this test."""
+    (run_dir,) = batch_from_inputs.OUTPUT_BASE_DIR.iterdir()
+    return run_dir
+
+
+def make_plan(name: str = "plan.json") -> Path:
+    """Preview ./input against the simulator and write the plan to ./`name`, for run_from_plan."""
+    path = Path(name)
+    preview_from_inputs(plan_out=path)
+    return path
+
+
+def read_jsonl(path: Path) -> List[dict]:
+    """Complete JSON lines of `path` (a torn last line is skipped)."""
+    out = []
+    with path.open("r", encoding="utf-8") as fh:
+        for raw in fh:
+            try:
+                out.append(json.loads(raw))
+            except json.JSONDecodeError:
+                continue
+    return out
+
+
+class CreateSpy:
+    """
+    Stands in for the batch's try_create_vault: records every name it creates,
+    and raises KeyboardInterrupt (Ctrl-C) once `limit` creates were made.
+    """
+
+    def __init__(self, monkeypatch: pytest.MonkeyPatch, limit: Optional[int] = None):
+        self.names: List[str] = []
+        self.limit = limit
+        self._create = batch_from_inputs.try_create_vault
+        monkeypatch.setattr(batch_from_inputs, "try_create_vault", self)
+
+    def __call__(self, name: str):
+        if self.limit is not None and len(self.names) >= self.limit:
+            raise KeyboardInterrupt
+        self.names.append(name)
+        return self._create(name)
@@ -0,0 +1,47 @@
+# tests/test_apply_plan.py
+from __future__ import annotations
+
+import pytest
+
+from app.services.batch_from_inputs import OUTPUT_BASE_DIR, RECEIPT_FILENAME, run_from_plan
+from app.services.create_vaults_with_retries import try_create_vault
+from app.services.receipt_stream import read_run_receipt
+from tests.conftest import CreateSpy, make_plan
+
+
+def test_apply_creates_the_new_items(inputs, op_vaults):
+    run_dir = run_from_plan("tester", make_plan())
+
+    receipt = read_run_receipt(run_dir / RECEIPT_FILENAME)
+    assert [s.vault_name for s in receipt.successes] == inputs
+    assert sorted(op_vaults().values()) == sorted(inputs)
+
+
+def test_apply_refuses_a_plan_whose_inputs_changed(inputs, workdir, op_vaults, monkeypatch):
+    plan = make_plan()
+    with (workdir / "input" / "t-vault-suffixes.txt").open("a", encoding="utf-8") as fh:
+        fh.write("Sec\n")
+    spy = CreateSpy(monkeypatch)
+
+    with pytest.raises(RuntimeError, match="out of date"):
+        run_from_plan("tester", plan)
+
+    assert spy.names == []
+    assert op_vaults() == {}
+    assert not OUTPUT_BASE_DIR.exists() or not any(OUTPUT_BASE_DIR.iterdir())
+
+
+def test_apply_skips_a_vault_created_since_the_preview(inputs, op_vaults, monkeypatch):
+    plan = make_plan()
+    # e.g. created by hand, or by another run, between approval and apply
+    try_create_vault(inputs[0])
+    spy = CreateSpy(monkeypatch)
+
+    run_dir = run_from_plan("tester", plan)
+
+    assert spy.names == inputs[1:]
+    assert sorted(op_vaults().values()) == sorted(inputs)
+    receipt = read_run_receipt(run_dir / RECEIPT_FILENAME)
+    (skipped,) = receipt.failures
+    assert skipped.vault_name == inputs[0]
+    assert skipped.error.startswith("already exists")
@@ -0,0 +1,43 @@
+# tests/test_concurrent_create.py
+from __future__ import annotations
+
+import pytest
+
+from app.config.settings import settings
+from app.services.batch_from_inputs import RECEIPT_FILENAME, ROLLBACK_FILENAME, run_from_inputs
+from app.services.receipt_stream import read_run_receipt
+from tests.conftest import read_jsonl
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_receipt_lists_outcomes_in_plan_order(inputs, op_vaults, monkeypatch, concurrency):
+    # jittered latency so workers finish out of order
+    monkeypatch.setenv("FAKE_OP_LATENCY", "uniform:0,0.05")
+
+    run_dir = run_from_inputs("tester", concurrency=concurrency)
+
+    receipt = read_run_receipt(run_dir / RECEIPT_FILENAME)
+    assert [s.vault_name for s in receipt.successes] == inputs
+    assert receipt.failures == []
+    assert sorted(op_vaults().values()) == sorted(inputs)
+
+
+def test_rollback_lists_every_created_vault(inputs, op_vaults, monkeypatch):
+    # a third of all `op` calls fail, without retries
+    monkeypatch.setenv("FAKE_OP_FAILURE_P", "0.3")
+    monkeypatch.setattr(settings, "shouldRetry", False)
+
+    run_dir = run_from_inputs("tester", concurrency=4)
+
+    created = op_vaults()
+    rollback = read_jsonl(run_dir / ROLLBACK_FILENAME)
+    assert {e["vault_id"]: e["vault_name"] for e in rollback} == created
+    receipt = read_run_receipt(run_dir / RECEIPT_FILENAME)
+    assert {s.vault_id for s in receipt.successes} == set(created)
+    assert receipt.failures, "expected some simulated failures"
+    # every planned vault is accounted for exactly once, still in plan order
+    settled = sorted(
+        [*receipt.successes, *receipt.failures], key=lambda o: inputs.index(o.vault_name)
+    )
+    assert [o.vault_name for o in settled] == inputs
+    assert [s.vault_name for s in receipt.successes] == [n for n in inputs if n in created.values()]
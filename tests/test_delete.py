@@ -0,0 +1,124 @@
+# tests/test_delete.py
+from __future__ import annotations
+
+from datetime import datetime
+
+from app.services import delete_last_run as delete_module
+from app.services import run_registry, session
+from app.services.batch_from_inputs import ROLLBACK_FILENAME, run_from_inputs
+from app.services.delete_last_run import _local_tz, cleanup_runs, delete_last_run
+from app.services.delete_vaults_with_retries import try_delete_vault
+from app.services.receipt_stream import read_cleanup_receipt, read_delete_receipt
+from tests.conftest import read_jsonl
+
+
+def _second_batch(workdir, names):
+    """Replace the input prefixes, so the next run plans vaults of its own."""
+    (workdir / "input" / "t-vault-prefixes.txt").write_text("\n".join(names) + "\n", encoding="utf-8")
+
+
+def test_concurrent_delete_lists_outcomes_in_rollback_order(inputs, op_vaults, monkeypatch):
+    run_dir = run_from_inputs("tester")
+    monkeypatch.setenv("FAKE_OP_LATENCY", "uniform:0,0.05")
+
+    receipt = read_delete_receipt(delete_last_run(concurrency=4))
+
+    rollback = [e["vault_name"] for e in read_jsonl(run_dir / ROLLBACK_FILENAME)]
+    assert [s.vault_name for s in receipt.successes] == rollback
+    assert receipt.failures == []
+    assert op_vaults() == {}
+
+
+def test_cleanup_deletes_a_vault_listed_by_two_runs_once(inputs, op_vaults, workdir):
+    first = run_from_inputs("tester")
+    _second_batch(workdir, ["Delta", "Echo"])
+    second = run_from_inputs("tester")
+    # e.g. a resumed run that re-recorded a vault of the earlier one
+    shared = (first / ROLLBACK_FILENAME).read_text(encoding="utf-8").splitlines()[0]
+    with (second / ROLLBACK_FILENAME).open("a", encoding="utf-8") as fh:
+        fh.write(shared + "\n")
+    created = op_vaults()
+
+    receipt = read_cleanup_receipt(cleanup_runs(run_ids=[first.name, second.name]))
+
+    assert receipt.duplicates == 1
+    assert receipt.failures == []
+    assert sorted(s.vault_id for s in receipt.successes) == sorted(created)
+    assert op_vaults() == {}
+
+
+def test_cleanup_skips_vaults_deleted_before_a_dry_run(inputs, op_vaults):
+    run_dir = run_from_inputs("tester")
+    delete_last_run(run_id=run_dir.name)
+    # a dry run afterwards overwrites the delete receipt
+    delete_last_run(run_id=run_dir.name, dry_run=True)
+
+    receipt = read_cleanup_receipt(cleanup_runs(run_ids=[run_dir.name]))
+
+    assert receipt.already_deleted == len(inputs)
+    assert receipt.successes == [] and receipt.failures == []
+    (record,) = run_registry.load_runs()
+    assert record.rollback_status == "deleted"
+
+
+def test_dry_run_deletes_nothing_and_skips_whoami(inputs, op_vaults, monkeypatch):
+    run_from_inputs("tester")
+    created = op_vaults()
+
+    def no_whoami():
+        raise AssertionError("a dry run must not call `op whoami`")
+
+    monkeypatch.setattr(session, "try_get_identity", no_whoami)
+    receipt = read_delete_receipt(delete_last_run(dry_run=True))
+
+    assert [p.vault_name for p in receipt.planned] == inputs
+    assert receipt.successes == [] and receipt.actor_uuid is None
+    assert op_vaults() == created
+
+
+def test_second_delete_finishes_a_partial_run_then_moves_on(inputs, op_vaults, workdir, monkeypatch):
+    older = run_from_inputs("tester")
+    _second_batch(workdir, ["Delta", "Echo"])
+    newer = run_from_inputs("tester")
+    rollback = read_jsonl(newer / ROLLBACK_FILENAME)
+    failing = {rollback[0]["vault_id"], rollback[1]["vault_id"]}
+
+    def flaky_delete(identifier):
+        if identifier == rollback[0]["vault_id"]:
+            try_delete_vault(identifier)  # deleted, but the pass never learns it
+        if identifier in failing:
+            raise RuntimeError("simulated delete failure")
+        try_delete_vault(identifier)
+
+    monkeypatch.setattr(delete_module, "try_delete_vault", flaky_delete)
+    first = read_delete_receipt(delete_last_run())
+    assert first.run_id_deleted == newer.name
+    assert {f.vault_id for f in first.failures} == failing
+    runs = {r.run_id: r for r in run_registry.load_runs()}
+    assert runs[newer.name].rollback_status == "partial"
+
+    monkeypatch.setattr(delete_module, "try_delete_vault", try_delete_vault)
+    second = read_delete_receipt(delete_last_run())
+
+    # only the failed entries are sent to `op` again; the one already gone counts as deleted
+    assert second.run_id_deleted == newer.name
+    assert second.already_deleted == len(rollback) - 2
+    assert {s.vault_id for s in second.successes} == failing
+    assert second.failures == []
+    runs = {r.run_id: r for r in run_registry.load_runs()}
+    assert runs[newer.name].rollback_status == "deleted"
+
+    # the next invocation reaches the older run
+    third = read_delete_receipt(delete_last_run())
+    assert third.run_id_deleted == older.name
+    assert op_vaults() == {}
+
+
+def test_until_a_bare_date_includes_that_day(inputs):
+    run_dir = run_from_inputs("tester")
+    today = datetime.now(_local_tz()).date().isoformat()
+
+    receipt = read_cleanup_receipt(cleanup_runs(since=today, until=today, dry_run=True))
+
+    assert receipt.run_ids == [run_dir.name]
+    assert [p.vault_name for p in receipt.planned] == inputs
@@ -0,0 +1,95 @@
+# tests/test_journal.py
+from __future__ import annotations
+
+import json
+import threading
+
+import pytest
+
+from app.services import run_registry
+from app.services.batch_from_inputs import (
+    PROGRESS_FILENAME,
+    RECEIPT_FILENAME,
+    ROLLBACK_FILENAME,
+    run_from_inputs,
+)
+from app.services.delete_last_run import delete_last_run
+from app.services.journal_writer import JournalWriter
+from app.services.receipt_stream import read_delete_receipt, read_run_receipt
+from tests.conftest import CreateSpy, only_run_dir, read_jsonl
+
+TORN = '{"batch_name": "t", "vault_name": "Torn'  # a line cut off by a crash
+
+
+def test_lines_reach_the_file_before_the_group_commit(workdir):
+    # a killed process keeps what write() returned for, without waiting for fsync
+    with JournalWriter(workdir / "j.jsonl", flush_interval=3600, max_lines=1000) as journal:
+        journal.write({"n": 1})
+        assert read_jsonl(workdir / "j.jsonl") == [{"n": 1}]
+
+
+def test_write_after_close_raises(workdir):
+    journal = JournalWriter(workdir / "j.jsonl")
+    journal.close()
+    with pytest.raises(ValueError, match="journal closed"):
+        journal.write({"n": 1})
+
+
+def test_concurrent_writes_keep_lines_whole(workdir):
+    path = workdir / "j.jsonl"
+    with JournalWriter(path, flush_interval=0.01, max_lines=7) as journal:
+        threads = [
+            threading.Thread(target=lambda t=t: [journal.write({"t": t, "i": i}) for i in range(200)])
+            for t in range(8)
+        ]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 8 * 200
+    assert {(r["t"], r["i"]) for r in map(json.loads, lines)} == {(t, i) for t in range(8) for i in range(200)}
+
+
+def test_resume_after_a_torn_last_line(inputs, op_vaults, monkeypatch):
+    spy = CreateSpy(monkeypatch, limit=3)
+    with pytest.raises(KeyboardInterrupt):
+        run_from_inputs("tester")
+    run_dir = only_run_dir()
+    for name in (ROLLBACK_FILENAME, PROGRESS_FILENAME):
+        with (run_dir / name).open("a", encoding="utf-8") as fh:
+            fh.write(TORN)
+
+    spy.limit = None
+    run_from_inputs("tester", resume_run_id=run_dir.name)
+
+    assert spy.names == inputs
+    receipt = read_run_receipt(run_dir / RECEIPT_FILENAME)
+    assert [s.vault_name for s in receipt.successes] == inputs
+    assert sorted(op_vaults().values()) == sorted(inputs)
+    # lines appended after the torn one are not glued onto it
+    assert {e["vault_id"]: e["vault_name"] for e in read_jsonl(run_dir / ROLLBACK_FILENAME)} == op_vaults()
+
+
+def test_delete_skips_a_torn_last_line(inputs, op_vaults):
+    run_dir = run_from_inputs("tester")
+    with (run_dir / ROLLBACK_FILENAME).open("a", encoding="utf-8") as fh:
+        fh.write(TORN)
+
+    receipt = read_delete_receipt(delete_last_run())
+
+    assert [s.vault_name for s in receipt.successes] == inputs
+    assert receipt.failures == []
+    assert op_vaults() == {}
+
+
+def test_registry_event_after_a_torn_last_line(inputs):
+    first = run_from_inputs("tester")
+    with run_registry.REGISTRY_PATH.open("a", encoding="utf-8") as fh:
+        fh.write('{"event": "started", "run_id": "torn')
+    second = run_from_inputs("tester")
+
+    runs = {r.run_id: r for r in run_registry.load_runs()}
+    assert set(runs) == {first.name, second.name}
+    # its "started" event is not glued onto the torn one
+    assert runs[second.name].started_at is not None
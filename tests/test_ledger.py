@@ -0,0 +1,49 @@
+# tests/test_ledger.py
+from __future__ import annotations
+
+import pytest
+
+from app.config.settings import settings
+from app.services.batch_from_inputs import run_from_inputs
+from app.services.delete_last_run import delete_last_run
+from app.services.ledger import find_vault, print_find_vault
+
+
+@pytest.fixture(autouse=True)
+def ledger_on(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "ledgerEnabled", True)
+
+
+def test_find_matches_by_id_exact_name_and_canonical_key(inputs, op_vaults):
+    first = run_from_inputs("tester")
+    delete_last_run()
+    second = run_from_inputs("tester")  # the same names again, now alive
+    name = inputs[0]  # "Alpha - Dev"
+    (alive_id,) = [vid for vid, n in op_vaults().items() if n == name]
+
+    # case, spaces and dashes differ: only the canonical key matches
+    canonical = find_vault("ALPHA-dev")
+    assert [how for how, _ in canonical] == ["canonical", "canonical"]
+    # oldest first; a delete's operation id is the id of the run it deleted
+    assert [(row["run_id"], row["deleted_by"]) for _, row in canonical] == [
+        (first.name, first.name),
+        (second.name, None),
+    ]
+
+    assert [how for how, _ in find_vault(f"  {name.upper()} ")] == ["exact", "exact"]
+    ((how, row),) = find_vault(alive_id)
+    assert (how, row["vault_name"], row["deleted_at"]) == ("id", name, None)
+    assert find_vault("Zulu - Dev") == []
+
+
+def test_ledger_find_reports_alive_and_deleted(inputs, capsys):
+    run_from_inputs("tester")
+    delete_last_run()
+    run_from_inputs("tester")
+    capsys.readouterr()
+
+    print_find_vault("alpha-dev")
+
+    out = capsys.readouterr().out
+    assert out.count("[CANONICAL]") == 2
+    assert "2 creation(s), 1 alive" in out
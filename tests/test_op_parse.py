@@ -0,0 +1,70 @@
+# tests/test_op_parse.py
+from __future__ import annotations
+
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from app.models.SubprocessResponse import OpStatus
+from app.models.VaultListItem import VaultListItem
+from app.services.batch_from_inputs import RECEIPT_FILENAME, run_from_inputs
+from app.services.list_vaults import get_existing_vault_indexes
+from app.services.receipt_stream import read_run_receipt
+from app.services.run_command import op_list_vaults
+
+VAULT = {
+    "id": "vault0000000000000000000001",
+    "name": "Existing",
+    "content_version": 3,
+    "created_at": "2025-09-01T00:00:00Z",
+    "updated_at": "2025-09-01T00:00:00Z",
+}
+
+
+@pytest.fixture
+def op_store(workdir):
+    """Writes the simulator's vault store; `op vault list` prints these vaults as stored."""
+
+    def write(*vaults: dict) -> None:
+        with (workdir / "fake-op.json").open("w", encoding="utf-8") as fh:
+            json.dump({"calls": 0, "recent": [], "vaults": list(vaults)}, fh)
+
+    return write
+
+
+def test_vault_list_is_validated_from_the_raw_bytes(op_store):
+    op_store(VAULT, {**VAULT, "id": "vault0000000000000000000002", "name": "Other", "content_version": "4"})
+
+    sr = op_list_vaults()
+
+    # typed path: no decoded output, no intermediate dicts
+    assert sr.status == OpStatus.SUCCESS
+    assert sr.output == "" and sr.formatted_output == {}
+    assert sr.parsed == [
+        VaultListItem.model_validate(VAULT),
+        VaultListItem(**{**VAULT, "id": "vault0000000000000000000002", "name": "Other", "content_version": 4}),
+    ]
+
+
+def test_malformed_vault_list_falls_back_and_fails_loudly(op_store):
+    op_store(VAULT, {**VAULT, "id": "vault0000000000000000000002", "created_at": 5})
+
+    sr = op_list_vaults()
+
+    # the generic path keeps the output, so the error names what did not fit
+    assert sr.status == OpStatus.SUCCESS
+    assert sr.parsed is None
+    assert [v["id"] for v in sr.formatted_output] == [VAULT["id"], "vault0000000000000000000002"]
+    with pytest.raises(ValidationError, match="created_at"):
+        get_existing_vault_indexes()
+
+
+def test_run_reports_an_unreadable_vault_list(inputs, op_store):
+    op_store({**VAULT, "created_at": 5})
+
+    run_dir = run_from_inputs("tester")
+
+    receipt = read_run_receipt(run_dir / RECEIPT_FILENAME)
+    assert any("Could not list existing vaults" in w for w in receipt.warnings)
+    assert [s.vault_name for s in receipt.successes] == inputs
@@ -0,0 +1,49 @@
+# tests/test_plan.py
+from __future__ import annotations
+
+import pytest
+
+from app.config.settings import settings
+from app.services.batch_from_inputs import RECEIPT_FILENAME, run_from_inputs
+from app.services.compiled_plan import read_plan
+from app.services.receipt_stream import read_run_receipt
+from tests.conftest import CreateSpy, make_plan
+
+
+@pytest.fixture
+def clashing(inputs, workdir):
+    """
+    A second batch "u" after the fixture's "t": one name repeats a "t" name
+    exactly, one only under canonical_vault_key, one is new.
+    Returns: {vault_name: expected plan status} for batch "u"
+    """
+    input_dir = workdir / "input"
+    (input_dir / "u-vault-prefixes.txt").write_text("Alpha\nAl-pha\nZulu\n", encoding="utf-8")
+    (input_dir / "u-vault-suffixes.txt").write_text("Dev\n", encoding="utf-8")
+    j = settings.vaultNameJoiner
+    return {f"Alpha{j}Dev": "duplicate", f"Al-pha{j}Dev": "collision", f"Zulu{j}Dev": "new"}
+
+
+def test_clashes_across_batches_are_dropped_before_any_create(inputs, clashing, op_vaults, monkeypatch):
+    spy = CreateSpy(monkeypatch)
+
+    run_dir = run_from_inputs("tester")
+
+    by_status = {status: name for name, status in clashing.items()}
+    assert spy.names == inputs + [by_status["new"]]
+    assert sorted(op_vaults().values()) == sorted(inputs + [by_status["new"]])
+    receipt = read_run_receipt(run_dir / RECEIPT_FILENAME)
+    first = f"planned '{inputs[0]}' (batch=t)"
+    assert {f.vault_name: f.error for f in receipt.failures} == {
+        by_status["duplicate"]: f"duplicate of {first}",
+        by_status["collision"]: f"collides (ignoring case, spaces, and dashes) with {first}",
+    }
+    assert any("Dropped 1 duplicate and 1 colliding" in w for w in receipt.warnings)
+
+
+def test_preview_marks_clashes_in_the_plan(inputs, clashing):
+    plan = read_plan(make_plan())
+
+    statuses = {i.vault_name: i.status for i in plan.items if i.batch_name == "u"}
+    assert statuses == clashing
+    assert all(i.status == "new" for i in plan.items if i.batch_name == "t")
@@ -0,0 +1,122 @@
+# tests/test_rate_governor.py
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.config.settings import settings
+from app.services import rate_governor
+from app.services.batch_from_inputs import RECEIPT_FILENAME, run_from_inputs
+from app.services.rate_governor import RateGovernor, RetryBudget, is_transient
+from app.services.receipt_stream import read_run_receipt
+
+
+class Clock:
+    """Stands in for time.monotonic in rate_governor; advanced by hand."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    c = Clock()
+    monkeypatch.setattr(rate_governor, "time", SimpleNamespace(monotonic=c.monotonic))
+    return c
+
+
+def _governor(**kwargs) -> RateGovernor:
+    params = dict(initial_rate=1.0, min_rate=0.25, max_rate=2.0, increase=0.5, decrease=0.5, burst=1)
+    params.update(kwargs)
+    return RateGovernor(**params)
+
+
+def test_rate_grows_additively_up_to_the_max(clock):
+    g = _governor()
+    g.on_success()
+    assert g.rate == 1.5
+    g.on_success()
+    g.on_success()
+    assert g.rate == 2.0
+
+
+def test_rate_limit_halves_the_rate_once_per_refill_interval(clock):
+    g = _governor()
+    g.on_rate_limited()
+    assert g.rate == 0.5
+    # workers hitting the limit together back off once
+    g.on_rate_limited()
+    assert g.rate == 0.5
+    clock.now += 1 / 0.5
+    g.on_rate_limited()
+    assert g.rate == 0.25
+    clock.now += 1 / 0.25
+    g.on_rate_limited()
+    assert g.rate == 0.25  # min_rate
+
+
+def test_reserve_spends_the_burst_then_queues_callers(clock):
+    g = _governor(initial_rate=2.0, burst=2)
+    assert [g.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+    assert g.total_wait == 1.5
+    clock.now += 1.0  # the queued callers' slots have passed
+    assert g.reserve() == 0.5
+
+
+def test_rate_limit_drains_the_bucket(clock):
+    g = _governor(initial_rate=2.0, burst=2)
+    g.on_rate_limited()
+    assert g.reserve() == 1.0  # 1 token owed at the halved rate of 1/sec
+
+
+def test_rate_limited_retries_stop_after_the_max_wait(clock, monkeypatch):
+    monkeypatch.setattr(settings, "rateLimitMaxWaitSec", 10.0)
+    budget = RetryBudget()
+    assert budget.retry(rate_limited=True)
+    clock.now += 9.9
+    assert budget.retry(rate_limited=True)
+    clock.now += 0.1
+    assert not budget.retry(rate_limited=True)
+
+
+def test_only_transient_failures_use_up_max_retries(clock, monkeypatch):
+    monkeypatch.setattr(settings, "maxRetries", 3)
+    budget = RetryBudget()
+    for _ in range(10):
+        assert budget.retry(rate_limited=True)
+    # 3 attempts in all: the first failure and two retries
+    assert [budget.retry(rate_limited=False) for _ in range(3)] == [True, True, False]
+
+
+def test_nothing_is_retried_with_retries_off(clock, monkeypatch):
+    monkeypatch.setattr(settings, "shouldRetry", False)
+    assert not RetryBudget().retry(rate_limited=True)
+    assert not RetryBudget().retry(rate_limited=False)
+
+
+def test_creates_repeat_only_requests_that_never_reached_op():
+    assert is_transient("[ERROR] (503) Service Unavailable", repeatable=False)
+    assert is_transient("dial tcp: connection refused", repeatable=False)
+    # may have created the vault: only a delete is repeated
+    assert not is_transient("context deadline exceeded", repeatable=False)
+    assert is_transient("context deadline exceeded", repeatable=True)
+    assert not is_transient("\"x\" isn't a vault in this account", repeatable=True)
+
+
+@pytest.mark.parametrize("max_retries", [1, 20])
+def test_transient_create_failures_are_retried(inputs, op_vaults, monkeypatch, max_retries):
+    monkeypatch.setenv("FAKE_OP_TRANSIENT_P", "0.3")
+    monkeypatch.setattr(settings, "maxRetries", max_retries)
+
+    run_dir = run_from_inputs("tester")
+
+    receipt = read_run_receipt(run_dir / RECEIPT_FILENAME)
+    if max_retries == 1:
+        assert receipt.failures, "expected some simulated transient failures"
+    else:
+        assert receipt.failures == []
+        assert sorted(op_vaults().values()) == sorted(inputs)
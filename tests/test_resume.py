@@ -0,0 +1,89 @@
+# tests/test_resume.py
+from __future__ import annotations
+
+import pytest
+
+from app.config.settings import settings
+from app.services.batch_from_inputs import (
+    RECEIPT_FILENAME,
+    ROLLBACK_FILENAME,
+    run_from_inputs,
+    run_from_plan,
+)
+from app.services.receipt_stream import read_run_receipt
+from tests.conftest import CreateSpy, make_plan, only_run_dir, read_jsonl
+
+
+def test_resume_creates_only_what_is_left(inputs, op_vaults, monkeypatch):
+    spy = CreateSpy(monkeypatch, limit=4)
+    with pytest.raises(KeyboardInterrupt):
+        run_from_inputs("tester")
+    run_dir = only_run_dir()
+    assert not (run_dir / RECEIPT_FILENAME).exists()
+    assert [e["vault_name"] for e in read_jsonl(run_dir / ROLLBACK_FILENAME)] == inputs[:4]
+
+    spy.limit = None
+    assert run_from_inputs("tester", resume_run_id=run_dir.name) == run_dir
+
+    # each planned vault was created exactly once, across both attempts
+    assert spy.names == inputs
+    # one combined receipt; carried-over vaults count as created, not as "already exists"
+    receipt = read_run_receipt(run_dir / RECEIPT_FILENAME)
+    assert [s.vault_name for s in receipt.successes] == inputs
+    assert receipt.failures == []
+    assert sorted(op_vaults().values()) == sorted(inputs)
+    assert {e["vault_id"] for e in read_jsonl(run_dir / ROLLBACK_FILENAME)} == set(op_vaults())
+
+
+def test_resume_retries_failed_creates(inputs, op_vaults, monkeypatch):
+    monkeypatch.setenv("FAKE_OP_FAILURE_P", "0.3")
+    monkeypatch.setattr(settings, "shouldRetry", False)
+    run_dir = run_from_inputs("tester")
+    failed = [f.vault_name for f in read_run_receipt(run_dir / RECEIPT_FILENAME).failures]
+    assert failed, "expected some simulated failures"
+
+    monkeypatch.setenv("FAKE_OP_FAILURE_P", "0")
+    spy = CreateSpy(monkeypatch)
+    run_from_inputs("tester", resume_run_id=run_dir.name)
+
+    assert spy.names == failed
+    receipt = read_run_receipt(run_dir / RECEIPT_FILENAME)
+    assert [s.vault_name for s in receipt.successes] == inputs
+    assert sorted(op_vaults().values()) == sorted(inputs)
+
+
+def test_resume_of_unknown_run_fails(inputs):
+    with pytest.raises(RuntimeError):
+        run_from_inputs("tester", resume_run_id="no-such-run")
+
+
+def test_apply_plan_resumes_only_a_run_of_the_same_plan(inputs, op_vaults, monkeypatch):
+    plan = make_plan()
+    spy = CreateSpy(monkeypatch, limit=4)
+    with pytest.raises(KeyboardInterrupt):
+        run_from_plan("tester", plan)
+    run_dir = only_run_dir()
+    # a fresh preview of the same inputs is still another plan file
+    other = make_plan("other-plan.json")
+
+    with pytest.raises(RuntimeError, match="different plan"):
+        run_from_plan("tester", other, resume_run_id=run_dir.name)
+    with pytest.raises(RuntimeError, match="apply-plan run"):
+        run_from_inputs("tester", resume_run_id=run_dir.name)
+    assert spy.names == inputs[:4]
+
+    spy.limit = None
+    run_from_plan("tester", plan, resume_run_id=run_dir.name)
+    assert spy.names == inputs
+    assert sorted(op_vaults().values()) == sorted(inputs)
+
+
+def test_apply_plan_does_not_resume_a_batch_run(inputs, monkeypatch):
+    spy = CreateSpy(monkeypatch, limit=4)
+    with pytest.raises(KeyboardInterrupt):
+        run_from_inputs("tester")
+    plan = make_plan()
+
+    with pytest.raises(RuntimeError, match="batch run"):
+        run_from_plan("tester", plan, resume_run_id=only_run_dir().name)
+    assert spy.names == inputs[:4]